@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 from environ import Env  # type: ignore
@@ -24,6 +25,26 @@ env: Env = Env()
 env.read_env(env_file=str(BASE_DIR.parent / ".env"))
 
 
+def optional_int(value: str | int | None) -> int | None:
+    """
+    Optional Int Function
+
+    Description:
+        - This function is used to read integer settings that an empty
+        value switches off, `env.int` only does so when the default is
+        `None`.
+
+    Args:
+        - `value (str | int | None)`: The value of the variable.
+        **(Required)**
+
+    Returns:
+        - `int | None`: The integer, `None` for an empty value.
+
+    """
+    return None if value in ("", None) else int(value)  # type: ignore
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -110,6 +131,21 @@ if env.str(var="DATABASE", default=None):  # type: ignore
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The default cache is local to every process, set `CACHE_URL` to a shared
+# backend (e.g. `redis://host:6379/0`) when the project is served by more than
+# one process, the cached counts and responses of every process are only
+# invalidated by writes through a shared cache.
+
+CACHES: dict[str, dict[str, str]] = {
+    "default": env.cache_url(
+        var="CACHE_URL",
+        default="locmemcache://",  # type: ignore
+    ),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -179,9 +215,138 @@ if not TESTING:
 
 
 # Rest Framework
-REST_FRAMEWORK: dict[str, str | int] = {
+# JSON is encoded and decoded with `orjson` when it is installed, MessagePack
+# is offered to clients when `msgpack` is installed, see the `json` and
+# `msgpack` extras.
+MSGPACK: bool = find_spec(name="msgpack") is not None
+
+REST_FRAMEWORK: dict[str, str | int | list[str]] = {
     "DEFAULT_PAGINATION_CLASS": (
-        "rest_framework.pagination.PageNumberPagination"
+        "snippets.pagination.CachedCountPageNumberPagination"
     ),
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": [
+        "snippets.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        *(["snippets.renderers.MessagePackRenderer"] if MSGPACK else []),
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "snippets.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        *(["snippets.renderers.MessagePackParser"] if MSGPACK else []),
+    ],
 }
+
+
+# Snippets
+# Render highlighted HTML in a background process pool instead of on save.
+# Scheduled renders are lost when the server stops, run
+# `./manage.py render_pending` after a restart to render the snippets left
+# pending, and the ones that failed.
+SNIPPETS_ASYNC_HIGHLIGHT: bool = env.bool(
+    var="SNIPPETS_ASYNC_HIGHLIGHT",
+    default=False,  # type: ignore
+)
+SNIPPETS_HIGHLIGHT_WORKERS: int = env.int(
+    var="SNIPPETS_HIGHLIGHT_WORKERS",
+    default=2,  # type: ignore
+)
+
+# Wall-clock and CPU budget of a render in seconds, counted from the start of
+# the render, code that takes longer to highlight is stored as plain text.
+# Budgets are opt-in: with zero for both (the default) code is highlighted on
+# save in the web process. While a budget is set every synchronous save waits
+# for one of the `SNIPPETS_HIGHLIGHT_WORKERS` processes of the render pool,
+# size the pool to the number of threads serving requests so saves do not
+# queue behind each other.
+SNIPPETS_HIGHLIGHT_TIMEOUT: float = env.float(
+    var="SNIPPETS_HIGHLIGHT_TIMEOUT",
+    default=0.0,  # type: ignore
+)
+SNIPPETS_HIGHLIGHT_CPU_TIME: float = env.float(
+    var="SNIPPETS_HIGHLIGHT_CPU_TIME",
+    default=0.0,  # type: ignore
+)
+
+# Largest number of snippets created by one `/snippets/bulk/` request.
+SNIPPETS_BULK_CREATE_MAX_ITEMS: int = env.int(
+    var="SNIPPETS_BULK_CREATE_MAX_ITEMS",
+    default=1000,  # type: ignore
+)
+
+# Content addressed cache of highlighted HTML. The in-process LRU tier holds
+# `SNIPPETS_HIGHLIGHT_LRU_SIZE` entries of at most
+# `SNIPPETS_HIGHLIGHT_LRU_BYTES` bytes in total (an empty value removes the
+# bound), larger renders are only cached by the shared tier. The shared tier
+# uses the Django cache named by `SNIPPETS_HIGHLIGHT_CACHE` (an empty value
+# disables it) for `SNIPPETS_HIGHLIGHT_CACHE_TIMEOUT` seconds (empty by
+# default, forever).
+SNIPPETS_HIGHLIGHT_LRU_SIZE: int = env.int(
+    var="SNIPPETS_HIGHLIGHT_LRU_SIZE",
+    default=256,  # type: ignore
+)
+SNIPPETS_HIGHLIGHT_LRU_BYTES: int | None = env.get_value(
+    var="SNIPPETS_HIGHLIGHT_LRU_BYTES",
+    cast=optional_int,
+    default=32 * 1024 * 1024,
+)
+SNIPPETS_HIGHLIGHT_CACHE: str = env.str(
+    var="SNIPPETS_HIGHLIGHT_CACHE",
+    default="default",  # type: ignore
+)
+SNIPPETS_HIGHLIGHT_CACHE_TIMEOUT: int | None = env.get_value(
+    var="SNIPPETS_HIGHLIGHT_CACHE_TIMEOUT",
+    cast=optional_int,
+    default=None,
+)
+
+# Number of characters of code listed with `/snippets/?preview=true`.
+SNIPPETS_PREVIEW_LENGTH: int = env.int(
+    var="SNIPPETS_PREVIEW_LENGTH",
+    default=200,  # type: ignore
+)
+
+# Cached total counts of paginated lists, stored in the Django cache named by
+# `SNIPPETS_COUNT_CACHE` until a row is created or deleted, or for
+# `SNIPPETS_COUNT_CACHE_TIMEOUT` seconds (an empty value keeps them until
+# then). On PostgreSQL, unfiltered lists of tables estimated above
+# `SNIPPETS_COUNT_ESTIMATE_THRESHOLD` rows report the planner estimate instead
+# (an empty value disables estimates).
+SNIPPETS_COUNT_CACHE: str = env.str(
+    var="SNIPPETS_COUNT_CACHE",
+    default="default",  # type: ignore
+)
+SNIPPETS_COUNT_CACHE_TIMEOUT: int | None = env.get_value(
+    var="SNIPPETS_COUNT_CACHE_TIMEOUT",
+    cast=optional_int,
+    default=300,
+)
+SNIPPETS_COUNT_ESTIMATE_THRESHOLD: int | None = env.get_value(
+    var="SNIPPETS_COUNT_ESTIMATE_THRESHOLD",
+    cast=optional_int,
+    default=100_000,
+)
+
+# Bound of `/snippets/search/`, every search is aborted after
+# `SNIPPETS_SEARCH_TIMEOUT` seconds. On SQLite a single regular expression
+# match is only bounded with the `search` extra installed, `?mode=regex` is
+# rejected without it.
+SNIPPETS_SEARCH_TIMEOUT: float = env.float(
+    var="SNIPPETS_SEARCH_TIMEOUT",
+    default=2.0,  # type: ignore
+)
+
+# Cached responses of the read endpoints, stored in the Django cache named by
+# `SNIPPETS_RESPONSE_CACHE` (an empty value disables them), see `CACHE_URL`,
+# for `SNIPPETS_RESPONSE_CACHE_TIMEOUT` seconds (an empty value keeps them
+# until a write).
+SNIPPETS_RESPONSE_CACHE: str = env.str(
+    var="SNIPPETS_RESPONSE_CACHE",
+    default="default",  # type: ignore
+)
+SNIPPETS_RESPONSE_CACHE_TIMEOUT: int | None = env.get_value(
+    var="SNIPPETS_RESPONSE_CACHE_TIMEOUT",
+    cast=optional_int,
+    default=300,
+)
@@ -21,9 +21,16 @@ class SnippetsConfig(AppConfig):
         - `name (str)`: The name of the app.
 
     Methods:
-        - `None`
+        - `ready() -> None`: Connect the signal receivers of the app.
 
     """
 
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "snippets"
+
+    def ready(self) -> None:
+        """
+        Connect the signal receivers of the app.
+
+        """
+        from . import signals  # noqa: F401 pylint: disable=C0415,W0611
@@ -0,0 +1,333 @@
+"""
+Snippets Cache Module
+
+Description:
+    - This module contains the caches used by the snippets app.
+
+"""
+
+from collections.abc import Iterable
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import connections
+from django.db.models import Model, QuerySet
+
+from .highlighting import LRUCache, Rendered
+
+
+def _sizeof(rendered: Rendered) -> int:
+    """
+    Approximate the memory held by a render, counting a byte per character
+    of the fragment and of the token stream.
+
+    """
+    return len(rendered.highlighted) + len(rendered.tokens)
+
+
+class HighlightCache:
+    """
+    Highlight Cache Class
+
+    Description:
+        - This class is a content addressed cache of renders shared by
+        every snippet with identical render inputs.
+        - Lookups go through a bounded in-process LRU tier first, then
+        through the Django cache configured by `SNIPPETS_HIGHLIGHT_CACHE`.
+        - The in-process tier is bounded by entries and by the total size of
+        the renders, so a few large snippets cannot hold on to the memory
+        of every worker.
+
+    Attributes:
+        - `local (LRUCache[str, Rendered])`: The in-process tier.
+
+    Methods:
+        - `get(key: str) -> Rendered | None`: Get a cached render.
+        - `set(key: str, rendered: Rendered) -> None`: Cache a render.
+
+    """
+
+    def __init__(self, maxsize: int, maxbytes: int | None = None) -> None:
+        self.local: LRUCache[str, Rendered] = LRUCache(
+            maxsize=maxsize, maxbytes=maxbytes, sizeof=_sizeof
+        )
+
+    @property
+    def shared(self) -> BaseCache | None:
+        """
+        The persistent tier, `None` when it is disabled.
+
+        """
+        if not settings.SNIPPETS_HIGHLIGHT_CACHE:
+            return None
+
+        return caches[settings.SNIPPETS_HIGHLIGHT_CACHE]
+
+    def get(self, key: str) -> Rendered | None:
+        """
+        Get Method
+
+        Description:
+            - This method is used to get a cached render.
+
+        Args:
+            - `key (str)`: The content address of the render. **(Required)**
+
+        Returns:
+            - `Rendered | None`: The render, `None` on a miss.
+
+        """
+        rendered: Rendered | None = self.local.get(key=key)
+
+        if rendered is None and self.shared is not None:
+            cached: tuple[str, bytes, int] | None = self.shared.get(
+                key=f"highlight:{key}"
+            )
+
+            if cached is not None:
+                rendered = Rendered(*cached)
+                self.local.set(key=key, value=rendered)
+
+        return rendered
+
+    def set(self, key: str, rendered: Rendered) -> None:
+        """
+        Set Method
+
+        Description:
+            - This method is used to cache a render in both tiers.
+
+        Args:
+            - `key (str)`: The content address of the render. **(Required)**
+            - `rendered (Rendered)`: The render. **(Required)**
+
+        Returns:
+            - `None`
+
+        """
+        self.local.set(key=key, value=rendered)
+
+        if self.shared is not None:
+            self.shared.set(
+                key=f"highlight:{key}",
+                value=tuple(rendered),
+                timeout=settings.SNIPPETS_HIGHLIGHT_CACHE_TIMEOUT,
+            )
+
+
+highlight_cache: HighlightCache = HighlightCache(
+    maxsize=settings.SNIPPETS_HIGHLIGHT_LRU_SIZE,
+    maxbytes=settings.SNIPPETS_HIGHLIGHT_LRU_BYTES,
+)
+
+
+def get_generation(cache: BaseCache, name: str) -> int:
+    """
+    Get Generation Function
+
+    Description:
+        - This function is used to get the current value of a generation
+        counter, cache keys embed it so bumping it drops every entry built
+        under an older value.
+
+    Args:
+        - `cache (BaseCache)`: The cache holding the counter. **(Required)**
+        - `name (str)`: Name of the counter. **(Required)**
+
+    Returns:
+        - `int`: The current generation.
+
+    """
+    key: str = f"generation:{name}"
+    cache.add(key=key, value=0, timeout=None)
+
+    return cache.get(key=key, default=0)
+
+
+def bump_generation(cache: BaseCache, name: str) -> None:
+    """
+    Bump Generation Function
+
+    Description:
+        - This function is used to advance a generation counter.
+
+    Args:
+        - `cache (BaseCache)`: The cache holding the counter. **(Required)**
+        - `name (str)`: Name of the counter. **(Required)**
+
+    Returns:
+        - `None`
+
+    """
+    key: str = f"generation:{name}"
+
+    try:
+        cache.incr(key=key)
+    except ValueError:
+        cache.set(key=key, value=1, timeout=None)
+
+
+def invalidate_counts(model: type[Model]) -> None:
+    """
+    Invalidate Counts Function
+
+    Description:
+        - This function is used to drop every cached count of a model.
+
+    Args:
+        - `model (type[Model])`: The counted model. **(Required)**
+
+    Returns:
+        - `None`
+
+    """
+    bump_generation(
+        cache=caches[settings.SNIPPETS_COUNT_CACHE],
+        name=f"count:{model._meta.label_lower}",
+    )
+
+
+def estimated_count(queryset: QuerySet) -> int | None:
+    """
+    Estimated Count Function
+
+    Description:
+        - This function is used to read the planner's row estimate of an
+        unfiltered queryset on PostgreSQL.
+
+    Args:
+        - `queryset (QuerySet)`: The counted queryset. **(Required)**
+
+    Returns:
+        - `int | None`: The estimate, `None` when none is available.
+
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql" or queryset.query.where:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row: tuple[int] | None = cursor.fetchone()
+
+    # Tables that were never analyzed report -1.
+    return row[0] if row and row[0] >= 0 else None
+
+
+def cached_count(queryset: QuerySet) -> int:
+    """
+    Cached Count Function
+
+    Description:
+        - This function is used to count a queryset without scanning the
+        table on every request.
+        - Unfiltered tables estimated above
+        `SNIPPETS_COUNT_ESTIMATE_THRESHOLD` rows use the planner estimate,
+        other counts are cached until a row is created or deleted.
+
+    Args:
+        - `queryset (QuerySet)`: The counted queryset. **(Required)**
+
+    Returns:
+        - `int`: The number of rows.
+
+    """
+    threshold: int | None = settings.SNIPPETS_COUNT_ESTIMATE_THRESHOLD
+
+    if threshold is not None:
+        estimate: int | None = estimated_count(queryset=queryset)
+
+        if estimate is not None and estimate >= threshold:
+            return estimate
+
+    cache: BaseCache = caches[settings.SNIPPETS_COUNT_CACHE]
+    sql, params = queryset.query.sql_with_params()
+    digest: str = sha256(repr((sql, params)).encode()).hexdigest()
+    label: str = queryset.model._meta.label_lower
+    generation: int = get_generation(cache=cache, name=f"count:{label}")
+    key: str = f"count:{label}:{generation}:{digest}"
+    count: int | None = cache.get(key=key)
+
+    if count is None:
+        count = queryset.count()
+        cache.set(
+            key=key, value=count, timeout=settings.SNIPPETS_COUNT_CACHE_TIMEOUT
+        )
+
+    return count
+
+
+def response_cache() -> BaseCache | None:
+    """
+    Response Cache Function
+
+    Description:
+        - This function is used to get the Django cache named by
+        `SNIPPETS_RESPONSE_CACHE`.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `BaseCache | None`: The cache, `None` when it is disabled.
+
+    """
+    if not settings.SNIPPETS_RESPONSE_CACHE:
+        return None
+
+    return caches[settings.SNIPPETS_RESPONSE_CACHE]
+
+
+def response_generations(labels: Iterable[str]) -> str:
+    """
+    Response Generations Function
+
+    Description:
+        - This function is used to get the combined generation of the
+        cached responses built from the given models.
+
+    Args:
+        - `labels (Iterable[str])`: Lower case labels of the models.
+        **(Required)**
+
+    Returns:
+        - `str`: The generations of the models, joined by dots.
+
+    """
+    cache: BaseCache | None = response_cache()
+
+    if cache is None:
+        return ""
+
+    return ".".join(
+        str(get_generation(cache=cache, name=f"response:{label}"))
+        for label in labels
+    )
+
+
+def invalidate_responses(model: type[Model]) -> None:
+    """
+    Invalidate Responses Function
+
+    Description:
+        - This function is used to drop every cached response built from a
+        model.
+
+    Args:
+        - `model (type[Model])`: The changed model. **(Required)**
+
+    Returns:
+        - `None`
+
+    """
+    cache: BaseCache | None = response_cache()
+
+    if cache is not None:
+        bump_generation(
+            cache=cache, name=f"response:{model._meta.label_lower}"
+        )
@@ -0,0 +1,248 @@
+"""
+Snippets Fields Module
+
+Description:
+    - This module contains the serializer fields for the snippets app.
+
+"""
+
+from typing import Any
+from urllib.parse import urlencode
+
+from django.http import HttpRequest
+from django.urls import NoReverseMatch
+from rest_framework.fields import Field
+from rest_framework.relations import (
+    HyperlinkedIdentityField,
+    HyperlinkedRelatedField,
+)
+from rest_framework.reverse import reverse
+
+# Stands in for the lookup value while the URL template of a route is built,
+# it matches the default lookup pattern of the router and is never quoted.
+LOOKUP_SENTINEL: str = "__lookup__"
+
+
+class FastHyperlinkMixin:
+    """
+    Fast Hyperlink Mixin Class
+
+    Description:
+        - This class is used to build the links of hyperlinked fields
+        without resolving the route of every object.
+        - The route of a view is reversed once per request and format, with
+        `LOOKUP_SENTINEL` as the lookup value, and integer lookup values are
+        formatted into the resulting template. Integers always match the
+        route and are never quoted, so the links are identical to the ones
+        `reverse()` builds. Other lookup values are reversed as usual.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `get_url(obj: Any, view_name: str, request: HttpRequest,
+        format: str | None) -> str | None`: Get the link to an object.
+        - `get_url_template(view_name: str, request: HttpRequest,
+        format: str | None) -> tuple[str, str] | None`: Get the link
+        template of a route.
+
+    """
+
+    lookup_field: str
+    lookup_url_kwarg: str
+
+    # Link templates of the current request by view name and format.
+    _url_templates: dict[tuple[str, str | None], tuple[str, str] | None]
+    _url_templates_request: HttpRequest | None = None
+
+    def get_url(
+        self,
+        obj: Any,
+        view_name: str,
+        request: HttpRequest,
+        format: str | None,  # pylint: disable=redefined-builtin
+    ) -> str | None:
+        """
+        Get Url Method
+
+        Description:
+            - This method is used to get the link to an object, from the
+            link template of the route when possible.
+
+        Args:
+            - `obj (Any)`: The object. **(Required)**
+            - `view_name (str)`: Name of the route. **(Required)**
+            - `request (HttpRequest)`: The request object. **(Required)**
+            - `format (str | None)`: The format suffix. **(Required)**
+
+        Returns:
+            - `str | None`: The link, `None` for unsaved objects.
+
+        """
+        lookup_value: Any = getattr(obj, self.lookup_field, None)
+        template: tuple[str, str] | None = (
+            self.get_url_template(
+                view_name=view_name, request=request, format=format
+            )
+            if type(lookup_value) is int
+            else None
+        )
+
+        if template is None:
+            return super().get_url(  # type: ignore
+                obj, view_name, request, format
+            )
+
+        return f"{template[0]}{lookup_value}{template[1]}"
+
+    def get_url_template(
+        self,
+        view_name: str,
+        request: HttpRequest,
+        format: str | None,  # pylint: disable=redefined-builtin
+    ) -> tuple[str, str] | None:
+        """
+        Get Url Template Method
+
+        Description:
+            - This method is used to get the link template of a route, the
+            parts of the link before and after the lookup value.
+            - Templates are kept for the current request only, links are
+            absolute and depend on its host.
+
+        Args:
+            - `view_name (str)`: Name of the route. **(Required)**
+            - `request (HttpRequest)`: The request object. **(Required)**
+            - `format (str | None)`: The format suffix. **(Required)**
+
+        Returns:
+            - `tuple[str, str] | None`: The link template, `None` when the
+            route cannot be templated.
+
+        """
+        if self._url_templates_request is not request:
+            self._url_templates = {}
+            self._url_templates_request = request
+
+        key: tuple[str, str | None] = (view_name, format)
+
+        if key not in self._url_templates:
+            try:
+                url: str = self.reverse(  # type: ignore
+                    view_name,
+                    kwargs={self.lookup_url_kwarg: LOOKUP_SENTINEL},
+                    request=request,
+                    format=format,
+                )
+            except NoReverseMatch:
+                url = ""
+
+            parts: list[str] = url.split(LOOKUP_SENTINEL)
+            self._url_templates[key] = (
+                (parts[0], parts[1]) if len(parts) == 2 else None
+            )
+
+        return self._url_templates[key]
+
+
+class FastHyperlinkedRelatedField(FastHyperlinkMixin, HyperlinkedRelatedField):
+    """
+    Fast Hyperlinked Related Field Class
+
+    Description:
+        - This class is a `HyperlinkedRelatedField` building its links from
+        link templates, see `FastHyperlinkMixin`.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+
+class FastHyperlinkedIdentityField(
+    FastHyperlinkMixin, HyperlinkedIdentityField
+):
+    """
+    Fast Hyperlinked Identity Field Class
+
+    Description:
+        - This class is a `HyperlinkedIdentityField` building its links from
+        link templates, see `FastHyperlinkMixin`.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+
+class FilteredListLinkField(Field):
+    """
+    Filtered List Link Field Class
+
+    Description:
+        - This class is used to link an object to a list filtered by one of
+        its attributes, as `/snippets/?owner=<username>`.
+        - The list is reversed once per request, like the links of
+        `FastHyperlinkMixin`.
+
+    Attributes:
+        - `view_name (str)`: Name of the list route.
+        - `lookup_field (str)`: Attribute of the object filtered by.
+        - `query_param (str)`: Query parameter of the filter.
+
+    Methods:
+        - `to_representation(value: Any) -> str`: Get the link.
+
+    """
+
+    _url: str = ""
+    _url_request: HttpRequest | None = None
+
+    def __init__(
+        self, view_name: str, lookup_field: str, query_param: str, **kwargs
+    ) -> None:
+        self.view_name: str = view_name
+        self.lookup_field: str = lookup_field
+        self.query_param: str = query_param
+        kwargs["read_only"] = True
+        kwargs["source"] = "*"
+        super().__init__(**kwargs)
+
+    def to_representation(self, value: Any) -> str:
+        """
+        To Representation Method
+
+        Description:
+            - This method is used to get the link to the list filtered by
+            the object.
+
+        Args:
+            - `value (Any)`: The object. **(Required)**
+
+        Returns:
+            - `str`: The link.
+
+        """
+        request: HttpRequest = self.context["request"]
+
+        if self._url_request is not request:
+            self._url = reverse(
+                viewname=self.view_name,
+                request=request,
+                format=self.context.get("format"),
+            )
+            self._url_request = request
+
+        # Format query parameters are kept by `reverse()`.
+        separator: str = "&" if "?" in self._url else "?"
+        query: str = urlencode(
+            query={self.query_param: getattr(value, self.lookup_field)}
+        )
+
+        return f"{self._url}{separator}{query}"
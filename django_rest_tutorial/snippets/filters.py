@@ -0,0 +1,122 @@
+"""
+Snippets Filters Module
+
+Description:
+    - This module contains the filter backends for the snippets app.
+
+"""
+
+from typing import Any
+
+from django.db.models import QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+from .serializers import SnippetFilterSerializer
+
+
+class SnippetFilterBackend(BaseFilterBackend):
+    """
+    Snippet Filter Backend Class
+
+    Description:
+        - This class is used to filter snippets by owner, language, style
+        and creation time.
+        - Every filter is backed by an index leading with the filtered
+        column and followed by the pagination keys, see `Snippet.Meta`.
+        - Invalid parameters are answered with `400 Bad Request`.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `filter_queryset(request, queryset, view) -> QuerySet`: Filter the
+        snippets.
+        - `get_schema_operation_parameters(view) -> list[dict]`: Describe
+        the query parameters.
+
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: Any
+    ) -> QuerySet:
+        """
+        Filter Queryset Method
+
+        Description:
+            - This method is used to filter snippets by the `owner`
+            username, `language`, `style`, `created_after` and
+            `created_before` query parameters, empty parameters are ignored.
+
+        Args:
+            - `request (Request)`: The request object. **(Required)**
+            - `queryset (QuerySet)`: The snippets. **(Required)**
+            - `view (Any)`: The view. **(Required)**
+
+        Returns:
+            - `QuerySet`: The filtered snippets.
+
+        """
+        serializer: SnippetFilterSerializer = SnippetFilterSerializer(
+            data={
+                name: value
+                for name in SnippetFilterSerializer.Meta.fields
+                if (value := request.query_params.get(key=name))
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        params: dict[str, Any] = serializer.validated_data
+        lookups: dict[str, str] = {
+            "owner": "owner__username",
+            "language": "language",
+            "style": "style",
+            "created_after": "created__gte",
+            "created_before": "created__lt",
+        }
+
+        return queryset.filter(
+            **{lookups[name]: value for name, value in params.items()}
+        )
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict]:
+        """
+        Describe the query parameters of the filters.
+
+        """
+        return [
+            {
+                "name": "owner",
+                "required": False,
+                "in": "query",
+                "description": "Username of the owner of the snippets.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": "language",
+                "required": False,
+                "in": "query",
+                "description": "Language of the snippets.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": "style",
+                "required": False,
+                "in": "query",
+                "description": "Style of the snippets.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": "created_after",
+                "required": False,
+                "in": "query",
+                "description": "Earliest creation time, inclusive.",
+                "schema": {"type": "string", "format": "date-time"},
+            },
+            {
+                "name": "created_before",
+                "required": False,
+                "in": "query",
+                "description": "Latest creation time, exclusive.",
+                "schema": {"type": "string", "format": "date-time"},
+            },
+        ]
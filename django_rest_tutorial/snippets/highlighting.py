@@ -0,0 +1,831 @@
+"""
+Snippets Highlighting Module
+
+Description:
+    - This module contains the helpers used to render snippets with
+    `pygments`.
+    - The helpers only depend on `pygments` so they can be executed inside
+    the background render pool without a configured Django project.
+    - Pages are also stored compressed with `brotli` when the package is
+    installed.
+    - Renders can be bounded in time, the budget is enforced with signals
+    and resource limits, so it is only available on Unix.
+
+"""
+
+import signal
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import cache
+from gzip import compress as gzip_compress
+from hashlib import sha256
+from html import escape
+from itertools import chain, islice
+from json import dumps, loads
+from math import ceil
+from threading import Lock
+from types import FrameType
+from typing import Any, Generic, Literal, NamedTuple, TypeVar
+from zlib import compressobj, decompressobj
+
+from pygments import format as format_tokens
+from pygments import lex
+from pygments.formatters.html import (
+    CSSFILE_TEMPLATE,
+    DOC_FOOTER,
+    DOC_HEADER_EXTERNALCSS,
+    HtmlFormatter,
+)
+from pygments.lexer import Lexer
+from pygments.lexers import get_lexer_by_name
+from pygments.token import Token, _TokenType, string_to_tokentype
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+KT = TypeVar("KT")
+VT = TypeVar("VT")
+
+# Bump whenever the rendered output changes so stale cache entries are
+# never served.
+HIGHLIGHT_VERSION: int = 4
+
+# Size of the compressed slices decoded at a time by `load_tokens`.
+TOKEN_CHUNK_SIZE: int = 64 * 1024
+
+# Number of lines formatted at a time by `stream_highlighted`.
+STREAM_CHUNK_LINES: int = 500
+
+# Character standing in for the lines of the sample fragment of
+# `fragment_markup`, a private use code point that is never escaped.
+MARKUP_PLACEHOLDER: str = "\ue000"
+
+# Number of lexer and formatter instances kept by each process.
+LEXER_CACHE_SIZE: int = 64
+FORMATTER_CACHE_SIZE: int = 8
+
+# Compression levels of the stored pages. Pages are compressed while the
+# snippet is saved, the highest levels cost several times as much for a few
+# percent of the size.
+GZIP_LEVEL: int = 6
+BROTLI_QUALITY: int = 5
+
+# Content codings pages are stored in, by preference.
+PAGE_ENCODINGS: tuple[str, ...] = (
+    ("br", "gzip") if brotli is not None else ("gzip",)
+)
+
+
+class Rendered(NamedTuple):
+    """
+    Rendered Class
+
+    Description:
+        - This class holds the result of highlighting a snippet.
+
+    Attributes:
+        - `highlighted (str)`: The highlighted HTML fragment.
+        - `tokens (bytes)`: The serialized token stream, see `dump_tokens`.
+        - `lines (int)`: The number of highlighted lines.
+
+    Methods:
+        - `None`
+
+    """
+
+    highlighted: str
+    tokens: bytes
+    lines: int
+
+
+class RenderTimeout(Exception):
+    """
+    Render Timeout Class
+
+    Description:
+        - This exception is raised when a render exceeds its budget, see
+        `render_budget`.
+
+    """
+
+
+class LRUCache(Generic[KT, VT]):
+    """
+    LRU Cache Class
+
+    Description:
+        - This class is a small, thread-safe, bounded least recently used
+        cache with hit and miss counters.
+        - When a `sizeof` function is given the cache is also bounded by
+        the total size of its values, values larger than `maxbytes` on
+        their own are not cached.
+
+    Attributes:
+        - `maxsize (int)`: The maximum number of entries kept.
+        - `maxbytes (int | None)`: The maximum total size of the values
+        kept, `None` for no bound.
+        - `nbytes (int)`: The total size of the cached values.
+        - `hits (int)`: Number of lookups answered by the cache.
+        - `misses (int)`: Number of lookups not answered by the cache.
+
+    Methods:
+        - `get(key: KT) -> VT | None`: Get a cached value.
+        - `set(key: KT, value: VT) -> None`: Cache a value.
+        - `clear() -> None`: Drop every entry and reset the counters.
+        - `__len__() -> int`: Get the number of cached entries.
+
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        maxbytes: int | None = None,
+        sizeof: Callable[[VT], int] | None = None,
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.maxbytes: int | None = maxbytes
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._sizeof: Callable[[VT], int] | None = sizeof
+        self._data: OrderedDict[KT, tuple[VT, int]] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def get(self, key: KT) -> VT | None:
+        """
+        Get a cached value and mark it as most recently used.
+
+        """
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._data.move_to_end(key=key)
+            return self._data[key][0]
+
+    def set(self, key: KT, value: VT) -> None:
+        """
+        Cache a value, evicting the least recently used entries when full.
+
+        """
+        if self.maxsize <= 0:
+            return
+
+        size: int = self._sizeof(value) if self._sizeof is not None else 0
+
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._data[key][1]
+
+            self._data[key] = (value, size)
+            self._data.move_to_end(key=key)
+            self.nbytes += size
+
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes
+            ):
+                self.nbytes -= self._data.popitem(last=False)[1][1]
+
+    def __len__(self) -> int:
+        """
+        Get the number of cached entries.
+
+        """
+        return len(self._data)
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+
+        """
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+_lexers: LRUCache[str, Lexer] = LRUCache(maxsize=LEXER_CACHE_SIZE)
+_formatters: LRUCache[bool, HtmlFormatter] = LRUCache(
+    maxsize=FORMATTER_CACHE_SIZE
+)
+
+
+def get_lexer(language: str) -> Lexer:
+    """
+    Get Lexer Function
+
+    Description:
+        - This function is used to get a shared lexer instance for a
+        language alias, lexers are only created on a cache miss.
+
+    Args:
+        - `language (str)`: Language of the snippet. **(Required)**
+
+    Returns:
+        - `Lexer`: The lexer.
+
+    """
+    lexer: Lexer | None = _lexers.get(key=language)
+
+    if lexer is None:
+        lexer = get_lexer_by_name(_alias=language)
+        _lexers.set(key=language, value=lexer)
+
+    return lexer
+
+
+def get_formatter(linenos: bool) -> HtmlFormatter:
+    """
+    Get Formatter Function
+
+    Description:
+        - This function is used to get a shared fragment formatter, creating
+        one computes the style tables so it is only done on a cache miss.
+        - Fragments do not depend on the style or title of a snippet, so
+        the line numbers option is the whole key.
+
+    Args:
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+
+    Returns:
+        - `HtmlFormatter`: The formatter.
+
+    """
+    formatter: HtmlFormatter | None = _formatters.get(key=linenos)
+
+    if formatter is None:
+        table: Literal["table", False] = "table" if linenos else False
+        formatter = HtmlFormatter(linenos=table)  # type: ignore
+        _formatters.set(key=linenos, value=formatter)
+
+    return formatter
+
+
+@cache
+def get_line_formatter() -> HtmlFormatter:
+    """
+    Get Line Formatter Function
+
+    Description:
+        - This function is used to get the shared formatter of bare
+        highlighted lines, without the markup around them.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `HtmlFormatter`: The formatter.
+
+    """
+    return HtmlFormatter(nowrap=True)
+
+
+def cache_info() -> dict[str, dict[str, int]]:
+    """
+    Cache Info Function
+
+    Description:
+        - This function is used to get the counters of the lexer and
+        formatter caches of the current process.
+        - Code is lexed in the render pool, whose workers report these
+        counters, see `tasks.render_cache_info`.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `dict[str, dict[str, int]]`: Hits, misses and size of each cache.
+
+    """
+    return {
+        name: {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "size": len(cache),
+            "maxsize": cache.maxsize,
+        }
+        for name, cache in (("lexers", _lexers), ("formatters", _formatters))
+    }
+
+
+def highlight_key(code: str, language: str, linenos: bool) -> str:
+    """
+    Highlight Key Function
+
+    Description:
+        - This function is used to build a content address for the inputs of
+        a render, identical inputs always map to the same key.
+
+    Args:
+        - `code (str)`: Code of the snippet. **(Required)**
+        - `language (str)`: Language of the snippet. **(Required)**
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+
+    Returns:
+        - `str`: The hex digest of the render inputs.
+
+    """
+    payload: str = dumps(obj=[HIGHLIGHT_VERSION, code, language, linenos])
+
+    return sha256(payload.encode()).hexdigest()
+
+
+def dump_tokens(tokens: Iterable[tuple[_TokenType, str]]) -> bytes:
+    """
+    Dump Tokens Function
+
+    Description:
+        - This function is used to serialize a lexed token stream.
+        - Every token is written as a JSON array on its own line and the
+        result is compressed with `zlib`, so it can be read back
+        incrementally.
+
+    Args:
+        - `tokens (Iterable[tuple[_TokenType, str]])`: The token stream.
+        **(Required)**
+
+    Returns:
+        - `bytes`: The serialized token stream.
+
+    """
+    compressor = compressobj()
+    chunks: list[bytes] = [
+        compressor.compress(
+            # `str(Token.Name)` is "Token.Name", the prefix is implied.
+            (dumps(obj=[str(ttype)[6:], value]) + "\n").encode()
+        )
+        for ttype, value in tokens
+    ]
+    chunks.append(compressor.flush())
+
+    return b"".join(chunks)
+
+
+def load_tokens(data: bytes) -> Iterator[tuple[_TokenType, str]]:
+    """
+    Load Tokens Function
+
+    Description:
+        - This function is used to lazily read back a token stream written
+        by `dump_tokens`.
+
+    Args:
+        - `data (bytes)`: The serialized token stream. **(Required)**
+
+    Returns:
+        - `Iterator[tuple[_TokenType, str]]`: The token stream.
+
+    """
+    decompressor = decompressobj()
+    pending: bytes = b""
+
+    for start in range(0, len(data) + 1, TOKEN_CHUNK_SIZE):
+        chunk: bytes = data[start : start + TOKEN_CHUNK_SIZE]
+        pending += (
+            decompressor.decompress(chunk) if chunk else decompressor.flush()
+        )
+        *lines, pending = pending.split(b"\n")
+
+        for line in lines:
+            name, value = loads(line)
+            yield string_to_tokentype(name), value
+
+
+def split_lines(
+    tokens: Iterable[tuple[_TokenType, str]],
+) -> Iterator[list[tuple[_TokenType, str]]]:
+    """
+    Split Lines Function
+
+    Description:
+        - This function is used to split a token stream into lines, tokens
+        spanning several lines are split at the line breaks.
+        - Every line but the last one ends with its line break.
+
+    Args:
+        - `tokens (Iterable[tuple[_TokenType, str]])`: The token stream.
+        **(Required)**
+
+    Returns:
+        - `Iterator[list[tuple[_TokenType, str]]]`: The tokens of every
+        line.
+
+    """
+    line: list[tuple[_TokenType, str]] = []
+
+    for ttype, value in tokens:
+        *parts, rest = value.split("\n")
+
+        for part in parts:
+            line.append((ttype, part + "\n"))
+            yield line
+            line = []
+
+        if rest:
+            line.append((ttype, rest))
+
+    if line:
+        yield line
+
+
+def render_highlighted(
+    code: str, language: str, linenos: bool, tokens: bytes = b""
+) -> Rendered:
+    """
+    Render Highlighted Function
+
+    Description:
+        - This function is used to create a highlighted HTML fragment of a
+        code snippet.
+        - The fragment only refers to CSS classes, the colors of a style
+        come from the stylesheet built by `style_css`.
+        - When the serialized token stream of the code is passed in, the
+        code is only formatted and not lexed again.
+
+    Args:
+        - `code (str)`: Code of the snippet. **(Required)**
+        - `language (str)`: Language of the snippet. **(Required)**
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+        - `tokens (bytes)`: Serialized token stream of the code.
+        **(Optional)**
+
+    Returns:
+        - `Rendered`: The highlighted HTML fragment and the token stream.
+
+    """
+    if not tokens:
+        tokens = dump_tokens(
+            tokens=lex(code=code, lexer=get_lexer(language=language))
+        )
+
+    return Rendered(
+        highlighted=format_tokens(
+            tokens=load_tokens(data=tokens),
+            formatter=get_formatter(linenos=linenos),
+        ),
+        tokens=tokens,
+        lines=sum(1 for _ in split_lines(tokens=load_tokens(data=tokens))),
+    )
+
+
+def render_fallback(code: str, linenos: bool) -> Rendered:
+    """
+    Render Fallback Function
+
+    Description:
+        - This function is used to create the fragment of code that could
+        not be highlighted in time.
+        - The code is rendered as plain escaped text, in the markup of
+        highlighted fragments, so it is paged and streamed like them. Plain
+        text is never matched against the patterns of a lexer, so this
+        takes linear time.
+
+    Args:
+        - `code (str)`: Code of the snippet. **(Required)**
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+
+    Returns:
+        - `Rendered`: The plain text fragment and the token stream.
+
+    """
+    return render_highlighted(code=code, language="text", linenos=linenos)
+
+
+def _raise_timeout(signum: int, frame: FrameType | None) -> None:
+    """
+    Interrupt a render that exceeded its budget.
+
+    """
+    raise RenderTimeout(
+        "Highlighting exceeded its "
+        f"{'CPU time' if signum == signal.SIGXCPU else 'time'} budget."
+    )
+
+
+@contextmanager
+def render_budget(timeout: float, cpu_time: float) -> Iterator[None]:
+    """
+    Render Budget Function
+
+    Description:
+        - This function is used to bound the wall-clock and CPU time of
+        the code run inside it, `RenderTimeout` is raised when either runs
+        out.
+        - The wall-clock budget is an interval timer, the CPU budget a soft
+        `RLIMIT_CPU` raised back once done, so the process can take more
+        renders. Pathological patterns of a lexer are interrupted as well,
+        the regular expression engine checks for signals while matching.
+        - Signals are only delivered to the main thread, the budget is
+        meant for the render pool workers.
+
+    Args:
+        - `timeout (float)`: Wall-clock budget in seconds, zero for none.
+        **(Required)**
+        - `cpu_time (float)`: CPU budget in seconds, rounded up to whole
+        seconds of the process, zero for none. **(Required)**
+
+    Returns:
+        - `Iterator[None]`: The context.
+
+    Raises:
+        - `RenderTimeout`: If the code exceeds its budget.
+
+    """
+    handlers: dict[int, Any] = {
+        signum: signal.signal(signum, _raise_timeout)
+        for signum in (signal.SIGALRM, signal.SIGXCPU)
+    }
+    limits: tuple[int, int] | None = None
+
+    try:
+        if resource is not None and cpu_time > 0:
+            limits = resource.getrlimit(resource.RLIMIT_CPU)
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            soft: int = ceil(usage.ru_utime + usage.ru_stime + cpu_time)
+
+            if limits[1] != resource.RLIM_INFINITY:
+                soft = min(soft, limits[1])
+
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, limits[1]))
+
+        if timeout > 0:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+        if limits is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, limits)
+
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+
+def render_bounded(
+    code: str,
+    language: str,
+    linenos: bool,
+    tokens: bytes = b"",
+    timeout: float = 0.0,
+    cpu_time: float = 0.0,
+) -> Rendered:
+    """
+    Render Bounded Function
+
+    Description:
+        - This function is used to create a highlighted HTML fragment of a
+        code snippet within a time budget, see `render_highlighted` and
+        `render_budget`.
+
+    Args:
+        - `code (str)`: Code of the snippet. **(Required)**
+        - `language (str)`: Language of the snippet. **(Required)**
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+        - `tokens (bytes)`: Serialized token stream of the code.
+        **(Optional)**
+        - `timeout (float)`: Wall-clock budget in seconds. **(Optional)**
+        - `cpu_time (float)`: CPU budget in seconds. **(Optional)**
+
+    Returns:
+        - `Rendered`: The highlighted HTML fragment and the token stream.
+
+    Raises:
+        - `RenderTimeout`: If the render exceeds its budget.
+
+    """
+    with render_budget(timeout=timeout, cpu_time=cpu_time):
+        return render_highlighted(
+            code=code, language=language, linenos=linenos, tokens=tokens
+        )
+
+
+@cache
+def fragment_markup(linenos: bool) -> tuple[str, str, str, str]:
+    """
+    Fragment Markup Function
+
+    Description:
+        - This function is used to get the markup `render_highlighted` wraps
+        around the lines and line numbers of a fragment, so fragments can be
+        streamed in the markup of the formatter.
+        - The markup is read from a two line fragment of placeholder
+        characters, class names and other markup of the formatter hold no
+        digits, so the line numbers are the only ones.
+
+    Args:
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+
+    Returns:
+        - `tuple[str, str, str, str]`: The markup before the first line
+        number, between two line numbers, before the first line and after
+        the last line. The line number markup is empty without line
+        numbers.
+
+    """
+    sample: str = format_tokens(
+        tokens=[(Token.Text, f"{MARKUP_PLACEHOLDER}\n")] * 2,
+        formatter=get_formatter(linenos=linenos),
+    )
+    before: str = sample[: sample.index(MARKUP_PLACEHOLDER)]
+    after: str = sample[sample.rindex(MARKUP_PLACEHOLDER) + 2 :]
+
+    if not linenos:
+        return "", "", before, after
+
+    numbers, rest = before.split("1", 1)
+    separator, head = rest.split("2", 1)
+
+    return numbers, separator, head, after
+
+
+def stream_highlighted(
+    tokens: bytes, linenos: bool, start: int, stop: int
+) -> Iterator[str]:
+    """
+    Stream Highlighted Function
+
+    Description:
+        - This function is used to create the highlighted HTML fragment of
+        a range of lines from the serialized token stream of the code.
+        - The fragment is created `STREAM_CHUNK_LINES` lines at a time, so
+        memory use does not depend on the size of the code. The fragment
+        of every line is the one `render_highlighted` creates, line
+        numbers start at the first line of the range.
+
+    Args:
+        - `tokens (bytes)`: Serialized token stream of the code.
+        **(Required)**
+        - `linenos (bool)`: Whether to display line numbers. **(Required)**
+        - `start (int)`: Number of the first line, from 1. **(Required)**
+        - `stop (int)`: Number of the last line, at most the number of
+        lines of the code. **(Required)**
+
+    Returns:
+        - `Iterator[str]`: The pieces of the fragment.
+
+    """
+    numbers, separator, head, tail = fragment_markup(linenos=linenos)
+
+    if linenos:
+        width: int = len(str(stop))
+        yield numbers
+
+        for first in range(start, stop + 1, STREAM_CHUNK_LINES):
+            last: int = min(first + STREAM_CHUNK_LINES - 1, stop)
+            yield (separator if first > start else "") + separator.join(
+                f"{number:{width}d}" for number in range(first, last + 1)
+            )
+
+    yield head
+
+    lines: Iterator[list[tuple[_TokenType, str]]] = islice(
+        split_lines(tokens=load_tokens(data=tokens)), start - 1, stop
+    )
+
+    while chunk := list(islice(lines, STREAM_CHUNK_LINES)):
+        yield format_tokens(
+            tokens=chain.from_iterable(chunk),
+            formatter=get_line_formatter(),
+        )
+
+    yield tail
+
+
+@cache
+def style_css(style: str) -> str:
+    """
+    Style CSS Function
+
+    Description:
+        - This function is used to build the stylesheet of a style, it is
+        only built once per style.
+
+    Args:
+        - `style (str)`: Name of the style. **(Required)**
+
+    Returns:
+        - `str`: The stylesheet.
+
+    """
+    return CSSFILE_TEMPLATE % {
+        "styledefs": HtmlFormatter(style=style).get_style_defs("body")
+    }
+
+
+@cache
+def style_etag(style: str) -> str:
+    """
+    Style ETag Function
+
+    Description:
+        - This function is used to get the strong entity tag of the
+        stylesheet of a style.
+
+    Args:
+        - `style (str)`: Name of the style. **(Required)**
+
+    Returns:
+        - `str`: The quoted entity tag.
+
+    """
+    return f'"{sha256(style_css(style=style).encode()).hexdigest()}"'
+
+
+def stream_page(
+    highlighted: Iterable[str], title: str, stylesheet: str
+) -> Iterator[str]:
+    """
+    Stream Page Function
+
+    Description:
+        - This function is used to wrap the pieces of a highlighted fragment
+        in a complete HTML document linking to the stylesheet of its style.
+
+    Args:
+        - `highlighted (Iterable[str])`: The pieces of the highlighted HTML
+        fragment. **(Required)**
+        - `title (str)`: Title of the snippet. **(Required)**
+        - `stylesheet (str)`: URL of the stylesheet. **(Required)**
+
+    Returns:
+        - `Iterator[str]`: The pieces of the HTML document.
+
+    """
+    yield DOC_HEADER_EXTERNALCSS % {
+        "title": escape(title),
+        "cssfile": escape(stylesheet),
+        "encoding": "utf-8",
+    }
+    yield from highlighted
+    yield DOC_FOOTER
+
+
+def render_page(highlighted: str, title: str, stylesheet: str) -> str:
+    """
+    Render Page Function
+
+    Description:
+        - This function is used to wrap a highlighted fragment in a complete
+        HTML document, see `stream_page`.
+
+    Args:
+        - `highlighted (str)`: The highlighted HTML fragment. **(Required)**
+        - `title (str)`: Title of the snippet. **(Required)**
+        - `stylesheet (str)`: URL of the stylesheet. **(Required)**
+
+    Returns:
+        - `str`: The HTML document.
+
+    """
+    return "".join(
+        stream_page(
+            highlighted=(highlighted,), title=title, stylesheet=stylesheet
+        )
+    )
+
+
+def compress_page(page: str) -> dict[str, bytes]:
+    """
+    Compress Page Function
+
+    Description:
+        - This function is used to compress an HTML document in every
+        content coding of `PAGE_ENCODINGS`.
+        - Pages are compressed while the snippet is saved, so moderate
+        compression levels are used, see `GZIP_LEVEL` and
+        `BROTLI_QUALITY`.
+
+    Args:
+        - `page (str)`: The HTML document. **(Required)**
+
+    Returns:
+        - `dict[str, bytes]`: The compressed document by content coding.
+
+    """
+    data: bytes = page.encode()
+    # A fixed modification time keeps the output of identical pages equal.
+    pages: dict[str, bytes] = {
+        "gzip": gzip_compress(data=data, compresslevel=GZIP_LEVEL, mtime=0)
+    }
+
+    if brotli is not None:
+        pages["br"] = brotli.compress(
+            data, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY
+        )
+
+    return pages
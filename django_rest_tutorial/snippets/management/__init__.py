@@ -0,0 +1,7 @@
+"""
+Snippets Management Package
+
+Description:
+    - This package contains the management commands of the snippets app.
+
+"""
@@ -0,0 +1,7 @@
+"""
+Snippets Commands Package
+
+Description:
+    - This package contains the management commands of the snippets app.
+
+"""
@@ -0,0 +1,77 @@
+"""
+Render Pending Command Module
+
+Description:
+    - This module contains the command that highlights the snippets left
+    without a render.
+    - Renders scheduled with `SNIPPETS_ASYNC_HIGHLIGHT` only live in the
+    memory of the server, snippets stay pending when it stops before they
+    are stored. Run the command after a restart, or from a periodic job.
+    - Failed snippets are never retried on their own, they are rendered
+    again as well unless `--pending-only` is given.
+
+Usage:
+    - `./manage.py render_pending --batch-size 100`
+
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from snippets.models import RenderStatus, Snippet, SnippetQuerySet
+
+
+class Command(BaseCommand):
+    """
+    Render Pending Command Class
+
+    Description:
+        - This class highlights the pending and failed snippets again.
+
+    Attributes:
+        - `help (str)`: The description of the command.
+
+    Methods:
+        - `add_arguments(parser: CommandParser) -> None`: Add the options of
+        the command.
+        - `handle(*args, **options) -> None`: Render the snippets.
+
+    """
+
+    help: str = "Highlight the snippets left pending or failed."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the options of the command.
+
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of snippets rendered at once.",
+        )
+        parser.add_argument(
+            "--pending-only",
+            action="store_true",
+            help="Leave the failed snippets alone.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Render the pending snippets, and the failed ones unless told not to.
+
+        """
+        statuses: set[str] = {RenderStatus.PENDING}
+
+        if not options["pending_only"]:
+            statuses.add(RenderStatus.FAILED)
+
+        # pylint: disable-next=no-member
+        snippets: SnippetQuerySet = Snippet.objects.filter(
+            render_status__in=statuses
+        ).order_by("pk")
+        rendered: int = snippets.render_again(batch_size=options["batch_size"])
+
+        self.stdout.write(f"Rendered {rendered} snippets.")
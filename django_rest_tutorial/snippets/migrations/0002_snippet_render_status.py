@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-17 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="snippet",
+            name="render_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="ready",
+                max_length=7,
+            ),
+        ),
+    ]
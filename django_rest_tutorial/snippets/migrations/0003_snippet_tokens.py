@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-17 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0002_snippet_render_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="snippet",
+            name="tokens",
+            field=models.BinaryField(default=b"", editable=False),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1 on 2026-10-17 08:41
+
+from django.db import migrations
+from pygments import highlight
+from pygments.formatters.html import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+
+
+def render_snippets(apps, full: bool) -> None:
+    """
+    Highlight every stored snippet again, as a fragment or as a document.
+
+    """
+    Snippet = apps.get_model("snippets", "Snippet")
+    batch = []
+
+    for snippet in Snippet.objects.iterator(chunk_size=500):
+        options = {"full": True, "style": snippet.style} if full else {}
+
+        if full and snippet.title:
+            options["title"] = snippet.title
+
+        snippet.highlighted = highlight(
+            code=snippet.code,
+            lexer=get_lexer_by_name(_alias=snippet.language),
+            formatter=HtmlFormatter(
+                linenos="table" if snippet.linenos else False, **options
+            ),
+        )
+        batch.append(snippet)
+
+        if len(batch) == 500:
+            Snippet.objects.bulk_update(objs=batch, fields=["highlighted"])
+            batch = []
+
+    Snippet.objects.bulk_update(objs=batch, fields=["highlighted"])
+
+
+def render_fragments(apps, schema_editor) -> None:
+    """
+    Store fragments, the page and stylesheet are built when serving them.
+
+    """
+    render_snippets(apps=apps, full=False)
+
+
+def render_documents(apps, schema_editor) -> None:
+    """
+    Store complete HTML documents with an embedded stylesheet again.
+
+    """
+    render_snippets(apps=apps, full=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0003_snippet_tokens"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=render_fragments, reverse_code=render_documents
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-17 09:15
+
+from django.db import migrations, models
+
+import snippets.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0004_highlighted_fragments"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="snippet",
+            name="language",
+            field=models.CharField(
+                choices=snippets.models.get_language_choices,
+                default="python",
+                max_length=100,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="snippet",
+            name="style",
+            field=models.CharField(
+                choices=snippets.models.get_style_choices,
+                default="friendly",
+                max_length=100,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-17 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0005_lazy_choices"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="snippet",
+            index=models.Index(
+                fields=["created", "id"], name="snippet_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1 on 2026-10-17 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0006_snippet_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="snippet",
+            index=models.Index(
+                fields=["owner", "created", "id"],
+                name="snippet_owner_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="snippet",
+            index=models.Index(
+                fields=["language", "created", "id"],
+                name="snippet_language_created_idx",
+            ),
+        ),
+    ]
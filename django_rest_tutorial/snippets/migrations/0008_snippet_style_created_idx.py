@@ -0,0 +1,19 @@
+# Generated by Django 5.1 on 2026-10-17 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0007_snippet_owner_language_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="snippet",
+            index=models.Index(
+                fields=["style", "created", "id"],
+                name="snippet_style_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1 on 2026-10-17 11:46
+
+from django.db import migrations
+
+# The statements are frozen copies of the ones of `snippets.search` when this
+# migration was written, so later changes to the search module never change
+# what this migration does.
+POSTGRESQL_CREATE: tuple[str, ...] = (
+    "ALTER TABLE snippets_snippet ADD COLUMN search tsvector GENERATED ALWAYS "
+    "AS (setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', code), 'B')) STORED",
+    "CREATE INDEX snippet_search_idx ON snippets_snippet USING GIN (search)",
+)
+POSTGRESQL_DROP: tuple[str, ...] = (
+    "ALTER TABLE snippets_snippet DROP COLUMN search",
+)
+
+SQLITE_CREATE: tuple[str, ...] = (
+    "CREATE VIRTUAL TABLE snippets_snippet_fts USING fts5(title, code, "
+    "content='snippets_snippet', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS snippets_snippet_fts_insert AFTER INSERT ON "
+    "snippets_snippet BEGIN INSERT INTO snippets_snippet_fts "
+    "(rowid, title, code) VALUES (new.id, new.title, new.code); END",
+    "CREATE TRIGGER IF NOT EXISTS snippets_snippet_fts_delete AFTER DELETE ON "
+    "snippets_snippet BEGIN INSERT INTO snippets_snippet_fts "
+    "(snippets_snippet_fts, rowid, title, code) "
+    "VALUES ('delete', old.id, old.title, old.code); END",
+    "CREATE TRIGGER IF NOT EXISTS snippets_snippet_fts_update AFTER UPDATE OF "
+    "title, code ON snippets_snippet "
+    "WHEN old.title IS NOT new.title OR old.code IS NOT new.code "
+    "BEGIN INSERT INTO snippets_snippet_fts "
+    "(snippets_snippet_fts, rowid, title, code) "
+    "VALUES ('delete', old.id, old.title, old.code); "
+    "INSERT INTO snippets_snippet_fts (rowid, title, code) "
+    "VALUES (new.id, new.title, new.code); END",
+    "INSERT INTO snippets_snippet_fts (snippets_snippet_fts) "
+    "VALUES ('rebuild')",
+)
+SQLITE_DROP: tuple[str, ...] = (
+    "DROP TRIGGER IF EXISTS snippets_snippet_fts_insert",
+    "DROP TRIGGER IF EXISTS snippets_snippet_fts_delete",
+    "DROP TRIGGER IF EXISTS snippets_snippet_fts_update",
+    "DROP TABLE IF EXISTS snippets_snippet_fts",
+)
+
+
+def run(schema_editor, statements: dict[str, tuple[str, ...]]) -> None:
+    """
+    Execute the statements of the database backend, other backends have no
+    search index.
+
+    """
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            cursor.execute(statement)
+
+
+def create_index(apps, schema_editor) -> None:
+    """
+    Create the full-text search index of the database backend and fill it
+    with the existing snippets.
+
+    """
+    run(
+        schema_editor=schema_editor,
+        statements={"postgresql": POSTGRESQL_CREATE, "sqlite": SQLITE_CREATE},
+    )
+
+
+def drop_index(apps, schema_editor) -> None:
+    """
+    Drop the full-text search index of the database backend.
+
+    """
+    run(
+        schema_editor=schema_editor,
+        statements={"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP},
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0008_snippet_style_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(code=create_index, reverse_code=drop_index),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.1 on 2026-10-17 12:31
+
+from django.db import migrations
+
+# The statements are frozen copies of the ones of `snippets.search` when this
+# migration was written. The `pg_trgm` extension is left installed when the
+# migration is reversed.
+POSTGRESQL_CREATE: tuple[str, ...] = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX snippet_code_trgm_idx ON snippets_snippet "
+    "USING GIN (code gin_trgm_ops)",
+)
+POSTGRESQL_DROP: tuple[str, ...] = (
+    "DROP INDEX IF EXISTS snippet_code_trgm_idx",
+)
+
+SQLITE_CREATE: tuple[str, ...] = (
+    "CREATE VIRTUAL TABLE snippets_snippet_trigram USING fts5(code, "
+    "content='snippets_snippet', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS snippets_snippet_trigram_insert AFTER "
+    "INSERT ON snippets_snippet BEGIN INSERT INTO snippets_snippet_trigram "
+    "(rowid, code) VALUES (new.id, new.code); END",
+    "CREATE TRIGGER IF NOT EXISTS snippets_snippet_trigram_delete AFTER "
+    "DELETE ON snippets_snippet BEGIN INSERT INTO snippets_snippet_trigram "
+    "(snippets_snippet_trigram, rowid, code) "
+    "VALUES ('delete', old.id, old.code); END",
+    "CREATE TRIGGER IF NOT EXISTS snippets_snippet_trigram_update AFTER "
+    "UPDATE OF code ON snippets_snippet WHEN old.code IS NOT new.code "
+    "BEGIN INSERT INTO snippets_snippet_trigram "
+    "(snippets_snippet_trigram, rowid, code) "
+    "VALUES ('delete', old.id, old.code); "
+    "INSERT INTO snippets_snippet_trigram (rowid, code) "
+    "VALUES (new.id, new.code); END",
+    "INSERT INTO snippets_snippet_trigram (snippets_snippet_trigram) "
+    "VALUES ('rebuild')",
+)
+SQLITE_DROP: tuple[str, ...] = (
+    "DROP TRIGGER IF EXISTS snippets_snippet_trigram_insert",
+    "DROP TRIGGER IF EXISTS snippets_snippet_trigram_delete",
+    "DROP TRIGGER IF EXISTS snippets_snippet_trigram_update",
+    "DROP TABLE IF EXISTS snippets_snippet_trigram",
+)
+
+
+def run(schema_editor, statements: dict[str, tuple[str, ...]]) -> None:
+    """
+    Execute the statements of the database backend, other backends have no
+    trigram index.
+
+    """
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            cursor.execute(statement)
+
+
+def create_index(apps, schema_editor) -> None:
+    """
+    Create the trigram index of the database backend and fill it with the
+    existing snippets.
+
+    """
+    run(
+        schema_editor=schema_editor,
+        statements={"postgresql": POSTGRESQL_CREATE, "sqlite": SQLITE_CREATE},
+    )
+
+
+def drop_index(apps, schema_editor) -> None:
+    """
+    Drop the trigram index of the database backend.
+
+    """
+    run(
+        schema_editor=schema_editor,
+        statements={"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP},
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0009_snippet_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(code=create_index, reverse_code=drop_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1 on 2026-10-17 13:12
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created(apps, schema_editor) -> None:
+    """
+    Start the modification time of existing snippets at their creation.
+
+    """
+    Snippet = apps.get_model("snippets", "Snippet")
+    Snippet.objects.update(modified=F("created"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0010_snippet_trigram"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="snippet",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            code=copy_created, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="snippet",
+            index=models.Index(
+                fields=["modified"], name="snippet_modified_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0011_snippet_modified"),
+    ]
+
+    operations = [
+        # Existing snippets get their pages on their first highlight.
+        migrations.AddField(
+            model_name="snippet",
+            name="page_brotli",
+            field=models.BinaryField(default=b"", editable=False),
+        ),
+        migrations.AddField(
+            model_name="snippet",
+            name="page_gzip",
+            field=models.BinaryField(default=b"", editable=False),
+        ),
+    ]
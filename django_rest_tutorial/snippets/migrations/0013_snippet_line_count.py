@@ -0,0 +1,80 @@
+# Generated by Django 5.1 on 2026-10-17 15:20
+
+from json import dumps, loads
+from zlib import compressobj, decompress
+
+from django.db import migrations, models
+from pygments import lex
+from pygments.lexers import get_lexer_by_name
+
+
+def dump_tokens(code: str, language: str) -> bytes:
+    """
+    Lex the code and serialize its token stream, a frozen copy of the format
+    of `snippets.highlighting.dump_tokens` when this migration was written.
+
+    """
+    compressor = compressobj()
+    chunks: list[bytes] = [
+        compressor.compress(
+            (dumps(obj=[str(ttype)[6:], value]) + "\n").encode()
+        )
+        for ttype, value in lex(
+            code=code, lexer=get_lexer_by_name(_alias=language)
+        )
+    ]
+    chunks.append(compressor.flush())
+
+    return b"".join(chunks)
+
+
+def count_token_lines(tokens: bytes) -> int:
+    """
+    Count the highlighted lines of a serialized token stream, every line but
+    the last one ends with a line break and empty last lines are not
+    counted.
+
+    """
+    lines: int = 0
+    pending: bool = False
+
+    for line in decompress(tokens).splitlines():
+        _, value = loads(line)
+        *parts, rest = value.split("\n")
+        lines += len(parts)
+        pending = bool(rest) or (pending and not parts)
+
+    return lines + pending
+
+
+def count_lines(apps, schema_editor) -> None:
+    """
+    Store the token stream and the number of lines of highlighted snippets.
+
+    """
+    Snippet = apps.get_model("snippets", "Snippet")
+
+    for snippet in Snippet.objects.filter(render_status="ready").iterator():
+        tokens: bytes = bytes(snippet.tokens) or dump_tokens(
+            code=snippet.code, language=snippet.language
+        )
+        Snippet.objects.filter(pk=snippet.pk).update(
+            tokens=tokens, line_count=count_token_lines(tokens=tokens)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0012_snippet_pages"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="snippet",
+            name="line_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            code=count_lines, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1 on 2026-10-17 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("snippets", "0013_snippet_line_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="snippet",
+            name="render_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                    ("fallback", "Fallback"),
+                ],
+                default="ready",
+                max_length=8,
+            ),
+        ),
+    ]
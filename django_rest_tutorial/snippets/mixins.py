@@ -0,0 +1,335 @@
+"""
+Snippets Mixins Module
+
+Description:
+    - This module contains the view mixins for the snippets app.
+
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial, wraps
+from hashlib import sha256
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.http import HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .cache import response_cache, response_generations
+
+Handler = Callable[..., HttpResponseBase]
+
+
+def cache_response(handler: Handler) -> Handler:
+    """
+    Cache Response Function
+
+    Description:
+        - This function is used to cache the responses of a view action,
+        see `CachedResponseMixin`.
+
+    Args:
+        - `handler (Handler)`: The action. **(Required)**
+
+    Returns:
+        - `Handler`: The cached action.
+
+    """
+
+    @wraps(handler)
+    def wrapper(
+        self: "CachedResponseMixin", request: Request, *args, **kwargs
+    ) -> HttpResponse:
+        return self.cached_response(
+            partial(handler, self), request, *args, **kwargs
+        )
+
+    return wrapper
+
+
+def conditional_response(handler: Handler) -> Handler:
+    """
+    Conditional Response Function
+
+    Description:
+        - This function is used to answer conditional requests to a view
+        action, see `ConditionalResponseMixin`.
+
+    Args:
+        - `handler (Handler)`: The action. **(Required)**
+
+    Returns:
+        - `Handler`: The conditional action.
+
+    """
+
+    @wraps(handler)
+    def wrapper(
+        self: "ConditionalResponseMixin", request: Request, *args, **kwargs
+    ) -> HttpResponseBase:
+        return self.conditional_response(
+            partial(handler, self), request, *args, **kwargs
+        )
+
+    return wrapper
+
+
+class ConditionalResponseMixin:
+    """
+    Conditional Response Mixin Class
+
+    Description:
+        - This class is used to emit `ETag` and `Last-Modified` headers on
+        reads of a viewset and to answer `If-None-Match` and
+        `If-Modified-Since` with `304 Not Modified`.
+        - The validators come from `validators()`, which must be cheaper
+        than the response, so a client that is up to date never makes the
+        view load the objects.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `list(request: Request, *args, **kwargs) -> HttpResponseBase`:
+        List the objects.
+        - `retrieve(request: Request, *args, **kwargs) -> HttpResponseBase`:
+        Retrieve an object.
+        - `validators(request: Request) -> tuple[str, datetime | None] |
+        None`: Get the entity tag and the modification time of a response.
+        - `conditional_response(handler: Handler, request: Request, *args,
+        **kwargs) -> HttpResponseBase`: Answer a conditional request.
+
+    """
+
+    @conditional_response
+    def list(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        """
+        List the objects, unless the client has them already.
+
+        """
+        return super().list(request, *args, **kwargs)  # type: ignore
+
+    @conditional_response
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        """
+        Retrieve an object, unless the client has it already.
+
+        """
+        return super().retrieve(request, *args, **kwargs)  # type: ignore
+
+    def validators(
+        self,
+        request: Request,  # pylint: disable=unused-argument
+    ) -> tuple[str, datetime | None] | None:
+        """
+        Validators Method
+
+        Description:
+            - This method is used to get the validators of the response to
+            a request, views override it.
+            - Responses whose changes do not all advance a modification
+            time only have an entity tag.
+
+        Args:
+            - `request (Request)`: The request object. **(Required)**
+
+        Returns:
+            - `tuple[str, datetime | None] | None`: The unquoted entity tag
+            and the modification time, `None` when there are none.
+
+        """
+        return None
+
+    def conditional_response(
+        self, handler: Handler, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """
+        Conditional Response Method
+
+        Description:
+            - This method is used to answer a conditional request with
+            `304 Not Modified` or `412 Precondition Failed`, calling the
+            handler only when the client needs the response.
+
+        Args:
+            - `handler (Handler)`: The action bound to the view.
+            **(Required)**
+            - `request (Request)`: The request object. **(Required)**
+            - `args (Any)`: Additional arguments. **(Optional)**
+            - `kwargs (Any)`: Additional keyword arguments. **(Optional)**
+
+        Returns:
+            - `HttpResponseBase`: The response object.
+
+        """
+        validators: tuple[str, datetime | None] | None = (
+            self.validators(request=request)
+            if request.method in ("GET", "HEAD")
+            else None
+        )
+
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag: str = quote_etag(etag_str=validators[0])
+        last_modified: int | None = (
+            int(validators[1].timestamp()) if validators[1] else None
+        )
+        response: HttpResponseBase | None = get_conditional_response(
+            request=request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+            # Validators only describe complete responses.
+            if response.status_code != 200:
+                return response
+
+        response.headers.setdefault("ETag", etag)
+        if last_modified is not None:
+            response.headers.setdefault(
+                "Last-Modified", http_date(last_modified)
+            )
+
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Cached Response Mixin Class
+
+    Description:
+        - This class is used to serve repeated reads of a viewset from the
+        Django cache named by `SNIPPETS_RESPONSE_CACHE`.
+        - Responses are keyed by URL, query and negotiated format, plus the
+        generations of the models they are built from. Saving or deleting
+        a row of those models starts a new generation, so a stale response
+        is never served.
+        - Only successful responses are cached and the browsable API, whose
+        pages depend on the user, is never cached.
+
+    Attributes:
+        - `cache_models (tuple[str, ...])`: Lower case labels of the models
+        the responses are built from.
+
+    Methods:
+        - `list(request: Request, *args, **kwargs) -> HttpResponse`: List
+        the objects.
+        - `retrieve(request: Request, *args, **kwargs) -> HttpResponse`:
+        Retrieve an object.
+        - `response_cache_key(request: Request) -> str | None`: Get the
+        cache key of a response.
+        - `cached_response(handler: Handler, request: Request, *args,
+        **kwargs) -> HttpResponse`: Get a cached response or create it.
+
+    """
+
+    cache_models: tuple[str, ...] = ()
+
+    @cache_response
+    def list(self, request: Request, *args, **kwargs) -> HttpResponse:
+        """
+        List the objects, from the cache when possible.
+
+        """
+        return super().list(request, *args, **kwargs)  # type: ignore
+
+    @cache_response
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponse:
+        """
+        Retrieve an object, from the cache when possible.
+
+        """
+        return super().retrieve(request, *args, **kwargs)  # type: ignore
+
+    def response_cache_key(self, request: Request) -> str | None:
+        """
+        Response Cache Key Method
+
+        Description:
+            - This method is used to get the cache key of the response to a
+            request.
+
+        Args:
+            - `request (Request)`: The request object. **(Required)**
+
+        Returns:
+            - `str | None`: The cache key, `None` when the response must not
+            be cached.
+
+        """
+        if request.method != "GET" or request.accepted_renderer.format in (
+            None,
+            "api",
+        ):
+            return None
+
+        query: list[tuple[str, list[str]]] = sorted(
+            request.query_params.lists()
+        )
+        # Links in the responses are absolute, so the host is part of the key.
+        url: str = request.build_absolute_uri(location=request.path)
+        digest: str = sha256(
+            repr((url, query, request.accepted_media_type)).encode()
+        ).hexdigest()
+
+        return (
+            f"response:{response_generations(labels=self.cache_models)}:"
+            f"{digest}"
+        )
+
+    def cached_response(
+        self, handler: Handler, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        """
+        Cached Response Method
+
+        Description:
+            - This method is used to get the cached response to a request,
+            calling the handler only on a miss.
+
+        Args:
+            - `handler (Handler)`: The action bound to the view.
+            **(Required)**
+            - `request (Request)`: The request object. **(Required)**
+            - `args (Any)`: Additional arguments. **(Optional)**
+            - `kwargs (Any)`: Additional keyword arguments. **(Optional)**
+
+        Returns:
+            - `HttpResponse`: The response object.
+
+        """
+        cache: BaseCache | None = response_cache()
+        key: str | None = (
+            None if cache is None else self.response_cache_key(request=request)
+        )
+
+        if cache is None or key is None:
+            return handler(request, *args, **kwargs)
+
+        cached: tuple[bytes, str] | None = cache.get(key=key)
+
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content=content, content_type=content_type)
+
+        response: HttpResponse = handler(request, *args, **kwargs)
+
+        def store(rendered: HttpResponse) -> None:
+            cache.set(
+                key=key,
+                value=(rendered.content, rendered["Content-Type"]),
+                timeout=settings.SNIPPETS_RESPONSE_CACHE_TIMEOUT,
+            )
+
+        if response.status_code == 200 and isinstance(response, Response):
+            # The content only exists once the response has been rendered.
+            response.add_post_render_callback(callback=store)
+
+        return response
@@ -6,34 +6,368 @@ Description:
 
 """
 
-from typing import Literal
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import cache
+from itertools import islice
+from typing import Any
 
+from django.conf import settings
 from django.db.models import (
     CASCADE,
+    BinaryField,
     BooleanField,
     CharField,
     DateTimeField,
     ForeignKey,
+    Index,
+    Manager,
     Model,
+    PositiveIntegerField,
+    QuerySet,
+    TextChoices,
     TextField,
 )
-from pygments import highlight
-from pygments.formatters.html import HtmlFormatter
-from pygments.lexer import Lexer
-from pygments.lexers import get_all_lexers, get_lexer_by_name
+from django.urls import reverse
+from django.utils.timezone import now
+from pygments.lexers import get_all_lexers
 from pygments.styles import get_all_styles
 
-LEXERS: list[tuple[str, tuple[str, ...], tuple[str, ...], tuple[str, ...]]] = [
-    item for item in get_all_lexers() if item[1]
-]
-LANGUAGE_CHOICES: list[tuple[str, str]] = sorted(
-    [(item[1][0], item[0]) for item in LEXERS]
+from .cache import invalidate_counts, invalidate_responses
+from .highlighting import (
+    Rendered,
+    compress_page,
+    render_page,
+    stream_highlighted,
+    stream_page,
 )
-STYLE_CHOICES: list[tuple[str, str]] = sorted(
-    [(item, item) for item in get_all_styles()]
+
+Lexer = tuple[str, tuple[str, ...], tuple[str, ...], tuple[str, ...]]
+
+
+@cache
+def get_lexers() -> list[Lexer]:
+    """
+    Get Lexers Function
+
+    Description:
+        - This function is used to get every `pygments` lexer with an alias.
+        - Walking the lexers is slow, so the table is only built on first
+        use instead of at import time.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `list[Lexer]`: The name, aliases, filenames and mimetypes of every
+        lexer.
+
+    """
+    return [item for item in get_all_lexers() if item[1]]
+
+
+@cache
+def get_language_choices() -> list[tuple[str, str]]:
+    """
+    Get Language Choices Function
+
+    Description:
+        - This function is used to get the choices of `Snippet.language`.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `list[tuple[str, str]]`: The alias and name of every lexer.
+
+    """
+    return sorted([(item[1][0], item[0]) for item in get_lexers()])
+
+
+@cache
+def get_style_choices() -> list[tuple[str, str]]:
+    """
+    Get Style Choices Function
+
+    Description:
+        - This function is used to get the choices of `Snippet.style`.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `list[tuple[str, str]]`: The name of every style.
+
+    """
+    return sorted([(item, item) for item in get_all_styles()])
+
+
+def __getattr__(name: str) -> list:
+    """
+    Build the `LEXERS`, `LANGUAGE_CHOICES` and `STYLE_CHOICES` tables on
+    first access.
+
+    """
+    tables: dict[str, Callable[[], list]] = {
+        "LEXERS": get_lexers,
+        "LANGUAGE_CHOICES": get_language_choices,
+        "STYLE_CHOICES": get_style_choices,
+    }
+
+    if name not in tables:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return tables[name]()
+
+
+# Fields the highlighted HTML is rendered from.
+# The style and title only change the page around the fragment.
+RENDER_FIELDS: tuple[str, ...] = ("code", "language", "linenos")
+
+# Render inputs that change the token stream, the others only change how the
+# tokens are formatted.
+LEXER_FIELDS: frozenset[str] = frozenset({"code", "language"})
+
+# Fields snippet listings are filtered or searched on, cached counts depend
+# on them.
+FILTER_FIELDS: frozenset[str] = frozenset(
+    {"title", "code", "language", "style"}
+)
+
+# Fields the highlight page is built from, see `Snippet.render_page()`.
+PAGE_FIELDS: frozenset[str] = frozenset({*RENDER_FIELDS, "title", "style"})
+
+# Fields storing the compressed highlight page by content coding.
+PAGE_ENCODING_FIELDS: dict[str, str] = {
+    "gzip": "page_gzip",
+    "br": "page_brotli",
+}
+
+# Fields whose stored value is remembered so changes can be detected.
+TRACKED_FIELDS: frozenset[str] = PAGE_FIELDS | FILTER_FIELDS
+
+
+class RenderStatus(TextChoices):
+    """
+    Render Status Choices
+
+    Description:
+        - This class enumerates the states of a snippet's highlighted HTML.
+
+    Attributes:
+        - `PENDING (str)`: The snippet is waiting for the render pool.
+        - `READY (str)`: The highlighted HTML is up to date.
+        - `FAILED (str)`: The render pool could not highlight the snippet.
+        - `FALLBACK (str)`: Highlighting ran out of time, the code is shown
+        as plain text.
+
+    Methods:
+        - `None`
+
+    """
+
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    FALLBACK = "fallback"
+
+
+# Statuses of snippets that have a fragment to show.
+RENDERED_STATUSES: frozenset[str] = frozenset(
+    {RenderStatus.READY, RenderStatus.FALLBACK}
 )
 
 
+class SnippetQuerySet(QuerySet):
+    """
+    Snippet QuerySet Class
+
+    Description:
+        - This class contains the bulk operations for snippets.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `restyle(style: str) -> int`: Change the style of every snippet in
+        the queryset.
+        - `store_pages() -> int`: Store the missing compressed pages.
+        - `render_again(batch_size: int) -> int`: Highlight the snippets
+        again.
+        - `bulk_create_highlighted(objs: Sequence[Snippet]) ->
+        list[Snippet]`: Highlight and insert snippets.
+
+    """
+
+    def restyle(self, style: str) -> int:
+        """
+        Restyle Method
+
+        Description:
+            - This method is used to change the style of every snippet in
+            the queryset.
+            - Highlighted fragments do not depend on the style, so nothing
+            has to be lexed or formatted again. The compressed pages link
+            to the stylesheet of the old style, they are dropped and stored
+            again when the snippets are next highlighted.
+            - Bulk updates send no signals, so cached counts and responses
+            are dropped here.
+
+        Args:
+            - `style (str)`: The new style. **(Required)**
+
+        Returns:
+            - `int`: The number of restyled snippets.
+
+        """
+        restyled: int = self.update(
+            style=style,
+            modified=now(),
+            **{name: b"" for name in PAGE_ENCODING_FIELDS.values()},
+        )
+        invalidate_counts(model=self.model)
+        invalidate_responses(model=self.model)
+
+        return restyled
+
+    def store_pages(self) -> int:
+        """
+        Store Pages Method
+
+        Description:
+            - This method is used to store the compressed pages of the
+            highlighted snippets in the queryset that have none.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `int`: The number of snippets whose pages were stored.
+
+        """
+        snippets: QuerySet[Snippet] = self.filter(
+            render_status__in=RENDERED_STATUSES, page_gzip=b""
+        ).only("modified", "title", "style", "highlighted", "render_status")
+
+        return sum(snippet.store_pages() for snippet in snippets.iterator())
+
+    def render_again(self, batch_size: int = 100) -> int:
+        """
+        Render Again Method
+
+        Description:
+            - This method is used to highlight the snippets in the queryset
+            again and store the renders with their pages, as for snippets
+            left pending by a restart or that failed to render.
+            - Batches are rendered across the render pool, see
+            `render_snippets`. Snippets saved while they were rendered keep
+            their newer render, snippets whose render was lost with its
+            worker stay pending.
+            - Bulk updates send no signals, so cached responses are dropped
+            here.
+
+        Args:
+            - `batch_size (int)`: Number of snippets rendered at once.
+            **(Optional)**
+
+        Returns:
+            - `int`: The number of snippets that were rendered.
+
+        """
+        # Imported here as the tasks module depends on this one.
+        from .tasks import (  # pylint: disable=import-outside-toplevel
+            render_snippets,
+        )
+
+        snippets: Iterator[Snippet] = self.only("pk", *RENDER_FIELDS).iterator(
+            chunk_size=batch_size
+        )
+        rendered_count: int = 0
+
+        while batch := list(islice(snippets, batch_size)):
+            renders: list[tuple[Rendered, str]] = render_snippets(
+                inputs=[snippet.render_inputs() for snippet in batch]
+            )
+
+            for snippet, (rendered, status) in zip(batch, renders):
+                # Filtering on the render inputs skips snippets that were
+                # saved with other inputs in the meantime.
+                stored: QuerySet[Snippet] = self.model.objects.filter(
+                    pk=snippet.pk, **snippet.render_inputs()
+                )
+                rendered_count += stored.update(
+                    highlighted=rendered.highlighted,
+                    tokens=rendered.tokens,
+                    line_count=rendered.lines,
+                    render_status=status,
+                    modified=now(),
+                    **{name: b"" for name in PAGE_ENCODING_FIELDS.values()},
+                )
+                stored.store_pages()
+
+        invalidate_responses(model=self.model)
+
+        return rendered_count
+
+    def bulk_create_highlighted(
+        self, objs: Sequence["Snippet"]
+    ) -> list["Snippet"]:
+        """
+        Bulk Create Highlighted Method
+
+        Description:
+            - This method is used to highlight new snippets and insert them
+            with a single `bulk_create()`.
+            - The batch is rendered across the render pool, see
+            `render_snippets`. When `SNIPPETS_ASYNC_HIGHLIGHT` is enabled
+            the snippets are stored as pending and rendered in the
+            background instead, like `save()` does, as are snippets whose
+            render was lost with its worker.
+            - Bulk inserts send no signals, so cached counts and responses
+            are dropped here. The search index is kept by its triggers.
+
+        Args:
+            - `objs (Sequence[Snippet])`: The unsaved snippets.
+            **(Required)**
+
+        Returns:
+            - `list[Snippet]`: The created snippets.
+
+        """
+        # Imported here as the tasks module depends on this one.
+        from .tasks import (  # pylint: disable=import-outside-toplevel
+            render_snippets,
+            schedule_render,
+        )
+
+        if settings.SNIPPETS_ASYNC_HIGHLIGHT:
+            for snippet in objs:
+                snippet.render_status = RenderStatus.PENDING
+        else:
+            renders: list[tuple[Rendered, str]] = render_snippets(
+                inputs=[snippet.render_inputs() for snippet in objs]
+            )
+
+            for snippet, (rendered, status) in zip(objs, renders):
+                snippet.apply_render(rendered=rendered, status=status)
+
+        for snippet in objs:
+            snippet.compress_pages()
+
+        created: list[Snippet] = self.bulk_create(objs=objs)
+
+        for snippet in created:
+            # pylint: disable=protected-access
+            snippet._remember_loaded_values(names=None)
+
+            if snippet.render_status == RenderStatus.PENDING:
+                schedule_render(snippet=snippet)
+
+        invalidate_counts(model=self.model)
+        invalidate_responses(model=self.model)
+
+        return created
+
+
 class Snippet(Model):
     """
     Snippet Model
@@ -43,6 +377,8 @@ class Snippet(Model):
 
     Attributes:
         - `created (DateTimeField)`: Date and time the snippet was created.
+        - `modified (DateTimeField)`: Date and time the snippet was last
+        changed.
         - `title (CharField)`: Title of the snippet.
         - `code (TextField)`: Code of the snippet.
         - `linenos (BooleanField)`: Whether to display line numbers in the
@@ -50,28 +386,62 @@ class Snippet(Model):
         - `language (CharField)`: Language of the snippet.
         - `style (CharField)`: Style of the snippet.
         - `owner (ForeignKey)`: The owner of the snippet.
-        - `highlighted (TextField)`: The highlighted HTML representation of the
+        - `highlighted (TextField)`: The highlighted HTML fragment of the
         snippet.
+        - `tokens (BinaryField)`: The serialized token stream of the code.
+        - `line_count (PositiveIntegerField)`: The number of highlighted
+        lines.
+        - `render_status (CharField)`: Whether `highlighted` is up to date.
+        - `page_gzip (BinaryField)`: The highlight page compressed with
+        `gzip`, empty until the snippet is highlighted.
+        - `page_brotli (BinaryField)`: The highlight page compressed with
+        `brotli`, empty when the package is not installed.
 
     Methods:
-        - `None`
+        - `render_inputs() -> dict[str, Any]`: Get the render inputs.
+        - `changed_fields(names: Iterable[str]) -> set[str]`: Get the
+        changed tracked fields.
+        - `changed_render_fields() -> set[str]`: Get the changed render
+        inputs.
+        - `apply_render(rendered: Rendered, status: str) -> None`: Store a
+        render.
+        - `render_page() -> str`: Get the highlight page.
+        - `stream_page(start: int, stop: int | None) -> Iterator[str]`:
+        Stream the highlight page of a range of lines.
+        - `compress_pages() -> None`: Compress the highlight page.
+        - `store_pages() -> bool`: Store the compressed highlight page.
 
     """
 
     created: DateTimeField = DateTimeField(auto_now_add=True)
+    modified: DateTimeField = DateTimeField(auto_now=True)
     title: CharField = CharField(max_length=100, blank=True, default="")
     code: TextField = TextField()
     linenos: BooleanField = BooleanField(default=False)
     language: CharField = CharField(
-        choices=LANGUAGE_CHOICES, default="python", max_length=100
+        choices=get_language_choices, default="python", max_length=100
     )
     style: CharField = CharField(
-        choices=STYLE_CHOICES, default="friendly", max_length=100
+        choices=get_style_choices, default="friendly", max_length=100
     )
     owner: ForeignKey = ForeignKey(
         to="auth.User", related_name="snippets", on_delete=CASCADE
     )
     highlighted: TextField = TextField()
+    tokens: BinaryField = BinaryField(default=b"", editable=False)
+    line_count: PositiveIntegerField = PositiveIntegerField(
+        default=0, editable=False
+    )
+    render_status: CharField = CharField(
+        choices=RenderStatus.choices, default=RenderStatus.READY, max_length=8
+    )
+    page_gzip: BinaryField = BinaryField(default=b"", editable=False)
+    page_brotli: BinaryField = BinaryField(default=b"", editable=False)
+
+    objects: Manager = SnippetQuerySet.as_manager()
+
+    # Tracked fields as loaded from the database, see `from_db()`.
+    _loaded_values: dict[str, Any] | None = None
 
     class Meta:
         """
@@ -83,6 +453,7 @@ class Snippet(Model):
 
         Attributes:
             - `ordering (list[str])`: List of fields to order the queryset by.
+            - `indexes (list[Index])`: List of indexes of the table.
 
         Methods:
             - `save(*args, **kwargs) -> None`: Save the snippet to the
@@ -91,25 +462,332 @@ class Snippet(Model):
         """
 
         ordering: list[str] = ["created"]
+        indexes: list[Index] = [
+            # Keyset pagination, see `SnippetCursorPagination`.
+            Index(fields=["created", "id"], name="snippet_created_id_idx"),
+            # Snippets of a user, language or style, by recency. The
+            # pagination keys follow the filtered column so pages of a
+            # filtered list are range scans as well.
+            Index(
+                fields=["owner", "created", "id"],
+                name="snippet_owner_created_idx",
+            ),
+            Index(
+                fields=["language", "created", "id"],
+                name="snippet_language_created_idx",
+            ),
+            Index(
+                fields=["style", "created", "id"],
+                name="snippet_style_created_idx",
+            ),
+            # Last change of the snippets, see `SnippetViewSet.validators()`.
+            Index(fields=["modified"], name="snippet_modified_idx"),
+        ]
 
-    def save(self, *args, **kwargs) -> None:
+    @classmethod
+    def from_db(
+        cls, db: str | None, field_names: Sequence[str], values: Sequence[Any]
+    ) -> "Snippet":
         """
-        Use the `pygments` library to create a highlighted HTML
-        representation of the code snippet.
+        Remember the tracked fields loaded from the database so `save()` can
+        tell whether they changed.
+
         """
-        lexer: Lexer = get_lexer_by_name(_alias=self.language)
-        linenos: Literal["table"] | Literal[False] = (
-            "table" if self.linenos else False
+        instance: Snippet = super().from_db(
+            db=db, field_names=field_names, values=values
         )
-        options: dict[str, str] = {"title": self.title} if self.title else {}
-        formatter: HtmlFormatter = HtmlFormatter(  # type: ignore
-            style=self.style,
-            linenos=linenos,
-            full=True,
-            **options,  # type: ignore
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in TRACKED_FIELDS
+        }
+
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        """
+        Remember the tracked fields reloaded from the database, this also
+        covers deferred fields loaded on first access.
+
+        """
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_loaded_values(names=kwargs.get("fields"))
+
+    def render_inputs(self) -> dict[str, Any]:
+        """
+        Render Inputs Method
+
+        Description:
+            - This method is used to get the fields `highlighted` is
+            rendered from.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `dict[str, Any]`: The render inputs by field name.
+
+        """
+        return {name: getattr(self, name) for name in RENDER_FIELDS}
+
+    def changed_fields(self, names: Iterable[str]) -> set[str]:
+        """
+        Changed Fields Method
+
+        Description:
+            - This method is used to get the tracked fields that differ from
+            the values loaded from the database.
+            - Every field counts as changed for unsaved snippets.
+
+        Args:
+            - `names (Iterable[str])`: Names of tracked fields, see
+            `TRACKED_FIELDS`. **(Required)**
+
+        Returns:
+            - `set[str]`: The names of the changed fields.
+
+        """
+        loaded: dict[str, Any] | None = self._loaded_values
+
+        if self._state.adding or loaded is None:
+            return set(names)
+
+        return {
+            name
+            for name in names
+            # Deferred fields that were never assigned cannot have changed.
+            if (name in loaded or name in self.__dict__)
+            and loaded.get(name) != self.__dict__.get(name)
+        }
+
+    def changed_render_fields(self) -> set[str]:
+        """
+        Get the render inputs that differ from the values loaded from the
+        database.
+
+        """
+        return self.changed_fields(names=RENDER_FIELDS)
+
+    def apply_render(
+        self, rendered: Rendered, status: str = RenderStatus.READY
+    ) -> None:
+        """
+        Apply Render Method
+
+        Description:
+            - This method is used to store a finished render on the snippet.
+
+        Args:
+            - `rendered (Rendered)`: The render. **(Required)**
+            - `status (str)`: The render status. **(Optional)**
+
+        Returns:
+            - `None`
+
+        """
+        self.highlighted, self.tokens, self.line_count = rendered
+        self.render_status = status
+
+    def render_page(self) -> str:
+        """
+        Render Page Method
+
+        Description:
+            - This method is used to wrap the highlighted fragment in a
+            page titled like the snippet and linking to the stylesheet of
+            its style.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `str`: The HTML document.
+
+        """
+        return render_page(
+            highlighted=self.highlighted,
+            title=self.title,
+            stylesheet=reverse(
+                viewname="snippet-style", kwargs={"style": self.style}
+            ),
+        )
+
+    def stream_page(
+        self, start: int = 1, stop: int | None = None
+    ) -> Iterator[str]:
+        """
+        Stream Page Method
+
+        Description:
+            - This method is used to create the highlight page of a range of
+            lines piece by piece from the token stream, so the highlighted
+            fragment is never held in memory.
+            - The page of every line is identical to the stored one.
+
+        Args:
+            - `start (int)`: Number of the first line, from 1. **(Optional)**
+            - `stop (int | None)`: Number of the last line, the last line of
+            the code by default. **(Optional)**
+
+        Returns:
+            - `Iterator[str]`: The pieces of the HTML document.
+
+        """
+        return stream_page(
+            highlighted=stream_highlighted(
+                tokens=bytes(self.tokens),
+                linenos=self.linenos,
+                start=start,
+                stop=min(stop or self.line_count, self.line_count),
+            ),
+            title=self.title,
+            stylesheet=reverse(
+                viewname="snippet-style", kwargs={"style": self.style}
+            ),
         )
 
-        self.highlighted = highlight(
-            code=self.code, lexer=lexer, formatter=formatter
+    def compress_pages(self) -> None:
+        """
+        Compress Pages Method
+
+        Description:
+            - This method is used to compress the highlight page in every
+            supported content coding.
+            - Snippets that are not highlighted have no pages.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `None`
+
+        """
+        pages: dict[str, bytes] = (
+            compress_page(page=self.render_page())
+            if self.render_status in RENDERED_STATUSES
+            else {}
         )
+
+        for encoding, name in PAGE_ENCODING_FIELDS.items():
+            setattr(self, name, pages.get(encoding, b""))
+
+    def store_pages(self) -> bool:
+        """
+        Store Pages Method
+
+        Description:
+            - This method is used to compress the highlight page and store
+            it, unless the snippet was modified since it was loaded.
+            - The page content is unchanged, so neither the modification
+            time nor the cached responses are touched.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `bool`: Whether the pages were stored.
+
+        """
+        self.compress_pages()
+
+        return bool(
+            type(self)
+            .objects.filter(pk=self.pk, modified=self.modified)
+            .update(
+                **{
+                    name: getattr(self, name)
+                    for name in PAGE_ENCODING_FIELDS.values()
+                }
+            )
+        )
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Use the `pygments` library to create a highlighted HTML fragment of
+        the code snippet, reusing the render of any snippet with identical
+        inputs.
+
+        The code is only highlighted again when one of the render inputs
+        being saved changed, `update_fields` is honored. Line number changes
+        of ready snippets only format the stored token stream again. The
+        compressed pages are stored again whenever the highlight page
+        changed.
+
+        The code is lexed in the render pool within the time budget, code
+        that takes longer is stored as plain text. When
+        `SNIPPETS_ASYNC_HIGHLIGHT` is enabled, or the render was lost with
+        its worker, the snippet is stored as pending and the render pool
+        fills in `highlighted` later.
+        """
+        update_fields: Iterable[str] | None = kwargs.get("update_fields")
+        changed: set[str] = self.changed_render_fields()
+        page_changed: set[str] = self.changed_fields(names=PAGE_FIELDS)
+
+        if update_fields is not None:
+            changed &= set(update_fields)
+            page_changed &= set(update_fields)
+            # `modified` is only stored when it is saved explicitly.
+            kwargs["update_fields"] = {*update_fields, "modified"}
+
+            if changed:
+                kwargs["update_fields"] |= {
+                    "highlighted",
+                    "tokens",
+                    "line_count",
+                    "render_status",
+                }
+
+            if page_changed:
+                kwargs["update_fields"] |= set(PAGE_ENCODING_FIELDS.values())
+
+        tokens: bytes = b""
+
+        # Imported here as the tasks module depends on this one.
+        from .tasks import (  # pylint: disable=import-outside-toplevel
+            render_snippet,
+            schedule_render,
+        )
+
+        if (
+            changed
+            and not changed & LEXER_FIELDS
+            and self.render_status == RenderStatus.READY
+        ):
+            # The code is unchanged, only format its stored token stream.
+            # Only ready snippets have the token stream of their code, the
+            # others hold plain text, no tokens, or the tokens of the code
+            # before a pending render.
+            tokens = bytes(self.tokens)
+
+        if changed and settings.SNIPPETS_ASYNC_HIGHLIGHT:
+            self.render_status = RenderStatus.PENDING
+        elif changed:
+            self.apply_render(
+                *render_snippet(tokens=tokens, **self.render_inputs())
+            )
+
+        if page_changed:
+            self.compress_pages()
+
         super().save(*args, **kwargs)
+
+        # Also covers renders lost with their worker.
+        if changed and self.render_status == RenderStatus.PENDING:
+            schedule_render(snippet=self, tokens=tokens)
+
+        self._remember_loaded_values(names=update_fields)
+
+    def _remember_loaded_values(self, names: Iterable[str] | None) -> None:
+        """
+        Record the current value of the given tracked fields, or of every
+        loaded tracked field, as the values stored in the database.
+
+        """
+        self._loaded_values = {
+            **(self._loaded_values or {}),
+            **{
+                name: self.__dict__[name]
+                for name in (TRACKED_FIELDS if names is None else names)
+                if name in TRACKED_FIELDS and name in self.__dict__
+            },
+        }
@@ -0,0 +1,216 @@
+"""
+Snippets Pagination Module
+
+Description:
+    - This module contains the pagination classes for the snippets app.
+
+"""
+
+from datetime import datetime
+from functools import cached_property
+from typing import Any
+
+from django.core.paginator import Paginator
+from django.db.models import Model, Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from .cache import cached_count
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Cached Count Paginator Class
+
+    Description:
+        - This class is a Django paginator whose total count comes from
+        `cached_count`, instead of a `COUNT(*)` on every page.
+
+    Attributes:
+        - `count (int)`: The total number of objects.
+
+    Methods:
+        - `None`
+
+    """
+
+    @cached_property
+    def count(self) -> int:
+        """
+        The total number of objects, cached or estimated.
+
+        """
+        if isinstance(self.object_list, QuerySet):
+            return cached_count(queryset=self.object_list)
+
+        return len(self.object_list)
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    """
+    Cached Count Page Number Pagination Class
+
+    Description:
+        - This class is the default page number pagination with a cached or
+        estimated total count.
+
+    Attributes:
+        - `django_paginator_class (type[Paginator])`: The paginator used.
+
+    Methods:
+        - `None`
+
+    """
+
+    django_paginator_class: type[Paginator] = CachedCountPaginator
+
+
+class SnippetCursorPagination(CursorPagination):
+    """
+    Snippet Cursor Pagination Class
+
+    Description:
+        - This class is used to paginate snippets by keyset instead of by
+        offset, so deep pages cost the same as the first one and no
+        `COUNT(*)` is run.
+        - Pages follow the `created` ordering of `Snippet.Meta`, the id breaks
+        ties between snippets created at the same instant. The composite
+        `snippet_created_id_idx` index turns every page into a range scan.
+        - Cursors hold both the creation time and the id of a snippet, so
+        every position is unique and pages never need an offset. The
+        cursors of Django REST framework only hold the first field and
+        step over ties by an offset, which loses snippets created at the
+        same instant when going back a page.
+        - The total count is served from `cached_count`.
+
+    Attributes:
+        - `ordering (tuple[str, ...])`: The fields pages are ordered by.
+
+    Methods:
+        - `paginate_queryset(queryset, request, view) -> list | None`: Get a
+        page of snippets.
+        - `get_paginated_response(data) -> Response`: Get the paginated
+        response.
+
+    """
+
+    ordering: tuple[str, ...] = ("created", "id")  # type: ignore
+    count: int | None = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Any, view: Any = None
+    ) -> list | None:
+        """
+        Get a page of snippets after or before the snippet of the cursor,
+        and the total count of the queryset. This follows the method of
+        Django REST framework, with positions that are never shared.
+
+        """
+        self.count = cached_count(queryset=queryset)
+        self.request = request
+        self.page_size = self.get_page_size(request=request)
+
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(
+            request=request, queryset=queryset, view=view
+        )
+        self.cursor = self.decode_cursor(request=request)
+        reverse: bool = self.cursor is not None and self.cursor.reverse
+        position: str | None = self.cursor and self.cursor.position
+        queryset = queryset.order_by(
+            *(f"-{field}" if reverse else field for field in self.ordering)
+        )
+
+        if position is not None:
+            queryset = queryset.filter(
+                self._beyond(position=position, reverse=reverse)
+            )
+
+        results: list = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        following: str | None = (
+            self._get_position_from_instance(
+                instance=results[-1], ordering=self.ordering
+            )
+            if len(results) > self.page_size
+            else None
+        )
+
+        if reverse:
+            self.page.reverse()
+
+        self.has_next, self.has_previous = (
+            (position is not None, following is not None)
+            if reverse
+            else (following is not None, position is not None)
+        )
+        self.next_position, self.previous_position = (
+            (position, following) if reverse else (following, position)
+        )
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _beyond(self, position: str, reverse: bool) -> Q:
+        """
+        Get the condition of the snippets after the position, or before it
+        for reverse cursors.
+
+        """
+        value, _, pk = position.rpartition(",")
+        created: datetime | None = parse_datetime(value=value)
+        lookup: str = "lt" if reverse else "gt"
+
+        if created is None or not pk.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+
+        return Q(**{f"created__{lookup}": created}) | Q(
+            created=created, **{f"id__{lookup}": int(pk)}
+        )
+
+    def _get_position_from_instance(
+        self,
+        instance: Model,
+        ordering: tuple[str, ...],  # pylint: disable=unused-argument
+    ) -> str:
+        """
+        Get the position of a snippet, its creation time and its id.
+
+        """
+        return f"{instance.created.isoformat()},{instance.pk}"  # type: ignore
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """
+        Get the paginated response with the total count first.
+
+        """
+        return Response(
+            data={
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """
+        Get the schema of the paginated response.
+
+        """
+        response_schema: dict = super().get_paginated_response_schema(
+            schema=schema
+        )
+        response_schema["properties"] = {
+            "count": {"type": "integer", "example": 123},
+            **response_schema["properties"],
+        }
+
+        return response_schema
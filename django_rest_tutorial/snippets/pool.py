@@ -0,0 +1,309 @@
+"""
+Snippets Pool Module
+
+Description:
+    - This module contains the process pool the snippets app renders in.
+    - Every worker process is driven by its own thread of the parent, so the
+    pool knows when a job starts. The deadline of a job is counted from its
+    start, time spent queued behind other jobs never counts. A worker that
+    outlives the deadline of its job is killed and replaced, the other
+    workers and their jobs are left alone.
+    - Workers are spawned rather than forked so they never inherit open
+    database connections or locks held by server threads.
+
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from queue import SimpleQueue
+from threading import Lock, Thread
+from typing import Any, NamedTuple
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+
+class WorkerLost(Exception):
+    """
+    Worker Lost Class
+
+    Description:
+        - This exception is raised when the worker running a job died, as
+        when it was killed by the system. The job itself is not at fault
+        and can be submitted again.
+
+    """
+
+
+class _Job(NamedTuple):
+    """
+    A job waiting for a worker.
+
+    """
+
+    future: Future
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    deadline: float | None
+
+
+def _work(connection: Connection, report: Callable[[], Any] | None) -> None:
+    """
+    Run the jobs received on the connection of a worker until it is closed,
+    answering every job with its outcome and the report of the worker.
+
+    """
+    # Unpickling the report imported its module, the worker is ready.
+    connection.send(None)
+
+    while True:
+        try:
+            fn, args, kwargs = connection.recv()
+        except EOFError:
+            return
+
+        try:
+            outcome: tuple[bool, Any] = (True, fn(*args, **kwargs))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            outcome = (False, exc)
+
+        connection.send((*outcome, None if report is None else report()))
+
+
+class WorkerPool:
+    """
+    Worker Pool Class
+
+    Description:
+        - This class is a process pool whose jobs have a deadline counted
+        from their start, see the module description.
+        - Jobs that outlive their deadline fail with `TimeoutError`, jobs
+        whose worker died with `WorkerLost`. Exceptions raised by a job are
+        passed on as they are.
+
+    Attributes:
+        - `max_workers (int)`: The number of worker processes.
+        - `report (Callable[[], Any] | None)`: Called by the workers after
+        every job, the latest value of every worker is kept.
+
+    Methods:
+        - `submit(fn: Callable[..., Any], *args, deadline: float | None,
+        **kwargs) -> Future`: Run a job.
+        - `reports() -> list[Any]`: Get the latest report of every worker.
+        - `shutdown(wait: bool) -> None`: Stop the workers once the queued
+        jobs are done.
+
+    """
+
+    def __init__(
+        self, max_workers: int, report: Callable[[], Any] | None = None
+    ) -> None:
+        self.max_workers: int = max_workers
+        self.report: Callable[[], Any] | None = report
+        self._jobs: SimpleQueue[_Job | None] = SimpleQueue()
+        self._threads: list[Thread] = []
+        self._reports: dict[int, Any] = {}
+        self._lock: Lock = Lock()
+        self._closed: bool = False
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        deadline: float | None = None,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Submit Method
+
+        Description:
+            - This method is used to run a job in a worker process.
+
+        Args:
+            - `fn (Callable[..., Any])`: The job, a module level function.
+            **(Required)**
+            - `args (Any)`: Arguments of the job. **(Optional)**
+            - `deadline (float | None)`: Seconds the job may run, `None` for
+            no limit. **(Optional)**
+            - `kwargs (Any)`: Keyword arguments of the job. **(Optional)**
+
+        Returns:
+            - `Future`: The outcome of the job.
+
+        Raises:
+            - `RuntimeError`: If the pool was shut down.
+
+        """
+        future: Future = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit to a shut down pool")
+
+            self._jobs.put(
+                _Job(
+                    future=future,
+                    fn=fn,
+                    args=args,
+                    kwargs=kwargs,
+                    deadline=deadline,
+                )
+            )
+
+            while len(self._threads) < self.max_workers:
+                thread: Thread = Thread(
+                    target=self._drive,
+                    name=f"snippets-pool-{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+        return future
+
+    def reports(self) -> list[Any]:
+        """
+        Reports Method
+
+        Description:
+            - This method is used to get the latest report of every worker
+            that ran a job, including workers that were replaced.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `list[Any]`: The reports.
+
+        """
+        with self._lock:
+            return list(self._reports.values())
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shutdown Method
+
+        Description:
+            - This method is used to stop the workers once the queued jobs
+            are done, no job can be submitted afterwards.
+            - Waiting keeps the workers from being stopped while the
+            interpreter exits, which joins the remaining child processes.
+
+        Args:
+            - `wait (bool)`: Whether to wait until every worker stopped.
+            **(Optional)**
+
+        Returns:
+            - `None`
+
+        """
+        with self._lock:
+            self._closed = True
+
+            for _ in self._threads:
+                self._jobs.put(None)
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _drive(self) -> None:
+        """
+        Hand queued jobs to a worker process one at a time, replacing the
+        process whenever it died or was killed.
+
+        """
+        worker: tuple[BaseProcess, Connection] | None = None
+
+        try:
+            while (job := self._jobs.get()) is not None:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    if worker is None or not worker[0].is_alive():
+                        if worker is not None:
+                            _stop(*worker)
+
+                        worker = None
+                        worker = self._spawn()
+
+                    self._run(job, *worker)
+                except TimeoutError as exc:
+                    _stop(*worker)  # type: ignore
+                    worker = None
+                    job.future.set_exception(exception=exc)
+                except (EOFError, OSError) as exc:
+                    if worker is not None:
+                        _stop(*worker)
+
+                    worker = None
+                    job.future.set_exception(
+                        exception=WorkerLost(f"render worker died: {exc!r}")
+                    )
+        finally:
+            if worker is not None:
+                _stop(*worker)
+
+    def _spawn(self) -> tuple[BaseProcess, Connection]:
+        """
+        Start a worker process and wait until it is ready, so its start up
+        is never counted against the deadline of a job.
+
+        """
+        context = get_context(method="spawn")
+        connection, child = context.Pipe()
+        process: BaseProcess = context.Process(
+            target=_work, args=(child, self.report), daemon=True
+        )
+        process.start()
+        child.close()
+        connection.recv()
+
+        return process, connection  # type: ignore
+
+    def _run(
+        self, job: _Job, process: BaseProcess, connection: Connection
+    ) -> None:
+        """
+        Run a job in a worker process and set its outcome.
+
+        """
+        connection.send((job.fn, job.args, job.kwargs))
+
+        if not connection.poll(job.deadline):
+            logger.warning(
+                "Killing render worker %s, its job ran for more than %ss",
+                process.pid,
+                job.deadline,
+            )
+            raise TimeoutError(f"job ran for more than {job.deadline}s")
+
+        succeeded, value, report = connection.recv()
+
+        if report is not None:
+            logger.debug("Render worker %s reported %s", process.pid, report)
+
+            with self._lock:
+                self._reports[process.pid] = report  # type: ignore
+
+        if succeeded:
+            job.future.set_result(result=value)
+        else:
+            job.future.set_exception(exception=value)
+
+
+def _stop(process: BaseProcess, connection: Connection) -> None:
+    """
+    Kill a worker process and wait for it to exit.
+
+    """
+    connection.close()
+    process.kill()
+    process.join()
+    process.close()
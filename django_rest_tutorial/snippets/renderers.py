@@ -0,0 +1,340 @@
+"""
+Snippets Renderers Module
+
+Description:
+    - This module contains the renderers and parsers for the snippets app.
+    - The JSON renderer and parser use `orjson` when it is installed and
+    fall back to the ones of Django REST framework otherwise.
+    - The MessagePack renderer and parser need `msgpack`, they are only
+    registered when it is installed.
+
+"""
+
+import re
+from collections.abc import Mapping
+from typing import IO, Any
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders, json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Date and time values go through `JSONEncoder.default()`, which formats them
+# the way Django REST framework does, dataclasses are not encoded at all.
+ORJSON_OPTIONS: int = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+# Integers `orjson` decodes exactly have at most 19 digits before the range
+# of 64 bit integers ends, longer runs of digits may be wider.
+WIDE_INTEGER: re.Pattern[bytes] = re.compile(pattern=rb"[0-9]{19}")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ORJSON Renderer Class
+
+    Description:
+        - This class is a `JSONRenderer` encoding with `orjson`.
+        - The output is identical to the one of `JSONRenderer`, except for
+        floats in exponent notation (`1e16` instead of `1e+16`), and for
+        `NaN` and infinite floats, which are encoded as `null` where
+        `JSONRenderer` raises `ValueError`. The API serializes neither,
+        search ranks are always finite, and checking every float would
+        cost what `orjson` saves. Indented output, as requested by the
+        browsable API, and values `orjson` cannot encode, as integers wider
+        than 64 bits, are encoded by `JSONRenderer`.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `render(data: Any, accepted_media_type: str | None,
+        renderer_context: Mapping[str, Any] | None) -> bytes`: Render the
+        data.
+
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        """
+        Render Method
+
+        Description:
+            - This method is used to render data into JSON.
+
+        Args:
+            - `data (Any)`: The data. **(Required)**
+            - `accepted_media_type (str | None)`: The negotiated media type.
+            **(Optional)**
+            - `renderer_context (Mapping[str, Any] | None)`: The context of
+            the view. **(Optional)**
+
+        Returns:
+            - `bytes`: The JSON document.
+
+        """
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(
+                accepted_media_type=accepted_media_type or "",
+                renderer_context=renderer_context or {},
+            )
+            is not None
+        ):
+            return super().render(
+                data=data,
+                accepted_media_type=accepted_media_type,
+                renderer_context=renderer_context,
+            )
+
+        try:
+            content: bytes = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data=data,
+                accepted_media_type=accepted_media_type,
+                renderer_context=renderer_context,
+            )
+
+        # Line and paragraph separators are escaped like `JSONRenderer`
+        # does, they end JavaScript string literals.
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class ORJSONParser(JSONParser):
+    """
+    ORJSON Parser Class
+
+    Description:
+        - This class is a `JSONParser` decoding with `orjson`.
+        - Documents `orjson` rejects are decoded by `json` before they are
+        reported, so the parser accepts what `JSONParser` accepts.
+        `orjson` decodes integers wider than 64 bits to floats, documents
+        that may contain one are decoded by `json` as well.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `parse(stream: IO[bytes], media_type: str | None,
+        parser_context: Mapping[str, Any] | None) -> Any`: Parse a request
+        body.
+
+    """
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """
+        Parse Method
+
+        Description:
+            - This method is used to parse a JSON request body.
+
+        Args:
+            - `stream (IO[bytes])`: The request body. **(Required)**
+            - `media_type (str | None)`: The media type of the body.
+            **(Optional)**
+            - `parser_context (Mapping[str, Any] | None)`: The context of the
+            view. **(Optional)**
+
+        Returns:
+            - `Any`: The parsed data.
+
+        Raises:
+            - `ParseError`: If the body is not valid JSON.
+
+        """
+        if orjson is None:
+            return super().parse(
+                stream=stream,
+                media_type=media_type,
+                parser_context=parser_context,
+            )
+
+        encoding: str = (parser_context or {}).get(
+            "encoding", settings.DEFAULT_CHARSET
+        )
+
+        try:
+            content: bytes = stream.read()
+
+            if encoding.lower().replace("-", "") != "utf8":
+                content = content.decode(encoding).encode()
+
+            try:
+                if not WIDE_INTEGER.search(content):
+                    return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+
+            return json.loads(
+                content,
+                parse_constant=(json.strict_constant if self.strict else None),
+            )
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
+
+
+def _reject_extension(
+    code: int,
+    data: bytes,  # pylint: disable=unused-argument
+) -> Any:
+    """
+    Reject extension types in MessagePack request bodies, the API only
+    accepts the JSON data model.
+
+    """
+    raise ValueError(f"unsupported extension type {code}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack Renderer Class
+
+    Description:
+        - This class is used to render data into MessagePack, a binary
+        encoding of the JSON data model that is smaller and cheaper to
+        decode for machine clients.
+        - It is negotiated with `Accept: application/msgpack`, the `.msgpack`
+        suffix or `?format=msgpack`. Values MessagePack has no type for are
+        converted like `JSONRenderer` converts them.
+
+    Attributes:
+        - `media_type (str)`: The media type of the output.
+        - `format (str)`: The format suffix of the output.
+        - `charset (None)`: The output is binary.
+        - `render_style (str)`: The output is binary.
+
+    Methods:
+        - `render(data: Any, accepted_media_type: str | None,
+        renderer_context: Mapping[str, Any] | None) -> bytes`: Render the
+        data.
+
+    """
+
+    media_type: str = "application/msgpack"
+    format: str = "msgpack"
+    charset: None = None
+    render_style: str = "binary"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        """
+        Render Method
+
+        Description:
+            - This method is used to render data into MessagePack.
+
+        Args:
+            - `data (Any)`: The data. **(Required)**
+            - `accepted_media_type (str | None)`: The negotiated media type.
+            **(Optional)**
+            - `renderer_context (Mapping[str, Any] | None)`: The context of
+            the view. **(Optional)**
+
+        Returns:
+            - `bytes`: The MessagePack document.
+
+        """
+        if data is None:
+            return b""
+
+        return msgpack.packb(data, default=encoders.JSONEncoder().default)
+
+
+class MessagePackParser(BaseParser):
+    """
+    MessagePack Parser Class
+
+    Description:
+        - This class is used to parse MessagePack request bodies, sent with
+        `Content-Type: application/msgpack`.
+
+    Attributes:
+        - `media_type (str)`: The media type of the body.
+
+    Methods:
+        - `parse(stream: IO[bytes], media_type: str | None,
+        parser_context: Mapping[str, Any] | None) -> Any`: Parse a request
+        body.
+
+    """
+
+    media_type: str = "application/msgpack"
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """
+        Parse Method
+
+        Description:
+            - This method is used to parse a MessagePack request body.
+            - Extension types are rejected, they have no JSON counterpart
+            the serializers could validate.
+
+        Args:
+            - `stream (IO[bytes])`: The request body. **(Required)**
+            - `media_type (str | None)`: The media type of the body.
+            **(Optional)**
+            - `parser_context (Mapping[str, Any] | None)`: The context of the
+            view. **(Optional)**
+
+        Returns:
+            - `Any`: The parsed data.
+
+        Raises:
+            - `ParseError`: If the body is not valid MessagePack.
+
+        """
+        try:
+            return msgpack.unpackb(
+                stream.read(), raw=False, ext_hook=_reject_extension
+            )
+        except (TypeError, ValueError) as exc:
+            raise ParseError(
+                f"MessagePack parse error - {str(exc) or 'invalid data'}"
+            ) from exc
@@ -0,0 +1,598 @@
+"""
+Snippets Search Module
+
+Description:
+    - This module contains the searches of the snippets app, the indexes
+    they query are created by the `0009` and `0010` migrations.
+    - On PostgreSQL the index is a generated `tsvector` column with a GIN
+    index, on SQLite it is an FTS5 table kept in sync by triggers.
+    - Substring and regular expression searches are narrowed down by a
+    trigram index first, `pg_trgm` on PostgreSQL and an FTS5 trigram table
+    on SQLite, and bounded by a deadline.
+    - On SQLite regular expressions are matched in Python with the timeout
+    of the `regex` package, they are not supported without it.
+
+"""
+
+import re
+import unicodedata
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from time import monotonic
+
+from django.db import (
+    DataError,
+    OperationalError,
+    connections,
+    transaction,
+)
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import BooleanField, FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.status import HTTP_503_SERVICE_UNAVAILABLE
+
+try:
+    import regex as bounded_re
+except ImportError:
+    bounded_re = None
+
+# The title weighs more than the code when results are ranked on SQLite,
+# PostgreSQL weighs the title as `A` and the code as `B`.
+TITLE_WEIGHT: float = 10.0
+CODE_WEIGHT: float = 1.0
+
+# Columns of every SQLite side table, kept in sync with the snippets table
+# by the triggers of `sqlite_triggers`. The statements match the ones the
+# migrations create the tables with.
+SQLITE_TABLES: dict[str, tuple[str, ...]] = {
+    "snippets_snippet_fts": ("title", "code"),
+    "snippets_snippet_trigram": ("code",),
+}
+
+# Name of the SQLite function regular expression searches match with, it is
+# registered by `search_deadline`.
+SQLITE_REGEXP: str = "snippets_regexp"
+
+# Escapes of regular expressions that match a single known character, by
+# letter. Other escaped letters match classes of characters or positions.
+LITERAL_ESCAPES: dict[str, str] = {
+    "a": "\a",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+}
+
+# Number of hexadecimal digits of the escapes of code points, by letter.
+CODE_POINT_ESCAPES: dict[str, int] = {"x": 2, "u": 4, "U": 8}
+
+# Counted repetitions, `{m}`, `{m,}`, `{,n}` and `{m,n}`, with the least
+# count. Other braces are literal characters.
+COUNTED_REPEAT: re.Pattern[str] = re.compile(r"\{(?=[\d,])(\d*)(?:,\d*)?\}")
+
+
+def sqlite_triggers(table: str) -> dict[str, str]:
+    """
+    SQLite Triggers Function
+
+    Description:
+        - This function is used to build the triggers that keep a SQLite
+        side table in sync with the snippets table.
+
+    Args:
+        - `table (str)`: Name of the side table, see `SQLITE_TABLES`.
+        **(Required)**
+
+    Returns:
+        - `dict[str, str]`: The `CREATE TRIGGER` statements by name.
+
+    """
+    columns: tuple[str, ...] = SQLITE_TABLES[table]
+    names: str = ", ".join(columns)
+    old: str = ", ".join(f"old.{column}" for column in columns)
+    new: str = ", ".join(f"new.{column}" for column in columns)
+    changed: str = " OR ".join(
+        f"old.{column} IS NOT new.{column}" for column in columns
+    )
+    insert: str = (
+        f"INSERT INTO {table} (rowid, {names}) VALUES (new.id, {new});"
+    )
+    delete: str = (
+        f"INSERT INTO {table} ({table}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+
+    return {
+        f"{table}_insert": (
+            f"CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON "
+            f"snippets_snippet BEGIN {insert} END"
+        ),
+        f"{table}_delete": (
+            f"CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON "
+            f"snippets_snippet BEGIN {delete} END"
+        ),
+        f"{table}_update": (
+            f"CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF "
+            f"{names} ON snippets_snippet WHEN {changed} "
+            f"BEGIN {delete} {insert} END"
+        ),
+    }
+
+
+def ensure_search_triggers(connection: BaseDatabaseWrapper) -> None:
+    """
+    Ensure Search Triggers Function
+
+    Description:
+        - This function is used to create the SQLite sync triggers that are
+        missing and to rebuild the side tables that missed any.
+        - SQLite migrations rebuild altered tables from scratch, which drops
+        their triggers, so this runs after every `migrate`.
+
+    Args:
+        - `connection (BaseDatabaseWrapper)`: The database connection.
+        **(Required)**
+
+    Returns:
+        - `None`
+
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' OR "
+            "(type = 'trigger' AND tbl_name = 'snippets_snippet')"
+        )
+        existing: set[str] = {name for (name,) in cursor.fetchall()}
+
+        for table in SQLITE_TABLES.keys() & existing:
+            triggers: dict[str, str] = sqlite_triggers(table=table)
+            missing: list[str] = [
+                name for name in triggers if name not in existing
+            ]
+
+            for name in missing:
+                cursor.execute(triggers[name])
+
+            if missing:
+                cursor.execute(
+                    f"INSERT INTO {table} ({table}) VALUES ('rebuild')"
+                )
+
+
+def fts_query(text: str) -> str:
+    """
+    FTS Query Function
+
+    Description:
+        - This function is used to turn user input into an FTS5 query that
+        matches snippets containing every word, so the FTS5 query syntax
+        never has to be validated.
+
+    Args:
+        - `text (str)`: The search terms. **(Required)**
+
+    Returns:
+        - `str`: The FTS5 query.
+
+    """
+    return " ".join(
+        '"{}"'.format(word.replace('"', '""')) for word in text.split()
+    )
+
+
+def search_snippets(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Search Snippets Function
+
+    Description:
+        - This function is used to filter snippets to those matching every
+        search term in their title or code, best matches first.
+        - The snippets are annotated with their `search_rank`, higher ranks
+        are better matches.
+
+    Args:
+        - `queryset (QuerySet)`: The snippets. **(Required)**
+        - `text (str)`: The search terms. **(Required)**
+
+    Returns:
+        - `QuerySet`: The ranked matches.
+
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        tsquery: str = "websearch_to_tsquery('simple', %s)"
+        matches: RawSQL = RawSQL(
+            f'"snippets_snippet"."search" @@ {tsquery}',
+            [text],
+            output_field=BooleanField(),
+        )
+        rank: RawSQL = RawSQL(
+            f'ts_rank("snippets_snippet"."search", {tsquery})',
+            [text],
+            output_field=FloatField(),
+        )
+    else:
+        fts: str = fts_query(text=text)
+        matches = RawSQL(
+            '"snippets_snippet"."id" IN (SELECT rowid FROM '
+            "snippets_snippet_fts WHERE snippets_snippet_fts MATCH %s)",
+            [fts],
+            output_field=BooleanField(),
+        )
+        # Correlated on the rowid, FTS5 seeks straight to the row.
+        rank = RawSQL(
+            "SELECT -bm25(snippets_snippet_fts, %s, %s) "
+            "FROM snippets_snippet_fts WHERE snippets_snippet_fts MATCH %s "
+            'AND snippets_snippet_fts.rowid = "snippets_snippet"."id"',
+            [TITLE_WEIGHT, CODE_WEIGHT, fts],
+            output_field=FloatField(),
+        )
+
+    return (
+        queryset.filter(matches)
+        .annotate(search_rank=rank)
+        .order_by("-search_rank", "id")
+    )
+
+
+class SearchTimeout(APIException):
+    """
+    Search Timeout Class
+
+    Description:
+        - This class is raised when a search did not finish before its
+        deadline.
+
+    Attributes:
+        - `status_code (int)`: The response status.
+        - `default_detail (str)`: The error message.
+        - `default_code (str)`: The error code.
+
+    Methods:
+        - `None`
+
+    """
+
+    status_code: int = HTTP_503_SERVICE_UNAVAILABLE
+    default_detail: str = "The search took too long, try a longer pattern."
+    default_code: str = "search_timeout"
+
+
+def sqlite_regexp(deadline: float) -> Callable[[str, str | None], bool]:
+    """
+    SQLite Regexp Function
+
+    Description:
+        - This function is used to create the SQLite function regular
+        expressions are matched with, bounded by the deadline of a search.
+        - SQLite cannot interrupt a call to a function, so a single match
+        is bounded by the timeout of the `regex` package, see
+        `match_snippets`.
+
+    Args:
+        - `deadline (float)`: The `monotonic()` time the search ends at.
+        **(Required)**
+
+    Returns:
+        - `Callable[[str, str | None], bool]`: The SQLite function.
+
+    """
+
+    def regexp(pattern: str, text: str | None) -> bool:
+        remaining: float = deadline - monotonic()
+
+        if remaining <= 0:
+            raise SearchTimeout()
+
+        if text is None:
+            return False
+
+        return bounded_re.search(pattern, text, timeout=remaining) is not None
+
+    return regexp
+
+
+@contextmanager
+def search_deadline(
+    connection: BaseDatabaseWrapper, seconds: float
+) -> Iterator[None]:
+    """
+    Search Deadline Function
+
+    Description:
+        - This function is used to abort the queries of a search that run
+        past a deadline, with `statement_timeout` on PostgreSQL and a
+        progress handler on SQLite.
+        - On SQLite the function regular expressions are matched with is
+        registered for the deadline as well, see `sqlite_regexp`.
+
+    Args:
+        - `connection (BaseDatabaseWrapper)`: The database connection.
+        **(Required)**
+        - `seconds (float)`: The time the queries may take. **(Required)**
+
+    Returns:
+        - `Iterator[None]`: The context in which the queries run.
+
+    Raises:
+        - `SearchTimeout`: When the deadline passed.
+        - `ValidationError`: When the database rejected the pattern of the
+        search.
+
+    """
+    deadline: float = monotonic() + seconds
+
+    try:
+        if connection.vendor == "postgresql":
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT set_config('statement_timeout', %s, true)",
+                        [str(max(1, int(seconds * 1000)))],
+                    )
+
+                yield
+        elif connection.vendor == "sqlite":
+            connection.ensure_connection()
+            connection.connection.set_progress_handler(
+                lambda: monotonic() > deadline, 1000
+            )
+            connection.connection.create_function(
+                SQLITE_REGEXP, 2, sqlite_regexp(deadline=deadline)
+            )
+
+            try:
+                yield
+            finally:
+                connection.connection.set_progress_handler(None, 0)
+        else:
+            yield
+    except DataError as error:
+        # PostgreSQL only parses regular expressions when they are matched,
+        # some syntax of Python is unknown to it.
+        raise ValidationError(
+            {"q": f"Invalid pattern: {str(error).splitlines()[0]}."}
+        ) from error
+    except OperationalError as error:
+        if monotonic() < deadline:
+            raise
+
+        raise SearchTimeout() from error
+
+
+def required_literal(pattern: str) -> str:
+    """
+    Required Literal Function
+
+    Description:
+        - This function is used to find the longest run of literal
+        characters every match of a regular expression contains, so the
+        trigram index can narrow down the candidates.
+        - Escapes are read as they are matched, `\\x`, `\\u`, `\\U` and
+        `\\N{...}` as the character they name. Literals inside groups and
+        character classes are ignored, as are alternations and verbose
+        patterns, as they are not always part of a match.
+
+    Args:
+        - `pattern (str)`: The regular expression. **(Required)**
+
+    Returns:
+        - `str`: The longest required literal, empty when there is none.
+
+    Raises:
+        - `re.error`: When the pattern is invalid.
+
+    """
+    if re.compile(pattern).flags & re.VERBOSE:
+        return ""
+
+    runs: list[str] = [""]
+    depth: int = 0
+    index: int = 0
+    # Whether the last item is the last character of the current run.
+    literal: bool = False
+
+    while index < len(pattern):
+        char: str = pattern[index]
+        index += 1
+        repeat: re.Match[str] | None = COUNTED_REPEAT.match(pattern, index - 1)
+
+        if char in "*+?" or (char == "{" and repeat):
+            low: int = 1 if char == "+" else 0
+
+            if repeat:
+                index = repeat.end()
+                low = int(repeat[1] or 0)
+
+            # Lazy and possessive quantifiers.
+            if index < len(pattern) and pattern[index] in "?+":
+                index += 1
+
+            # A character repeated at least once is part of every match.
+            if depth == 0 and literal and low == 0:
+                runs[-1] = runs[-1][:-1]
+
+            runs.append("")
+            literal = False
+            continue
+
+        if char == "\\":
+            char, index = _read_escape(pattern=pattern, index=index)
+        elif char == "[":
+            index = _skip_class(pattern=pattern, index=index)
+            char = ""
+        elif char == "(" and pattern.startswith("?#", index):
+            # Comments end at the first closing parenthesis.
+            index = pattern.index(")", index) + 1
+            char = ""
+        elif char == "(":
+            depth += 1
+            char = ""
+        elif char == ")":
+            depth -= 1
+            char = ""
+        elif char == "|":
+            if depth == 0:
+                return ""
+
+            char = ""
+        elif char in ".^$":
+            char = ""
+
+        literal = depth == 0 and bool(char)
+
+        if literal:
+            runs[-1] += char
+        elif depth == 0:
+            runs.append("")
+
+    return max(runs, key=len)
+
+
+def _read_escape(pattern: str, index: int) -> tuple[str, int]:
+    """
+    Read the escape after the backslash before `index`, return the literal
+    character it matches, empty for other escapes, and the index after it.
+
+    """
+    char: str = pattern[index]
+    index += 1
+
+    if char in CODE_POINT_ESCAPES:
+        end: int = index + CODE_POINT_ESCAPES[char]
+
+        return chr(int(pattern[index:end], 16)), end
+
+    if char == "N":
+        end = pattern.index("}", index) + 1
+
+        return unicodedata.lookup(pattern[index + 1 : end - 1]), end
+
+    if char.isdigit():
+        # Octal escapes and back references, at most three digits long.
+        end = index
+
+        while end < min(index + 2, len(pattern)) and pattern[end].isdigit():
+            end += 1
+
+        return "", end
+
+    if char.isascii() and char.isalpha():
+        return LITERAL_ESCAPES.get(char, ""), index
+
+    return char, index
+
+
+def _skip_class(pattern: str, index: int) -> int:
+    """
+    Return the index after the character class opened before `index`.
+
+    """
+    if index < len(pattern) and pattern[index] == "^":
+        index += 1
+
+    # A leading `]` is a member of the class.
+    if index < len(pattern) and pattern[index] == "]":
+        index += 1
+
+    while pattern[index] != "]":
+        index += 2 if pattern[index] == "\\" else 1
+
+    return index + 1
+
+
+def match_snippets(
+    queryset: QuerySet, pattern: str, regex: bool = False
+) -> QuerySet:
+    """
+    Match Snippets Function
+
+    Description:
+        - This function is used to filter snippets to those whose code
+        contains a substring, ignoring case, or matches a regular
+        expression.
+        - Candidates are looked up in the trigram index by a literal of at
+        least three characters every match contains.
+        - On SQLite the queryset must be evaluated within
+        `search_deadline`, which bounds the regular expression.
+
+    Args:
+        - `queryset (QuerySet)`: The snippets. **(Required)**
+        - `pattern (str)`: The substring or regular expression.
+        **(Required)**
+        - `regex (bool)`: Whether the pattern is a regular expression.
+        **(Optional)**
+
+    Returns:
+        - `QuerySet`: The matching snippets, oldest first.
+
+    Raises:
+        - `ValidationError`: When the pattern is invalid, too short to
+        use the trigram index, or a regular expression on SQLite without
+        the `regex` package.
+
+    """
+    literal: str = pattern
+
+    if regex:
+        try:
+            literal = required_literal(pattern=pattern)
+        except re.error as error:
+            raise ValidationError(
+                {"q": f"Invalid pattern: {error}."}
+            ) from error
+
+    if len(literal) < 3:
+        raise ValidationError(
+            {"q": "The pattern must contain at least 3 literal characters."}
+        )
+
+    connection: BaseDatabaseWrapper = connections[queryset.db]
+
+    if connection.vendor == "postgresql":
+        # `pg_trgm` extracts the trigrams of the pattern itself.
+        matches: RawSQL = RawSQL(
+            f'"snippets_snippet"."code" {"~" if regex else "ILIKE"} %s',
+            [
+                (
+                    pattern
+                    if regex
+                    else f"%{connection.ops.prep_for_like_query(pattern)}%"
+                )
+            ],
+            output_field=BooleanField(),
+        )
+        queryset = queryset.filter(matches)
+    else:
+        # SQLite cannot interrupt a match of `re`, which can take
+        # exponential time.
+        if regex and bounded_re is None:
+            raise ValidationError(
+                {"mode": "Regular expression searches are not supported."}
+            )
+
+        # A quoted string is a substring query for the trigram tokenizer.
+        candidates: RawSQL = RawSQL(
+            '"snippets_snippet"."id" IN (SELECT rowid FROM '
+            "snippets_snippet_trigram WHERE snippets_snippet_trigram "
+            "MATCH %s)",
+            ['"{}"'.format(literal.replace('"', '""'))],
+            output_field=BooleanField(),
+        )
+        if regex:
+            queryset = queryset.filter(
+                candidates,
+                RawSQL(
+                    f'{SQLITE_REGEXP}(%s, "snippets_snippet"."code")',
+                    [pattern],
+                    output_field=BooleanField(),
+                ),
+            )
+        else:
+            queryset = queryset.filter(candidates, code__icontains=pattern)
+
+    return queryset.order_by("created", "id")
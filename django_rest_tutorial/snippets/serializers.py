@@ -6,17 +6,27 @@ Description:
 
 """
 
+from typing import Any
+
 from django.contrib.auth.models import User
 from rest_framework.serializers import (
+    CharField,
+    DateTimeField,
     Hyperlink,
-    HyperlinkedIdentityField,
     HyperlinkedModelSerializer,
-    HyperlinkedRelatedField,
+    IntegerField,
+    ListSerializer,
     ManyRelatedField,
+    ModelSerializer,
     ReadOnlyField,
     RelatedField,
+    ValidationError,
 )
 
+from .fields import (
+    FastHyperlinkedIdentityField,
+    FilteredListLinkField,
+)
 from .models import Snippet
 
 
@@ -26,20 +36,25 @@ class UserSerializer(HyperlinkedModelSerializer):
 
     Description:
         - This class is used to serialize the User model.
+        - The snippets of a user are not listed, the user links to the
+        snippet list filtered by owner instead. The querysets must be
+        annotated with `snippet_count`.
 
     Attributes:
-        - `snippets (RelatedField[Snippet, str, Hyperlink] | ManyRelatedField)`
-        : The snippets of the user.
+        - `serializer_url_field (type[FastHyperlinkedIdentityField])`: The
+        field of the `url` of the user.
+        - `snippet_count (int)`: The number of snippets of the user.
+        - `snippets_url (str)`: The link to the snippets of the user.
 
     Methods:
         - `None`
 
     """
 
-    snippets: RelatedField[User, str, Hyperlink] | ManyRelatedField = (
-        HyperlinkedRelatedField(
-            many=True, view_name="snippet-detail", read_only=True
-        )
+    serializer_url_field = FastHyperlinkedIdentityField
+    snippet_count = IntegerField(read_only=True)
+    snippets_url = FilteredListLinkField(
+        view_name="snippet-list", lookup_field="username", query_param="owner"
     )
 
     class Meta:  # type: ignore
@@ -60,7 +75,102 @@ class UserSerializer(HyperlinkedModelSerializer):
         """
 
         model: type[User] = User
-        fields: list[str] = ["url", "id", "username", "snippets"]
+        fields: list[str] = [
+            "url",
+            "id",
+            "username",
+            "snippet_count",
+            "snippets_url",
+        ]
+
+
+class SnippetListSerializer(ListSerializer):
+    """
+    Snippet List Serializer Class
+
+    Description:
+        - This class is used to validate and create lists of snippets, as
+        sent to `/snippets/bulk/`.
+        - Every item is validated on its own. Invalid items are left out of
+        `validated_data` and their errors kept in `item_errors`, so the
+        valid ones can still be created.
+        - The snippets are created by `bulk_create_highlighted()`, which
+        renders the batch in parallel and inserts it with one query.
+
+    Attributes:
+        - `item_errors (list[dict[str, Any]])`: The errors of every item in
+        order, empty for valid items.
+
+    Methods:
+        - `to_internal_value(data: Any) -> list[dict[str, Any]]`: Validate
+        the items.
+        - `run_child_validation(data: Any) -> dict[str, Any] | None`:
+        Validate an item.
+        - `create(validated_data: list[dict[str, Any]]) -> list[Snippet]`:
+        Create the snippets.
+
+    """
+
+    item_errors: list[dict[str, Any]]
+
+    def to_internal_value(self, data: Any) -> list[dict[str, Any]]:
+        """
+        Validate the items, leaving out the invalid ones.
+
+        """
+        self.item_errors = []
+
+        return [
+            item
+            for item in super().to_internal_value(data)
+            if item is not None
+        ]
+
+    def run_child_validation(self, data: Any) -> dict[str, Any] | None:
+        """
+        Run Child Validation Method
+
+        Description:
+            - This method is used to validate an item and record its
+            errors instead of failing the whole list.
+
+        Args:
+            - `data (Any)`: The item. **(Required)**
+
+        Returns:
+            - `dict[str, Any] | None`: The validated item, `None` when it is
+            invalid.
+
+        """
+        try:
+            validated: dict[str, Any] = super().run_child_validation(data)
+        except ValidationError as exc:
+            self.item_errors.append(exc.detail)  # type: ignore
+            return None
+
+        self.item_errors.append({})
+
+        return validated
+
+    def create(self, validated_data: list[dict[str, Any]]) -> list[Snippet]:
+        """
+        Create Method
+
+        Description:
+            - This method is used to highlight and insert the snippets in
+            one batch.
+
+        Args:
+            - `validated_data (list[dict[str, Any]])`: The validated items.
+            **(Required)**
+
+        Returns:
+            - `list[Snippet]`: The created snippets.
+
+        """
+        return Snippet.objects.bulk_create_highlighted(  # type: ignore
+            objs=[Snippet(**attrs) for attrs in validated_data]
+        )
 
 
 class SnippetSerializer(HyperlinkedModelSerializer):
@@ -71,19 +181,26 @@ class SnippetSerializer(HyperlinkedModelSerializer):
         - This class is used to serialize the Snippet model.
 
     Attributes:
+        - `serializer_url_field (type[FastHyperlinkedIdentityField])`: The
+        field of the `url` of the snippet.
         - `owner (str)`: The owner of the snippet.
         - `highlight (RelatedField[Snippet, str, Hyperlink] |
         ManyRelatedField)`: The highlight of the snippet.
+        - `render_status (str)`: Whether the highlight is ready.
 
     Methods:
         - `None`
 
     """
 
+    serializer_url_field = FastHyperlinkedIdentityField
     owner = ReadOnlyField(source="owner.username")
     highlight: RelatedField[Snippet, str, Hyperlink] | ManyRelatedField = (
-        HyperlinkedIdentityField(view_name="snippet-highlight", format="html")
+        FastHyperlinkedIdentityField(
+            view_name="snippet-highlight", format="html"
+        )
     )
+    render_status = ReadOnlyField()
 
     class Meta:  # type: ignore
         """
@@ -97,6 +214,8 @@ class SnippetSerializer(HyperlinkedModelSerializer):
             on.
             - `fields (list[str])`: The fields that the serializer should
             include.
+            - `list_serializer_class (type[SnippetListSerializer])`: The
+            serializer of lists of snippets.
 
         Methods:
             - `None`
@@ -104,6 +223,9 @@ class SnippetSerializer(HyperlinkedModelSerializer):
         """
 
         model: type[Snippet] = Snippet
+        list_serializer_class: type[SnippetListSerializer] = (
+            SnippetListSerializer
+        )
         fields: list[str] = [
             "url",
             "id",
@@ -114,4 +236,106 @@ class SnippetSerializer(HyperlinkedModelSerializer):
             "style",
             "owner",
             "highlight",
+            "render_status",
+        ]
+
+
+class SnippetPreviewSerializer(SnippetSerializer):
+    """
+    Snippet Preview Serializer Class
+
+    Description:
+        - This class is used to serialize snippets in listings, the code is
+        replaced with the `code_preview` annotation of the queryset.
+
+    Attributes:
+        - `code (str)`: The first characters of the code of the snippet.
+
+    Methods:
+        - `None`
+
+    """
+
+    code = ReadOnlyField(source="code_preview")
+
+
+class SnippetFilterSerializer(ModelSerializer):
+    """
+    Snippet Filter Serializer Class
+
+    Description:
+        - This class is used to validate the query parameters snippet
+        listings are filtered with, languages and styles are checked against
+        the choices of the model.
+
+    Attributes:
+        - `owner (str)`: Username of the owner of the snippets.
+        - `created_after (datetime)`: Earliest creation time, inclusive.
+        - `created_before (datetime)`: Latest creation time, exclusive.
+
+    Methods:
+        - `validate(attrs: dict) -> dict`: Check the creation time range.
+
+    """
+
+    owner = CharField(required=False)
+    created_after = DateTimeField(required=False)
+    created_before = DateTimeField(required=False)
+
+    class Meta:  # type: ignore
+        """
+        Snippet Filter Meta Class
+
+        Description:
+            - This class contains metadata for the `SnippetFilterSerializer`
+            class.
+
+        Attributes:
+            - `model (type[Snippet])`: The model that the serializer is based
+            on.
+            - `fields (list[str])`: The fields that the serializer should
+            include.
+            - `extra_kwargs (dict[str, dict[str, bool]])`: Options of the
+            model fields.
+
+        Methods:
+            - `None`
+
+        """
+
+        model: type[Snippet] = Snippet
+        fields: list[str] = [
+            "owner",
+            "language",
+            "style",
+            "created_after",
+            "created_before",
         ]
+        extra_kwargs: dict[str, dict[str, bool]] = {
+            "language": {"required": False},
+            "style": {"required": False},
+        }
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Validate Method
+
+        Description:
+            - This method is used to reject empty creation time ranges.
+
+        Args:
+            - `attrs (dict)`: The validated query parameters. **(Required)**
+
+        Returns:
+            - `dict`: The validated query parameters.
+
+        """
+        after = attrs.get("created_after")
+        before = attrs.get("created_before")
+
+        if after is not None and before is not None and after >= before:
+            raise ValidationError(
+                {"created_before": "Must be later than `created_after`."}
+            )
+
+        return attrs
@@ -0,0 +1,178 @@
+"""
+Snippets Signals Module
+
+Description:
+    - This module contains the signal receivers of the snippets app.
+
+"""
+
+from django.apps import AppConfig
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import Model
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from .cache import invalidate_counts, invalidate_responses
+from .models import FILTER_FIELDS, Snippet
+from .search import ensure_search_triggers
+
+
+@receiver(signal=pre_save, sender=User)
+def user_saving(
+    sender: type[User],
+    instance: User,
+    update_fields: frozenset[str] | None,
+    **kwargs,
+) -> None:
+    """
+    User Saving Function
+
+    Description:
+        - This function is used to record whether a user is renamed by the
+        save, see `user_saved`.
+
+    Args:
+        - `sender (type[User])`: The saved model. **(Required)**
+        - `instance (User)`: The saved user. **(Required)**
+        - `update_fields (frozenset[str] | None)`: The saved fields.
+        **(Required)**
+        - `kwargs`: Additional keyword arguments. **(Optional)**
+
+    Returns:
+        - `None`
+
+    """
+    saved: bool = update_fields is None or "username" in update_fields
+
+    # pylint: disable-next=protected-access
+    instance._snippets_renamed = (  # type: ignore
+        instance.pk is not None
+        and saved
+        and sender.objects.filter(pk=instance.pk)  # pylint: disable=no-member
+        .exclude(username=instance.username)
+        .exists()
+    )
+
+
+@receiver(signal=post_save, sender=User)
+def user_saved(
+    sender: type[User],
+    instance: User,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **kwargs,
+) -> None:
+    """
+    User Saved Function
+
+    Description:
+        - This function is used to drop the cached counts of users when a
+        user is created, and the cached responses whenever a user changed.
+        - Snippets show the name of their owner, the snippets of a renamed
+        user are marked as modified so their validators change.
+        - Logins only store the time of the login, which no response shows.
+
+    Args:
+        - `sender (type[User])`: The saved model. **(Required)**
+        - `instance (User)`: The saved user. **(Required)**
+        - `created (bool)`: Whether a row was created. **(Required)**
+        - `update_fields (frozenset[str] | None)`: The saved fields.
+        **(Required)**
+        - `kwargs`: Additional keyword arguments. **(Optional)**
+
+    Returns:
+        - `None`
+
+    """
+    if created:
+        invalidate_counts(model=sender)
+
+    if update_fields != {"last_login"}:
+        invalidate_responses(model=sender)
+
+    if getattr(instance, "_snippets_renamed", False):
+        # pylint: disable-next=no-member
+        Snippet.objects.filter(owner=instance).update(modified=now())
+        invalidate_responses(model=Snippet)
+
+
+@receiver(signal=post_save, sender=Snippet)
+def snippet_saved(
+    sender: type[Snippet], instance: Snippet, created: bool, **kwargs
+) -> None:
+    """
+    Snippet Saved Function
+
+    Description:
+        - This function is used to drop the cached responses when a snippet
+        is saved, and the cached snippet counts when a snippet is created or
+        one of the fields listings are filtered or searched on changed.
+        - `post_save` is sent before the saved render inputs are recorded,
+        so the changed fields of the instance are still available.
+        - Bulk updates send no signal, see `SnippetQuerySet.restyle()`.
+
+    Args:
+        - `sender (type[Snippet])`: The saved model. **(Required)**
+        - `instance (Snippet)`: The saved snippet. **(Required)**
+        - `created (bool)`: Whether a row was created. **(Required)**
+        - `kwargs`: Additional keyword arguments. **(Optional)**
+
+    Returns:
+        - `None`
+
+    """
+    if created or instance.changed_fields(names=FILTER_FIELDS):
+        invalidate_counts(model=sender)
+
+    invalidate_responses(model=sender)
+
+
+@receiver(signal=post_delete, sender=Snippet)
+@receiver(signal=post_delete, sender=User)
+def row_deleted(sender: type[Model], **kwargs) -> None:
+    """
+    Row Deleted Function
+
+    Description:
+        - This function is used to drop the cached counts and responses of
+        a model when one of its rows is deleted.
+
+    Args:
+        - `sender (type[Model])`: The deleted model. **(Required)**
+        - `kwargs`: Additional keyword arguments. **(Optional)**
+
+    Returns:
+        - `None`
+
+    """
+    invalidate_counts(model=sender)
+    invalidate_responses(model=sender)
+
+
+@receiver(signal=post_migrate)
+def repair_search_index(sender: AppConfig, using: str, **kwargs) -> None:
+    """
+    Repair Search Index Function
+
+    Description:
+        - This function is used to restore the SQLite search triggers after
+        a migration of the snippets app rebuilt the snippets table.
+
+    Args:
+        - `sender (AppConfig)`: The migrated app. **(Required)**
+        - `using (str)`: Alias of the migrated database. **(Required)**
+        - `kwargs`: Additional keyword arguments. **(Optional)**
+
+    Returns:
+        - `None`
+
+    """
+    if sender.name == "snippets":
+        ensure_search_triggers(connection=connections[using])
@@ -0,0 +1,423 @@
+"""
+Snippets Tasks Module
+
+Description:
+    - This module contains the background render pool for the snippets app.
+    - Highlighting runs in a local process pool, the results are written
+    back to the database from a single writer thread.
+    - Renders can be bounded by `SNIPPETS_HIGHLIGHT_TIMEOUT` and
+    `SNIPPETS_HIGHLIGHT_CPU_TIME`, code that takes longer is stored as
+    plain text with the `fallback` status. The budget is enforced inside
+    the worker from the start of the render, a worker that does not give
+    up in time is killed on its own.
+    - Budgets are disabled by default, single snippets saved synchronously
+    are then highlighted in the web process without waiting for a worker.
+    - Renders lost with their worker are not the code's fault, they are
+    rendered again in the background.
+    - Batches of snippets, as created by `/snippets/bulk/`, are rendered
+    across every worker of the pool at once.
+    - Workers report the counters of their lexer and formatter caches with
+    every render, see `render_cache_info`, served to staff users at
+    `/status/render-cache/`.
+
+"""
+
+import logging
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from threading import Lock
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from .cache import highlight_cache, invalidate_responses
+from .highlighting import (
+    Rendered,
+    RenderTimeout,
+    cache_info,
+    highlight_key,
+    render_bounded,
+    render_fallback,
+    render_highlighted,
+)
+from .models import RenderStatus, Snippet, SnippetQuerySet
+from .pool import WorkerLost, WorkerPool
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+# Seconds a worker gets on top of its budget before it is deemed stuck.
+KILL_GRACE: float = 1.0
+
+# Times a render lost with its worker is submitted again before the snippet
+# is marked as failed.
+RENDER_RETRIES: int = 2
+
+_lock: Lock = Lock()
+_pool: WorkerPool | None = None
+_writer: ThreadPoolExecutor | None = None
+
+
+def get_pool() -> WorkerPool:
+    """
+    Get Pool Function
+
+    Description:
+        - This function is used to lazily create the render process pool.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `WorkerPool`: The render process pool.
+
+    """
+    global _pool  # pylint: disable=global-statement
+
+    with _lock:
+        if _pool is None:
+            _pool = WorkerPool(
+                max_workers=settings.SNIPPETS_HIGHLIGHT_WORKERS,
+                report=cache_info,
+            )
+
+    return _pool
+
+
+def render_cache_info() -> dict[str, dict[str, int]]:
+    """
+    Render Cache Info Function
+
+    Description:
+        - This function is used to get the counters of the lexer and
+        formatter caches, summed over the current process and every worker
+        of the render pool, see `cache_info`.
+        - Workers report their counters after every render, the counters of
+        replaced workers are kept.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `dict[str, dict[str, int]]`: Hits, misses and size of each cache.
+
+    """
+    reports: list[dict[str, dict[str, int]]] = [
+        cache_info(),
+        *(get_pool().reports() if _pool is not None else ()),
+    ]
+
+    return {
+        name: {
+            counter: (
+                value
+                if counter == "maxsize"
+                else sum(report[name][counter] for report in reports)
+            )
+            for counter, value in counters.items()
+        }
+        for name, counters in reports[0].items()
+    }
+
+
+def budget() -> dict[str, float]:
+    """
+    Budget Function
+
+    Description:
+        - This function is used to get the time budget of a render, see
+        `render_bounded`.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `dict[str, float]`: The wall-clock and CPU budget in seconds.
+
+    """
+    return {
+        "timeout": settings.SNIPPETS_HIGHLIGHT_TIMEOUT,
+        "cpu_time": settings.SNIPPETS_HIGHLIGHT_CPU_TIME,
+    }
+
+
+def submit_render(tokens: bytes = b"", **inputs: Any) -> Future[Rendered]:
+    """
+    Submit Render Function
+
+    Description:
+        - This function is used to render a snippet in the process pool
+        within the time budget.
+        - The worker is killed when the render outlives the budget by
+        `KILL_GRACE` seconds, counted from the start of the render.
+
+    Args:
+        - `tokens (bytes)`: Serialized token stream of the code, the code is
+        only formatted when given. **(Optional)**
+        - `inputs (Any)`: The render inputs. **(Required)**
+
+    Returns:
+        - `Future[Rendered]`: The render.
+
+    """
+    limits: dict[str, float] = budget()
+
+    return get_pool().submit(
+        render_bounded,
+        tokens=tokens,
+        **inputs,
+        **limits,
+        deadline=(
+            max(limits.values()) + KILL_GRACE if any(limits.values()) else None
+        ),
+    )
+
+
+def render_outcome(
+    future: Future[Rendered], **inputs: Any
+) -> tuple[Rendered, str]:
+    """
+    Render Outcome Function
+
+    Description:
+        - This function is used to wait for a render of the process pool
+        and get the render status it is stored with.
+        - Renders that ran out of time are replaced with plain text. Renders
+        lost with their worker are replaced with plain text as well, but
+        kept pending so they are rendered again. Renders that failed get
+        the `failed` status.
+
+    Args:
+        - `future (Future[Rendered])`: The render. **(Required)**
+        - `inputs (Any)`: The render inputs. **(Required)**
+
+    Returns:
+        - `tuple[Rendered, str]`: The render and the render status.
+
+    """
+    try:
+        rendered: Rendered = future.result()
+    except (RenderTimeout, TimeoutError):
+        logger.warning(
+            "Highlighting %s code ran out of time, storing plain text",
+            inputs["language"],
+        )
+        return (
+            render_fallback(code=inputs["code"], linenos=inputs["linenos"]),
+            RenderStatus.FALLBACK,
+        )
+    except WorkerLost:
+        logger.warning("Lost a render worker, rendering again later")
+        return (
+            render_fallback(code=inputs["code"], linenos=inputs["linenos"]),
+            RenderStatus.PENDING,
+        )
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception("Failed to render %s code", inputs["language"])
+        return (
+            Rendered(highlighted="", tokens=b"", lines=0),
+            RenderStatus.FAILED,
+        )
+
+    highlight_cache.set(key=highlight_key(**inputs), rendered=rendered)
+
+    return rendered, RenderStatus.READY
+
+
+def render_snippet(tokens: bytes = b"", **inputs: Any) -> tuple[Rendered, str]:
+    """
+    Render Snippet Function
+
+    Description:
+        - This function is used to render a snippet and wait for the
+        result, cached renders are reused.
+        - The code is lexed in the process pool within the time budget.
+        Formatting a stored token stream takes linear time, so it is done
+        in process, as is everything when the budget is disabled.
+        - Snippets whose render was lost with its worker get the `pending`
+        status, the caller schedules them with `schedule_render`.
+
+    Args:
+        - `tokens (bytes)`: Serialized token stream of the code, the code is
+        only formatted when given. **(Optional)**
+        - `inputs (Any)`: The render inputs. **(Required)**
+
+    Returns:
+        - `tuple[Rendered, str]`: The render and the render status.
+
+    """
+    key: str = highlight_key(**inputs)
+    rendered: Rendered | None = highlight_cache.get(key=key)
+
+    if rendered is not None:
+        return rendered, RenderStatus.READY
+
+    if tokens or not any(budget().values()):
+        rendered = render_highlighted(tokens=tokens, **inputs)
+        highlight_cache.set(key=key, rendered=rendered)
+
+        return rendered, RenderStatus.READY
+
+    return render_outcome(future=submit_render(**inputs), **inputs)
+
+
+def render_snippets(
+    inputs: Sequence[dict[str, Any]],
+) -> list[tuple[Rendered, str]]:
+    """
+    Render Snippets Function
+
+    Description:
+        - This function is used to render a batch of snippets in parallel
+        and wait for the results, cached renders are reused and identical
+        inputs are rendered once.
+        - Every render is bounded like the ones of `render_snippet`, and
+        gets the same render status.
+
+    Args:
+        - `inputs (Sequence[dict[str, Any]])`: The render inputs of every
+        snippet. **(Required)**
+
+    Returns:
+        - `list[tuple[Rendered, str]]`: The render and the render status of
+        every snippet, in order.
+
+    """
+    keys: list[str] = [highlight_key(**item) for item in inputs]
+    renders: dict[str, tuple[Rendered, str]] = {}
+    futures: dict[str, tuple[dict[str, Any], Future[Rendered]]] = {}
+
+    for key, item in zip(keys, inputs):
+        if key in renders or key in futures:
+            continue
+
+        rendered: Rendered | None = highlight_cache.get(key=key)
+
+        if rendered is not None:
+            renders[key] = (rendered, RenderStatus.READY)
+        else:
+            futures[key] = (item, submit_render(**item))
+
+    wait(fs=[future for _, future in futures.values()])
+
+    for key, (item, future) in futures.items():
+        renders[key] = render_outcome(future=future, **item)
+
+    return [renders[key] for key in keys]
+
+
+def get_writer() -> ThreadPoolExecutor:
+    """
+    Get Writer Function
+
+    Description:
+        - This function is used to lazily create the thread that stores
+        finished renders.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `ThreadPoolExecutor`: The single threaded writer.
+
+    """
+    global _writer  # pylint: disable=global-statement
+
+    with _lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="snippets-render"
+            )
+
+    return _writer
+
+
+def schedule_render(snippet: Snippet, tokens: bytes = b"") -> None:
+    """
+    Schedule Render Function
+
+    Description:
+        - This function is used to render a snippet in the background once
+        the current transaction has been committed.
+
+    Args:
+        - `snippet (Snippet)`: The saved snippet. **(Required)**
+        - `tokens (bytes)`: Serialized token stream of the code, the code is
+        only formatted when given. **(Optional)**
+
+    Returns:
+        - `None`
+
+    """
+    transaction.on_commit(
+        func=partial(_submit, snippet.pk, snippet.render_inputs(), tokens)
+    )
+
+
+def _submit(
+    pk: int, inputs: dict[str, Any], tokens: bytes, attempt: int = 0
+) -> None:
+    """
+    Submit the render to the process pool, unless it is already cached.
+
+    """
+    rendered: Rendered | None = highlight_cache.get(
+        key=highlight_key(**inputs)
+    )
+
+    if rendered is not None:
+        future: Future[Rendered] = Future()
+        future.set_result(result=rendered)
+        get_writer().submit(_store, pk, inputs, tokens, attempt, future)
+        return
+
+    future = submit_render(tokens=tokens, **inputs)
+    future.add_done_callback(
+        lambda done: get_writer().submit(
+            _store, pk, inputs, tokens, attempt, done
+        )
+    )
+
+
+def _store(
+    pk: int,
+    inputs: dict[str, Any],
+    tokens: bytes,
+    attempt: int,
+    future: Future[Rendered],
+) -> None:
+    """
+    Store a finished render, unless the snippet changed in the meantime.
+    Renders lost with their worker are submitted again, a few times.
+
+    """
+    rendered, status = render_outcome(future=future, **inputs)
+
+    if status == RenderStatus.PENDING:
+        if attempt < RENDER_RETRIES:
+            _submit(pk=pk, inputs=inputs, tokens=tokens, attempt=attempt + 1)
+            return
+
+        logger.error("Giving up rendering snippet %s", pk)
+        status = RenderStatus.FAILED
+
+    try:
+        # Filtering on the render inputs drops results that were overtaken
+        # by a newer save of the same snippet.
+        # pylint: disable-next=no-member
+        snippets: SnippetQuerySet = Snippet.objects.filter(pk=pk, **inputs)
+        snippets.update(
+            highlighted=rendered.highlighted,
+            tokens=rendered.tokens,
+            line_count=rendered.lines,
+            render_status=status,
+            modified=now(),
+        )
+        # Pending snippets have no pages, compress the new one right away.
+        snippets.store_pages()
+        # Bulk updates send no signals.
+        invalidate_responses(model=Snippet)
+    finally:
+        connection.close()
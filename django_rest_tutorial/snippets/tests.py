@@ -5,3 +5,1330 @@ Description:
     - This module contains the test cases for the snippets app.
 
 """
+
+import os
+import time
+from concurrent.futures import Future
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from gzip import decompress
+from io import BytesIO
+from itertools import product
+from typing import Any
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.relations import (
+    HyperlinkedIdentityField,
+    HyperlinkedRelatedField,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from .cache import HighlightCache, cached_count, highlight_cache
+from .fields import FastHyperlinkedIdentityField, FastHyperlinkedRelatedField
+from .highlighting import (
+    STREAM_CHUNK_LINES,
+    Rendered,
+    highlight_key,
+    render_fallback,
+    stream_highlighted,
+)
+from .models import RenderStatus, Snippet
+from .pool import WorkerLost, WorkerPool
+from .renderers import ORJSONParser, ORJSONRenderer, msgpack, orjson
+from .search import bounded_re, required_literal
+from .tasks import get_pool, render_snippet
+
+
+# Renders run in the test process, without the render pool.
+@override_settings(SNIPPETS_HIGHLIGHT_TIMEOUT=0, SNIPPETS_HIGHLIGHT_CPU_TIME=0)
+class SnippetTestCase(APITestCase):
+    """
+    Snippet Test Case Class
+
+    Description:
+        - This class is the base of the test cases of the snippets app, it
+        starts every test with empty caches and a user.
+
+    Attributes:
+        - `user (User)`: The owner of the snippets of a test.
+
+    Methods:
+        - `clear_caches() -> None`: Empty every cache.
+        - `create_snippets(owner: User, count: int) -> list[Snippet]`:
+        Create snippets.
+
+    """
+
+    user: User
+
+    def setUp(self) -> None:
+        """
+        Empty the caches and create the owner of the snippets.
+
+        """
+        self.clear_caches()
+        self.user = User.objects.create_user(  # pylint: disable=no-member
+            username="alice", password="password"
+        )
+
+    def clear_caches(self) -> None:
+        """
+        Empty the Django caches and the in-process highlight cache.
+
+        """
+        for cache in caches.all():
+            cache.clear()
+
+        highlight_cache.local.clear()
+
+    def create_snippets(self, owner: User, count: int) -> list[Snippet]:
+        """
+        Create Snippets Method
+
+        Description:
+            - This method is used to create small Python snippets.
+
+        Args:
+            - `owner (User)`: The owner of the snippets. **(Required)**
+            - `count (int)`: The number of snippets. **(Required)**
+
+        Returns:
+            - `list[Snippet]`: The created snippets.
+
+        """
+        return [
+            Snippet.objects.create(  # pylint: disable=no-member
+                title=f"snippet {index}",
+                code=f"def f{index}():\n    return {index}\n",
+                language="python",
+                owner=owner,
+            )
+            for index in range(count)
+        ]
+
+
+class ListQueriesTests(SnippetTestCase):
+    """
+    List Queries Tests Class
+
+    Description:
+        - This class tests that the listings of snippets and users run the
+        same number of queries whatever the number of rows on a page.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `count_queries(path: str) -> int`: Count the queries of a request.
+
+    """
+
+    def count_queries(self, path: str) -> int:
+        """
+        Count the queries of a successful request.
+
+        """
+        with CaptureQueriesContext(connection=connection) as queries:
+            response = self.client.get(path=path)
+
+        self.assertEqual(response.status_code, 200)
+
+        return len(queries)
+
+    def test_snippet_list(self) -> None:
+        """
+        A full page of snippets runs the queries of a page of two.
+
+        """
+        self.create_snippets(owner=self.user, count=2)
+        expected: int = self.count_queries(path="/snippets/")
+        self.create_snippets(owner=self.user, count=8)
+
+        with self.assertNumQueries(num=expected):
+            response = self.client.get(path="/snippets/")
+
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_user_list(self) -> None:
+        """
+        A full page of users with snippets runs the queries of a page of
+        two.
+
+        """
+        owners: list[User] = [
+            self.user,
+            User.objects.create_user(  # pylint: disable=no-member
+                username="bob"
+            ),
+        ]
+
+        for owner in owners:
+            self.create_snippets(owner=owner, count=2)
+
+        expected: int = self.count_queries(path="/users/")
+
+        for index in range(8):
+            owners.append(
+                User.objects.create_user(  # pylint: disable=no-member
+                    username=f"user{index}"
+                )
+            )
+            self.create_snippets(owner=owners[-1], count=2)
+
+        with self.assertNumQueries(num=expected):
+            response = self.client.get(path="/users/")
+
+        self.assertEqual(len(response.data["results"]), 10)
+
+
+class FastHyperlinkTests(SnippetTestCase):
+    """
+    Fast Hyperlink Tests Class
+
+    Description:
+        - This class tests that the fast hyperlinked fields build the links
+        the fields of Django REST framework build, with format suffixes and
+        with a preserved `?format=` query parameter.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `link(field: HyperlinkedRelatedField, value: Any, path: str,
+        format: str | None) -> str`: Serialize a link.
+
+    """
+
+    # Request paths and the format suffix the view gets from the path.
+    REQUESTS: tuple[tuple[str, str | None], ...] = (
+        ("/snippets/", None),
+        ("/snippets.json", "json"),
+        ("/snippets/1.json", "json"),
+        ("/snippets/?format=json", None),
+        ("/snippets/?format=api&page=2", None),
+    )
+
+    def link(
+        self,
+        field: HyperlinkedRelatedField,
+        value: Any,
+        path: str,
+        format: str | None,  # pylint: disable=redefined-builtin
+    ) -> str:
+        """
+        Serialize a link with the context of a request to the path.
+
+        """
+        request: Request = Request(request=APIRequestFactory().get(path=path))
+        field.bind(
+            field_name="url",
+            parent=Serializer(context={"request": request, "format": format}),
+        )
+
+        return field.to_representation(value=value)
+
+    def test_identity_links(self) -> None:
+        """
+        Snippet and highlight links are identical to the stock ones.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+
+        for path, format in self.REQUESTS:
+            for view_name in ("snippet-detail", "snippet-highlight"):
+                with self.subTest(path=path, view_name=view_name):
+                    self.assertEqual(
+                        self.link(
+                            field=FastHyperlinkedIdentityField(
+                                view_name=view_name
+                            ),
+                            value=snippet,
+                            path=path,
+                            format=format,
+                        ),
+                        self.link(
+                            field=HyperlinkedIdentityField(
+                                view_name=view_name
+                            ),
+                            value=snippet,
+                            path=path,
+                            format=format,
+                        ),
+                    )
+
+    def test_related_links(self) -> None:
+        """
+        Owner links are identical to the stock ones.
+
+        """
+        for path, format in self.REQUESTS:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self.link(
+                        field=FastHyperlinkedRelatedField(
+                            view_name="user-detail", read_only=True
+                        ),
+                        value=self.user,
+                        path=path,
+                        format=format,
+                    ),
+                    self.link(
+                        field=HyperlinkedRelatedField(
+                            view_name="user-detail", read_only=True
+                        ),
+                        value=self.user,
+                        path=path,
+                        format=format,
+                    ),
+                )
+
+
+class StreamHighlightedTests(SnippetTestCase):
+    """
+    Stream Highlighted Tests Class
+
+    Description:
+        - This class tests that the fragment streamed from the token stream
+        of a snippet is the stored highlighted fragment.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_stream_matches_highlighted(self) -> None:
+        """
+        The streamed fragment is identical with and without line numbers,
+        for code shorter and longer than a chunk of lines.
+
+        """
+        for lines, linenos in product(
+            (3, STREAM_CHUNK_LINES * 2 + 1), (False, True)
+        ):
+            with self.subTest(lines=lines, linenos=linenos):
+                # pylint: disable-next=no-member
+                snippet: Snippet = Snippet.objects.create(
+                    code="".join(
+                        f"x{index} = f({index})  # line {index}\n"
+                        for index in range(lines)
+                    ),
+                    language="python",
+                    linenos=linenos,
+                    owner=self.user,
+                )
+                snippet.refresh_from_db()
+
+                self.assertEqual(
+                    "".join(
+                        stream_highlighted(
+                            tokens=bytes(snippet.tokens),
+                            linenos=snippet.linenos,
+                            start=1,
+                            stop=snippet.line_count,
+                        )
+                    ),
+                    snippet.highlighted,
+                )
+
+
+class BulkCreateTests(SnippetTestCase):
+    """
+    Bulk Create Tests Class
+
+    Description:
+        - This class tests the creation of lists of snippets with
+        `/snippets/bulk/`.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_mixed_items(self) -> None:
+        """
+        Valid items are created and invalid ones reported, in order, with a
+        `207 Multi-Status` answer.
+
+        """
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            path="/snippets/bulk/",
+            data=[
+                {"title": "first", "code": "print(1)\n"},
+                {"title": "broken", "code": "print(2)\n", "language": "nope"},
+                {
+                    "title": "third",
+                    "code": "fn main() {}\n",
+                    "language": "rust",
+                },
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [item and item["title"] for item in response.data["results"]],
+            ["first", None, "third"],
+        )
+        self.assertEqual(
+            [list(errors) for errors in response.data["errors"]],
+            [[], ["language"], []],
+        )
+        self.assertEqual(
+            list(
+                Snippet.objects.order_by(  # pylint: disable=no-member
+                    "id"
+                ).values_list("title", "owner", "render_status")
+            ),
+            [
+                ("first", self.user.pk, "ready"),
+                ("third", self.user.pk, "ready"),
+            ],
+        )
+
+
+class TokenReuseTests(SnippetTestCase):
+    """
+    Token Reuse Tests Class
+
+    Description:
+        - This class tests that line number changes only reuse the stored
+        token stream of snippets whose render is ready.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_stale_tokens_are_lexed_again(self) -> None:
+        """
+        Snippets whose token stream is not the one of their code are lexed
+        again, and the shared cache only gets the render of the new code.
+
+        """
+        stale: Rendered = render_fallback(code="old_name = 1\n", linenos=False)
+        plain: Rendered = render_fallback(code="new_name = 2\n", linenos=False)
+        cases: dict[str, tuple[str, Rendered]] = {
+            # The code changed, its render is still pending.
+            "pending": (RenderStatus.PENDING, stale),
+            # The render was lost with its worker, plain text was stored.
+            "lost worker": (RenderStatus.PENDING, plain),
+            "failed": (RenderStatus.FAILED, Rendered("", b"", 0)),
+        }
+
+        for name, (status, rendered) in cases.items():
+            with self.subTest(case=name):
+                self.clear_caches()
+                (snippet,) = self.create_snippets(owner=self.user, count=1)
+                # pylint: disable-next=no-member
+                Snippet.objects.filter(pk=snippet.pk).update(
+                    code="new_name = 2\n",
+                    highlighted=rendered.highlighted,
+                    tokens=rendered.tokens,
+                    line_count=rendered.lines,
+                    render_status=status,
+                )
+                snippet.refresh_from_db()
+                snippet.linenos = True
+                snippet.save()
+                snippet.refresh_from_db()
+
+                self.assertEqual(snippet.render_status, RenderStatus.READY)
+                self.assertIn(
+                    '<span class="n">new_name</span>', snippet.highlighted
+                )
+                self.assertNotIn("old_name", snippet.highlighted)
+                self.assertEqual(
+                    highlight_cache.get(
+                        key=highlight_key(**snippet.render_inputs())
+                    ),
+                    (snippet.highlighted, bytes(snippet.tokens), 1),
+                )
+
+
+class ConditionalRequestTests(SnippetTestCase):
+    """
+    Conditional Request Tests Class
+
+    Description:
+        - This class tests that conditional requests are only answered with
+        `304 Not Modified` while the response is unchanged.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_list_after_delete(self) -> None:
+        """
+        Listings have no modification time, and deleting a snippet changes
+        their entity tag.
+
+        """
+        snippets: list[Snippet] = self.create_snippets(
+            owner=self.user, count=2
+        )
+        response = self.client.get(path="/snippets/")
+
+        self.assertNotIn("Last-Modified", response.headers)
+        self.assertEqual(
+            self.client.get(
+                path="/snippets/", HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            304,
+        )
+
+        snippets[0].delete()
+
+        self.assertEqual(
+            self.client.get(
+                path="/snippets/", HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            200,
+        )
+
+    def test_detail_after_owner_rename(self) -> None:
+        """
+        Renaming the owner of a snippet advances its modification time and
+        changes its entity tag.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        # pylint: disable-next=no-member
+        Snippet.objects.filter(pk=snippet.pk).update(
+            modified=snippet.modified - timedelta(days=1)
+        )
+        path: str = f"/snippets/{snippet.pk}/"
+        response = self.client.get(path=path)
+
+        for headers in (
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+        ):
+            with self.subTest(headers=headers):
+                self.assertEqual(
+                    self.client.get(path=path, **headers).status_code, 304
+                )
+
+        self.user.username = "carol"
+        self.user.save()
+
+        for headers in (
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+        ):
+            with self.subTest(headers=headers):
+                self.assertEqual(
+                    self.client.get(path=path, **headers).status_code, 200
+                )
+
+
+class RegexSearchTests(SnippetTestCase):
+    """
+    Regex Search Tests Class
+
+    Description:
+        - This class tests the literals regular expression searches are
+        narrowed down by, and that they are only matched on SQLite with a
+        timeout.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_required_literal(self) -> None:
+        """
+        Escapes are read as the character they match, optional and
+        alternative parts are left out.
+
+        """
+        cases: dict[str, str] = {
+            r"def\s+main": "main",
+            r"fooo?bar": "foo",
+            r"ab+cd": "ab",
+            r"abc{,3}de": "ab",
+            r"ab{}cd": "ab{}cd",
+            r"(ab)+cdef": "cdef",
+            r"[]abc]defg": "defg",
+            r"a|bcdef": "",
+            r"(?x) a b c d": "",
+            r"\x41BCDE": "ABCDE",
+            r"étude": "étude",
+            r"\U0001F600abc": "\U0001f600abc",
+            r"\N{LATIN SMALL LETTER A}bcd": "abcd",
+            r"(a)\1xyzw": "xyzw",
+            r"\0123abc": "3abc",
+            r"\.py\b": ".py",
+        }
+
+        for pattern, literal in cases.items():
+            with self.subTest(pattern=pattern):
+                self.assertEqual(required_literal(pattern=pattern), literal)
+
+    def test_regex_needs_timeout(self) -> None:
+        """
+        Without the `regex` package, SQLite rejects regular expressions
+        rather than match them without a timeout.
+
+        """
+        self.create_snippets(owner=self.user, count=1)
+        path: str = "/snippets/search/?mode=regex&q=def%20f0"
+
+        with patch(target="snippets.search.bounded_re", new=None):
+            response = self.client.get(path=path)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("mode", response.data)
+
+        if bounded_re is not None:
+            response = self.client.get(path=f"{path}&page=1")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["count"], 1)
+
+
+class RenderCacheTests(SnippetTestCase):
+    """
+    Render Cache Tests Class
+
+    Description:
+        - This class tests that the counters of the lexer and formatter
+        caches count renders, and are only shown to staff users.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_counters(self) -> None:
+        """
+        Renders with a cached lexer and formatter count as hits.
+
+        """
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+        self.create_snippets(owner=self.user, count=1)
+        before: dict[str, dict[str, int]] = self.client.get(
+            path="/status/render-cache/"
+        ).data
+        # The code of the first snippet is in the highlight cache already.
+        self.create_snippets(owner=self.user, count=3)
+        after: dict[str, dict[str, int]] = self.client.get(
+            path="/status/render-cache/"
+        ).data
+
+        for name in ("lexers", "formatters"):
+            with self.subTest(cache=name):
+                self.assertEqual(after[name]["hits"] - before[name]["hits"], 2)
+                self.assertEqual(after[name]["misses"], before[name]["misses"])
+                self.assertGreaterEqual(after[name]["size"], 1)
+
+    def test_staff_only(self) -> None:
+        """
+        Other users are refused the counters.
+
+        """
+        self.client.force_authenticate(user=self.user)
+
+        self.assertEqual(
+            self.client.get(path="/status/render-cache/").status_code, 403
+        )
+
+
+class HighlightCacheTests(SimpleTestCase):
+    """
+    Highlight Cache Tests Class
+
+    Description:
+        - This class tests that the in-process tier of the highlight cache
+        is bounded by the total size of its renders.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    @override_settings(SNIPPETS_HIGHLIGHT_CACHE="")
+    def test_byte_bound(self) -> None:
+        """
+        Renders are evicted once their total size exceeds the bound, and
+        renders larger than the bound are not kept.
+
+        """
+        cache: HighlightCache = HighlightCache(maxsize=10, maxbytes=1000)
+        small: Rendered = Rendered(highlighted="x" * 300, tokens=b"", lines=1)
+
+        for key in "abcd":
+            cache.set(key=key, rendered=small)
+
+        self.assertEqual(len(cache.local), 3)
+        self.assertEqual(cache.local.nbytes, 900)
+        self.assertIsNone(cache.get(key="a"))
+        self.assertEqual(cache.get(key="d"), small)
+
+        cache.set(
+            key="e",
+            rendered=Rendered(highlighted="x" * 1001, tokens=b"", lines=1),
+        )
+
+        self.assertIsNone(cache.get(key="e"))
+        self.assertEqual(len(cache.local), 3)
+
+
+# Renders run in the render pool, with a budget short enough for large code
+# to run out of it.
+@override_settings(
+    SNIPPETS_HIGHLIGHT_TIMEOUT=0.05, SNIPPETS_HIGHLIGHT_CPU_TIME=1
+)
+class RenderPoolTests(SnippetTestCase):
+    """
+    Render Pool Tests Class
+
+    Description:
+        - This class tests the renders of the render pool, the deadline of
+        its jobs and the recovery from lost workers.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `create_snippet(code: str) -> Snippet`: Create a snippet.
+
+    """
+
+    def create_snippet(self, code: str) -> Snippet:
+        """
+        Create a Python snippet and load it back.
+
+        """
+        # pylint: disable-next=no-member
+        snippet: Snippet = Snippet.objects.create(
+            code=code, language="python", owner=self.user
+        )
+        snippet.refresh_from_db()
+
+        return snippet
+
+    def test_render(self) -> None:
+        """
+        Code is highlighted by a worker, which reports its cache counters.
+
+        """
+        snippet: Snippet = self.create_snippet(code="answer = 42\n")
+
+        self.assertEqual(snippet.render_status, RenderStatus.READY)
+        self.assertIn('<span class="n">answer</span>', snippet.highlighted)
+        self.assertTrue(get_pool().reports())
+
+    def test_timeout(self) -> None:
+        """
+        Code that takes longer than the budget is stored as plain text.
+
+        """
+        code: str = "value = call(1) < 2  # comment\n" * 50_000
+
+        with self.assertLogs(logger="snippets.tasks", level="WARNING"):
+            snippet: Snippet = self.create_snippet(code=code)
+
+        self.assertEqual(snippet.render_status, RenderStatus.FALLBACK)
+        self.assertEqual(
+            snippet.highlighted.count("value = call(1) &lt; 2  # comment"),
+            50_000,
+        )
+
+    def test_lost_worker(self) -> None:
+        """
+        Snippets whose worker died are stored as plain text and kept
+        pending, until they are rendered again.
+
+        """
+        with (
+            patch(
+                target="snippets.tasks.submit_render",
+                new=lambda **inputs: get_pool().submit(os._exit, 1),
+            ),
+            self.assertLogs(logger="snippets.tasks", level="WARNING"),
+        ):
+            snippet: Snippet = self.create_snippet(code="answer = 42\n")
+
+        self.assertEqual(snippet.render_status, RenderStatus.PENDING)
+        self.assertEqual(snippet.highlighted.count("answer = 42"), 1)
+
+        # pylint: disable-next=no-member
+        Snippet.objects.filter(pk=snippet.pk).render_again()
+        snippet.refresh_from_db()
+
+        self.assertEqual(snippet.render_status, RenderStatus.READY)
+        self.assertIn('<span class="n">answer</span>', snippet.highlighted)
+
+
+class WorkerPoolTests(SimpleTestCase):
+    """
+    Worker Pool Tests Class
+
+    Description:
+        - This class tests that jobs of the worker pool fail on their own,
+        and that the pool replaces the workers it lost.
+
+    Attributes:
+        - `pool (WorkerPool)`: The pool of a test.
+
+    Methods:
+        - `None`
+
+    """
+
+    pool: WorkerPool
+
+    def setUp(self) -> None:
+        """
+        Start a pool of a single worker.
+
+        """
+        self.pool = WorkerPool(max_workers=1)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_deadline(self) -> None:
+        """
+        A job that outlives its deadline fails, the next job runs.
+
+        """
+        with (
+            self.assertRaises(TimeoutError),
+            self.assertLogs(logger="snippets.pool", level="WARNING"),
+        ):
+            self.pool.submit(time.sleep, 10, deadline=0.5).result(timeout=30)
+
+        self.assertEqual(self.pool.submit(max, 1, 2).result(timeout=30), 2)
+
+    def test_queued_time(self) -> None:
+        """
+        The deadline of a job is counted from its start, not its submission.
+
+        """
+        first: Future = self.pool.submit(time.sleep, 0.5)
+        second: Future = self.pool.submit(time.sleep, 0.5, deadline=0.75)
+
+        self.assertIsNone(first.result(timeout=30))
+        self.assertIsNone(second.result(timeout=30))
+
+    def test_lost_worker(self) -> None:
+        """
+        A job whose worker died fails with `WorkerLost`, the next job runs
+        in a new worker.
+
+        """
+        with self.assertRaises(WorkerLost):
+            self.pool.submit(os._exit, 1).result(timeout=30)
+
+        self.assertEqual(self.pool.submit(max, 1, 2).result(timeout=30), 2)
+
+
+class RenderTrackingTests(SnippetTestCase):
+    """
+    Render Tracking Tests Class
+
+    Description:
+        - This class tests that saving a snippet only renders it again when
+        a render input changed, and the queryset helpers that render or
+        restyle snippets in bulk.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `save(snippet: Snippet, **kwargs) -> list[bytes]`: Save a snippet.
+
+    """
+
+    def save(self, snippet: Snippet, **kwargs: Any) -> list[bytes]:
+        """
+        Save a snippet, return the tokens of every render it asked for.
+
+        """
+        with patch(
+            target="snippets.tasks.render_snippet", wraps=render_snippet
+        ) as render:
+            snippet.save(**kwargs)
+
+        return [call.kwargs["tokens"] for call in render.call_args_list]
+
+    def test_unchanged_inputs(self) -> None:
+        """
+        Saving other fields, or the style, renders nothing.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        snippet.refresh_from_db()
+        highlighted: str = snippet.highlighted
+
+        self.assertEqual(self.save(snippet=snippet), [])
+
+        snippet.title = "renamed"
+        snippet.style = "monokai"
+
+        self.assertEqual(self.save(snippet=snippet), [])
+
+        # pylint: disable-next=no-member
+        deferred: Snippet = Snippet.objects.only("title").get(pk=snippet.pk)
+        deferred.title = "deferred"
+
+        self.assertEqual(self.save(snippet=deferred), [])
+
+        snippet.refresh_from_db()
+
+        self.assertEqual(snippet.highlighted, highlighted)
+        self.assertIn("/styles/monokai.css", snippet.render_page())
+
+    def test_changed_inputs(self) -> None:
+        """
+        Code and language changes are lexed, line number changes only
+        format the stored token stream.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        snippet.refresh_from_db()
+        snippet.linenos = True
+
+        self.assertEqual(self.save(snippet=snippet), [bytes(snippet.tokens)])
+
+        snippet.code = "answer = 42\n"
+
+        self.assertEqual(self.save(snippet=snippet), [b""])
+
+        snippet.language = "text"
+
+        self.assertEqual(self.save(snippet=snippet), [b""])
+        self.assertNotIn('<span class="n">', snippet.highlighted)
+
+    def test_update_fields(self) -> None:
+        """
+        Changes outside `update_fields` are neither rendered nor stored.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        snippet.refresh_from_db()
+        code: str = snippet.code
+        snippet.code = "answer = 42\n"
+        snippet.title = "renamed"
+
+        self.assertEqual(
+            self.save(snippet=snippet, update_fields=["title"]), []
+        )
+
+        snippet.refresh_from_db()
+
+        self.assertEqual((snippet.title, snippet.code), ("renamed", code))
+
+    def test_restyle(self) -> None:
+        """
+        Restyled snippets keep their fragment and drop their stale pages,
+        which are stored again with the next render.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        snippets = Snippet.objects.filter(  # pylint: disable=no-member
+            pk=snippet.pk
+        )
+        highlighted: str = snippets.get().highlighted
+
+        self.assertEqual(snippets.restyle(style="monokai"), 1)
+
+        snippet.refresh_from_db()
+
+        self.assertEqual(snippet.style, "monokai")
+        self.assertEqual(snippet.highlighted, highlighted)
+        self.assertEqual(bytes(snippet.page_gzip), b"")
+
+        snippets.update(render_status=RenderStatus.FAILED, highlighted="")
+
+        self.assertEqual(snippets.render_again(), 1)
+
+        snippet.refresh_from_db()
+
+        self.assertEqual(snippet.render_status, RenderStatus.READY)
+        self.assertEqual(snippet.highlighted, highlighted)
+        self.assertIn(b"/styles/monokai.css", decompress(snippet.page_gzip))
+
+
+class PaginationTests(SnippetTestCase):
+    """
+    Pagination Tests Class
+
+    Description:
+        - This class tests the cached counts of paginated lists and the
+        cursor pagination of snippets.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    def test_cached_count(self) -> None:
+        """
+        Counts are cached per queryset until a snippet is created or
+        deleted.
+
+        """
+        snippets: list[Snippet] = self.create_snippets(
+            owner=self.user, count=3
+        )
+        queryset = Snippet.objects.all()  # pylint: disable=no-member
+
+        with self.assertNumQueries(num=1):
+            self.assertEqual(cached_count(queryset=queryset), 3)
+
+        with self.assertNumQueries(num=0):
+            self.assertEqual(cached_count(queryset=queryset), 3)
+            self.assertEqual(cached_count(queryset=queryset.all()), 3)
+
+        with self.assertNumQueries(num=1):
+            self.assertEqual(
+                cached_count(queryset=queryset.filter(title="snippet 0")), 1
+            )
+
+        self.create_snippets(owner=self.user, count=1)
+
+        self.assertEqual(cached_count(queryset=queryset), 4)
+
+        snippets[0].delete()
+
+        self.assertEqual(cached_count(queryset=queryset), 3)
+
+    def test_cursor_pages(self) -> None:
+        """
+        Pages follow the creation time, then the id, without gaps or
+        duplicates, and link back to the previous page.
+
+        """
+        snippets: list[Snippet] = self.create_snippets(
+            owner=self.user, count=25
+        )
+        # Snippets created at the same instant are ordered by id, the last
+        # ones were created first.
+        Snippet.objects.filter(  # pylint: disable=no-member
+            pk__in=[snippet.pk for snippet in snippets[:20]]
+        ).update(created=snippets[0].created)
+        Snippet.objects.filter(  # pylint: disable=no-member
+            pk__in=[snippet.pk for snippet in snippets[20:]]
+        ).update(created=snippets[0].created - timedelta(days=1))
+        expected: list[int] = [
+            snippet.pk for snippet in snippets[20:] + snippets[:20]
+        ]
+        pages: list[list[int]] = []
+        previous: list[str | None] = []
+        url: str | None = "/snippets/"
+
+        while url is not None:
+            data: dict[str, Any] = self.client.get(path=url).data
+            pages.append([item["id"] for item in data["results"]])
+            previous.append(data["previous"])
+            url = data["next"]
+
+            self.assertEqual(data["count"], 25)
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), expected)
+        self.assertIsNone(previous[0])
+        self.assertEqual(
+            [
+                item["id"]
+                for item in self.client.get(path=previous[1]).data["results"]
+            ],
+            pages[0],
+        )
+
+
+class ResponseCacheTests(SnippetTestCase):
+    """
+    Response Cache Tests Class
+
+    Description:
+        - This class tests that read responses are served from the cache
+        until a write changes them, and that the browsable API is never
+        cached.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `cached(path: str) -> bool`: Tell whether a response was cached.
+
+    """
+
+    def cached(self, path: str) -> bool:
+        """
+        Get a path, tell whether the response was replayed from the cache,
+        cached responses are plain Django responses without `data`.
+
+        """
+        response = self.client.get(path=path)
+
+        self.assertEqual(response.status_code, 200)
+
+        return not hasattr(response, "data")
+
+    def test_writes_invalidate(self) -> None:
+        """
+        Writes to snippets and users drop the cached responses built from
+        them.
+
+        """
+        self.client.force_authenticate(user=self.user)
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        paths: tuple[str, ...] = (
+            "/snippets/?format=json",
+            f"/snippets/{snippet.pk}/?format=json",
+            f"/users/{self.user.pk}/?format=json",
+        )
+
+        for path in paths:
+            self.assertFalse(self.cached(path=path))
+            self.assertTrue(self.cached(path=path))
+
+        response = self.client.patch(
+            path=f"/snippets/{snippet.pk}/",
+            data={"title": "renamed"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        for path in paths:
+            with self.subTest(path=path, write="snippet"):
+                self.assertFalse(self.cached(path=path))
+
+        self.assertEqual(
+            self.client.get(path=paths[1]).json()["title"], "renamed"
+        )
+
+        self.user.username = "carol"
+        self.user.save()
+
+        for path in paths:
+            with self.subTest(path=path, write="user"):
+                self.assertFalse(self.cached(path=path))
+
+        self.assertEqual(
+            self.client.get(path=paths[2]).json()["username"], "carol"
+        )
+
+    def test_browsable_api(self) -> None:
+        """
+        Pages of the browsable API depend on the user, they are rendered
+        every time.
+
+        """
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+
+        for path in ("/snippets/", f"/snippets/{snippet.pk}/"):
+            with self.subTest(path=path):
+                for _ in range(2):
+                    self.assertFalse(self.cached(path=f"{path}?format=api"))
+
+
+class RendererTests(SnippetTestCase):
+    """
+    Renderer Tests Class
+
+    Description:
+        - This class tests that the `orjson` renderer and parser read and
+        write what the ones of Django REST framework do, and the
+        MessagePack renderer and parser.
+
+    Attributes:
+        - `None`
+
+    Methods:
+        - `None`
+
+    """
+
+    # Data with every kind of value the stock encoder converts.
+    DATA: dict[str, Any] = {
+        "text": "naïve     </script>",
+        "created": datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=UTC),
+        "amount": Decimal("1.25"),
+        "items": [1, 2.5, None, True],
+        "nested": {"count": 9_223_372_036_854_775_807},
+    }
+
+    def test_render(self) -> None:
+        """
+        The output is the stock output, with and without `orjson`, for
+        indented and ASCII output, and for integers wider than 64 bits.
+
+        """
+
+        class ASCIIRenderer(ORJSONRenderer):
+            ensure_ascii: bool = True
+
+        class StockASCIIRenderer(JSONRenderer):
+            ensure_ascii: bool = True
+
+        cases: dict[str, tuple[JSONRenderer, JSONRenderer, Any, str]] = {
+            "compact": (ORJSONRenderer(), JSONRenderer(), self.DATA, ""),
+            "indent": (
+                ORJSONRenderer(),
+                JSONRenderer(),
+                self.DATA,
+                "application/json; indent=2",
+            ),
+            "ascii": (ASCIIRenderer(), StockASCIIRenderer(), self.DATA, ""),
+            "wide integer": (
+                ORJSONRenderer(),
+                JSONRenderer(),
+                {"count": 2**70},
+                "",
+            ),
+        }
+
+        for (name, (renderer, stock, data, media_type)), module in product(
+            cases.items(), (orjson, None)
+        ):
+            with (
+                self.subTest(case=name, orjson=module is not None),
+                patch(target="snippets.renderers.orjson", new=module),
+            ):
+                self.assertEqual(
+                    renderer.render(data=data, accepted_media_type=media_type),
+                    stock.render(data=data, accepted_media_type=media_type),
+                )
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_render_nan(self) -> None:
+        """
+        `orjson` encodes floats JSON has no value for as `null`, where the
+        stock renderer refuses them.
+
+        """
+        data: dict[str, float] = {"nan": float("nan"), "inf": float("inf")}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data=data), b'{"nan":null,"inf":null}'
+        )
+
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data=data)
+
+    def test_parse(self) -> None:
+        """
+        Documents are parsed like the stock parser does, with and without
+        `orjson`, integers wider than 64 bits are exact.
+
+        """
+        for content, module in product(
+            (
+                b'{"text": "na\\u00efve", "items": [1, 2.5, null, true]}',
+                b'{"count": 123456789012345678901234567890}',
+                b'{"count": -9223372036854775809}',
+            ),
+            (orjson, None),
+        ):
+            with (
+                self.subTest(content=content, orjson=module is not None),
+                patch(target="snippets.renderers.orjson", new=module),
+            ):
+                self.assertEqual(
+                    ORJSONParser().parse(stream=BytesIO(content)),
+                    JSONParser().parse(stream=BytesIO(content)),
+                )
+
+        for content in (b'{"value": NaN}', b'{"value": ', b"[1,]"):
+            with (
+                self.subTest(content=content),
+                self.assertRaises(ParseError),
+            ):
+                ORJSONParser().parse(stream=BytesIO(content))
+
+    @skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack(self) -> None:
+        """
+        MessagePack is negotiated by `Accept` and `?format=`, holds what the
+        JSON response holds, and is accepted as a request body without
+        extension types.
+
+        """
+        self.client.force_authenticate(user=self.user)
+        (snippet,) = self.create_snippets(owner=self.user, count=1)
+        path: str = f"/snippets/{snippet.pk}/"
+
+        # Links keep the `?format=` of the request.
+        for headers, json_headers in (
+            (
+                {"HTTP_ACCEPT": "application/msgpack"},
+                {"HTTP_ACCEPT": "application/json"},
+            ),
+            ({"QUERY_STRING": "format=msgpack"}, {}),
+        ):
+            with self.subTest(headers=headers):
+                response = self.client.get(path=path, **headers)
+                expected: dict[str, Any] = self.client.get(
+                    path=path, **json_headers
+                ).json()
+
+                if not json_headers:
+                    expected["url"] += "?format=msgpack"
+                    expected["highlight"] += "?format=msgpack"
+
+                self.assertEqual(
+                    response["Content-Type"], "application/msgpack"
+                )
+                self.assertEqual(msgpack.unpackb(response.content), expected)
+
+        response = self.client.post(
+            path="/snippets/",
+            data=msgpack.packb({"title": "packed", "code": "print(1)\n"}),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["title"], "packed")
+
+        response = self.client.post(
+            path="/snippets/",
+            data=msgpack.packb(
+                {"title": "ext", "code": msgpack.ExtType(1, b"x")}
+            ),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, 400)
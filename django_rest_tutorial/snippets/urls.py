@@ -7,7 +7,7 @@ Description:
 """
 
 from django.urls import include, path
-from django.urls.resolvers import URLResolver
+from django.urls.resolvers import URLPattern, URLResolver
 from rest_framework.routers import DefaultRouter
 
 from . import views
@@ -20,6 +20,16 @@ router.register(
 router.register(prefix=r"users", viewset=views.UserViewSet, basename="user")
 
 # The API URLs are now determined automatically by the router.
-urlpatterns: list[URLResolver] = [
+urlpatterns: list[URLResolver | URLPattern] = [
     path("", include(router.urls)),
+    path(
+        route="styles/<str:style>.css",
+        view=views.style_sheet,
+        name="snippet-style",
+    ),
+    path(
+        route="status/render-cache/",
+        view=views.render_cache,
+        name="render-cache",
+    ),
 ]
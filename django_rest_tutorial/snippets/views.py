@@ -6,10 +6,41 @@ Description:
 
 """
 
+from datetime import datetime
+from hashlib import sha256
+from typing import Any
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Manager, QuerySet
+from django.db import connections
+from django.db.models import (
+    Count,
+    Manager,
+    Max,
+    OuterRef,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce, Substr
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.html import escape
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
 from rest_framework import permissions, renderers, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import (
     BasePermission,
     OperandHolder,
@@ -18,10 +49,41 @@ from rest_framework.permissions import (
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
+from rest_framework.status import (
+    HTTP_201_CREATED,
+    HTTP_202_ACCEPTED,
+    HTTP_207_MULTI_STATUS,
+    HTTP_400_BAD_REQUEST,
+)
 
-from .models import Snippet
+from .cache import cached_count
+from .filters import SnippetFilterBackend
+from .highlighting import PAGE_ENCODINGS, style_css, style_etag
+from .mixins import (
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    cache_response,
+    conditional_response,
+)
+from .models import (
+    PAGE_ENCODING_FIELDS,
+    RenderStatus,
+    Snippet,
+    get_style_choices,
+)
+from .pagination import (
+    CachedCountPageNumberPagination,
+    SnippetCursorPagination,
+)
 from .permissions import IsOwnerOrReadOnly
-from .serializers import SnippetSerializer, UserSerializer
+from .search import match_snippets, search_deadline, search_snippets
+from .serializers import (
+    SnippetListSerializer,
+    SnippetPreviewSerializer,
+    SnippetSerializer,
+    UserSerializer,
+)
+from .tasks import render_cache_info
 
 
 @api_view(["GET"])
@@ -56,31 +118,173 @@ def api_root(
     )
 
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def render_cache(
+    request: Request,  # pylint: disable=unused-argument
+) -> Response:
+    """
+    Render Cache Function
+
+    Description:
+        - This function is used to display the counters of the lexer and
+        formatter caches of the server process and its render pool, see
+        `render_cache_info`, to staff users.
+
+    Args:
+        - `request (Request)`: The request object. **(Required)**
+
+    Returns:
+        - `Response`: The response object.
+
+    """
+    return Response(render_cache_info())
+
+
+def _page_encoding(request: HttpRequest) -> str | None:
+    """
+    Get the most preferred content coding of the stored highlight pages
+    the client accepts, `None` when only the identity is accepted.
+
+    """
+    qualities: dict[str, float] = {}
+
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = item.split(";")
+        quality: float = 1.0
+
+        for param in params:
+            name, _, value = param.strip().partition("=")
+
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        qualities[coding.strip().lower()] = quality
+
+    accepted: list[tuple[float, str]] = [
+        (qualities.get(encoding, qualities.get("*", 0.0)), encoding)
+        for encoding in PAGE_ENCODINGS
+    ]
+    # Ties go to the first coding of `PAGE_ENCODINGS`.
+    quality, encoding = max(
+        accepted, key=lambda item: item[0], default=(0.0, "")
+    )
+
+    return encoding if quality > 0 else None
+
+
+def _style_sheet_etag(
+    request: HttpRequest,
+    style: str,  # pylint: disable=unused-argument
+) -> str | None:
+    """
+    Get the entity tag of a stylesheet, `None` for unknown styles.
+
+    """
+    return (
+        style_etag(style=style) if style in dict(get_style_choices()) else None
+    )
+
+
+@require_safe
+@cache_control(public=True, max_age=86400)
+@condition(etag_func=_style_sheet_etag)
+def style_sheet(
+    request: HttpRequest,
+    style: str,  # pylint: disable=unused-argument
+) -> HttpResponse:
+    """
+    Style Sheet Function
+
+    Description:
+        - This function is used to serve the shared stylesheet of a style.
+        - Conditional requests are answered with `304 Not Modified`.
+
+    Args:
+        - `request (HttpRequest)`: The request object. **(Required)**
+        - `style (str)`: Name of the style. **(Required)**
+
+    Returns:
+        - `HttpResponse`: The response object.
+
+    """
+    if style not in dict(get_style_choices()):
+        raise Http404("Unknown style.")
+
+    return HttpResponse(
+        content=style_css(style=style), content_type="text/css; charset=utf-8"
+    )
+
+
+class UserViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     This viewset automatically provides `list` and `retrieve` actions.
 
+    Users link to their snippets instead of listing them, the number of
+    snippets of the users on a page is counted by a subquery using the owner
+    index. Responses are cached until a user or snippet changes.
+
     """
 
+    cache_models: tuple[str, ...] = ("auth.user", "snippets.snippet")
+
     queryset: QuerySet[User] | Manager[User] | None = (  # type: ignore
-        User.objects.all()  # pylint: disable=no-member
+        User.objects.annotate(  # pylint: disable=no-member
+            snippet_count=Coalesce(
+                Subquery(
+                    queryset=Snippet.objects.filter(  # pylint: disable=no-member
+                        owner=OuterRef("pk")
+                    )
+                    .order_by()
+                    .values("owner")
+                    .annotate(count=Count("pk"))
+                    .values("count")
+                ),
+                0,
+            )
+        ).order_by("id")
     )
     serializer_class = UserSerializer
 
 
-class SnippetViewSet(viewsets.ModelViewSet):
+class SnippetViewSet(
+    ConditionalResponseMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     """
     This ViewSet automatically provides `list`, `create`, `retrieve`,
     `update` and `destroy` actions.
 
-    Additionally we also provide an extra `highlight` action.
+    Additionally we also provide an extra `highlight` action, a `search`
+    action ranking snippets by full-text search and a `bulk_create` action
+    creating a list of snippets at once.
+
+    Owners are joined into the snippet query, so a page of snippets is
+    always loaded by a single query, pages are addressed by cursor. The
+    highlighted HTML, token stream and compressed highlight pages
+    are only loaded by the actions that use them, and listings requested
+    with `?preview=true` only load the first characters of the code.
+
+    Reads are cached until a user or snippet changes. Listings, snippets
+    and highlights carry an `ETag`, snippets and highlights also carry a
+    `Last-Modified` header, clients that are up to date get a
+    `304 Not Modified` answer.
+
+    Listings can be filtered with `?owner=<username>`, `?language=`,
+    `?style=`, `?created_after=` and `?created_before=`. Highlights of a
+    range of lines are requested with `?lines=<first>-<last>`.
 
     """
 
     queryset: QuerySet[Snippet] | Manager[Snippet] | None = (  # type: ignore
-        Snippet.objects.all()  # pylint: disable=no-member
+        Snippet.objects.select_related("owner")  # pylint: disable=no-member
     )
+    cache_models: tuple[str, ...] = ("snippets.snippet", "auth.user")
     serializer_class = SnippetSerializer
+    pagination_class = SnippetCursorPagination
+    filter_backends = [SnippetFilterBackend]
     permission_classes: list[  # type: ignore
         type[BasePermission] | OperandHolder | SingleOperandHolder
     ] = [
@@ -88,22 +292,308 @@ class SnippetViewSet(viewsets.ModelViewSet):
         IsOwnerOrReadOnly,
     ]
 
+    @property
+    def preview(self) -> bool:
+        """
+        Whether a listing with code previews was requested.
+
+        """
+        return (
+            self.action in ("list", "search")
+            and self.request.query_params.get(key="preview")
+            in BooleanField.TRUE_VALUES
+        )
+
+    def get_queryset(self) -> QuerySet[Snippet]:
+        """
+        Get Queryset Method
+
+        Description:
+            - This method is used to skip loading columns the current
+            action does not serialize.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `QuerySet[Snippet]`: The queryset of the action.
+
+        """
+        queryset: QuerySet[Snippet] = super().get_queryset()
+
+        if self.action in ("list", "retrieve", "search"):
+            queryset = queryset.defer(
+                "highlighted", "tokens", *PAGE_ENCODING_FIELDS.values()
+            )
+        elif self.action == "highlight":
+            # Only the page in the accepted content coding is sent, pages
+            # sent as they are are streamed from the token stream.
+            encoding: str | None = self.page_encoding()
+            queryset = queryset.defer(
+                "highlighted",
+                "code",
+                *(("tokens",) if encoding else ()),
+                *(
+                    name
+                    for key, name in PAGE_ENCODING_FIELDS.items()
+                    if key != encoding
+                ),
+            )
+
+        if self.preview:
+            queryset = queryset.defer("code").annotate(
+                code_preview=Substr(
+                    "code", 1, settings.SNIPPETS_PREVIEW_LENGTH
+                )
+            )
+
+        return queryset
+
+    def validators(
+        self, request: Request
+    ) -> tuple[str, datetime | None] | None:
+        """
+        Validators Method
+
+        Description:
+            - This method is used to get the validators of listings,
+            snippets and highlights from the modification times of the
+            snippets, without loading them.
+            - Listings also depend on the number of snippets, so deletions
+            change their entity tag. Deletions do not advance the newest
+            modification time, so listings have no modification time.
+            Snippets are marked as modified when their owner is renamed.
+            Highlights depend on the content coding they are sent in.
+
+        Args:
+            - `request (Request)`: The request object. **(Required)**
+
+        Returns:
+            - `tuple[str, datetime | None] | None`: The unquoted entity tag
+            and the modification time, `None` when there are none.
+
+        """
+        queryset: QuerySet[Snippet] = self.filter_queryset(
+            queryset=Snippet.objects.all()  # pylint: disable=no-member
+        )
+        version: tuple[Any, ...] | None = None
+
+        if self.action == "list":
+            version = (
+                queryset.aggregate(modified=Max("modified"))["modified"],
+                cached_count(queryset=queryset),
+            )
+        elif self.action in ("retrieve", "highlight"):
+            try:
+                version = (
+                    queryset.filter(pk=self.kwargs["pk"])
+                    .values_list("modified", "owner__username")
+                    .first()
+                )
+            except (TypeError, ValueError):
+                return None
+
+        if version is None or version[0] is None:
+            return None
+
+        # Entity tags are strong, they differ between representations.
+        etag: str = sha256(
+            repr(
+                (
+                    self.action,
+                    request.build_absolute_uri(),
+                    request.accepted_media_type,
+                    (
+                        self.page_encoding()
+                        if self.action == "highlight"
+                        else None
+                    ),
+                    version,
+                )
+            ).encode()
+        ).hexdigest()
+
+        return etag, None if self.action == "list" else version[0]
+
+    def page_encoding(self) -> str | None:
+        """
+        Get the content coding the highlight page is sent in, `None` when
+        it is sent as it is. Line ranges are never compressed.
+
+        """
+        if "lines" in self.request.query_params:
+            return None
+
+        return _page_encoding(request=self.request)
+
+    def highlight_lines(self) -> tuple[int, int | None]:
+        """
+        Highlight Lines Method
+
+        Description:
+            - This method is used to get the range of lines requested with
+            `?lines=<first>-<last>`, `?lines=<first>-` or `?lines=<line>`,
+            every line by default.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `tuple[int, int | None]`: The numbers of the first and last
+            line, `None` for the last line of the snippet.
+
+        Raises:
+            - `ValidationError`: If the range is invalid.
+
+        """
+        lines: str | None = self.request.query_params.get(key="lines")
+
+        if lines is None:
+            return 1, None
+
+        first, dash, last = lines.partition("-")
+
+        if not first.isdigit() or not (last.isdigit() or not last):
+            raise ValidationError(
+                detail={
+                    "lines": [
+                        "Expected `<first>-<last>`, `<first>-` or `<line>`."
+                    ]
+                }
+            )
+
+        start: int = int(first)
+        stop: int | None = int(last) if last else (None if dash else start)
+
+        if start < 1 or (stop is not None and stop < start):
+            raise ValidationError(
+                detail={"lines": ["Lines are numbered from 1 upwards."]}
+            )
+
+        return start, stop
+
+    def get_serializer_class(self) -> type[SnippetSerializer]:
+        """
+        Get Serializer Class Method
+
+        Description:
+            - This method is used to serialize code previews in listings
+            requested with `?preview=true`.
+
+        Args:
+            - `None`
+
+        Returns:
+            - `type[SnippetSerializer]`: The serializer class of the action.
+
+        """
+        if self.preview:
+            return SnippetPreviewSerializer
+
+        return SnippetSerializer
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        """
+        Search results are ranked rather than ordered by a key, so they are
+        paginated by page number.
+
+        """
+        if self.action == "search" and not hasattr(self, "_paginator"):
+            self._paginator = CachedCountPageNumberPagination()
+
+        return super().paginator
+
+    @action(methods=["GET"], detail=False)
+    @cache_response
+    def search(
+        self,
+        request: Request,
+        *args,  # pylint: disable=unused-argument
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> Response:
+        """
+        Search Action
+
+        Description:
+            - This action is used to search the title and code of snippets
+            with `?q=`, snippets matching every word come first by rank.
+            - With `?mode=substring` or `?mode=regex` the code is matched
+            against a substring, ignoring case, or a regular expression
+            instead, oldest snippets first.
+            - The search is answered by the indexes of the database, can be
+            combined with the listing filters and is aborted after
+            `SNIPPETS_SEARCH_TIMEOUT` seconds.
+
+        Args:
+            - `request (Request)`: The request object. **(Required)**
+            - `args`: Additional arguments. **(Optional)**
+            - `kwargs`: Additional keyword arguments. **(Optional)**
+
+        Returns:
+            - `Response`: The response object.
+
+        """
+        text: str = request.query_params.get(key="q", default="")
+        mode: str = request.query_params.get(key="mode", default="text")
+        queryset: QuerySet[Snippet] = self.filter_queryset(
+            queryset=self.get_queryset()
+        )
+
+        if not text.strip():
+            raise ValidationError({"q": "This query parameter is required."})
+
+        if mode == "text":
+            queryset = search_snippets(queryset=queryset, text=text)
+        elif mode in ("substring", "regex"):
+            queryset = match_snippets(
+                queryset=queryset, pattern=text, regex=mode == "regex"
+            )
+        else:
+            raise ValidationError(
+                {"mode": "Must be one of `text`, `substring` or `regex`."}
+            )
+
+        with search_deadline(
+            connection=connections[queryset.db],
+            seconds=settings.SNIPPETS_SEARCH_TIMEOUT,
+        ):
+            # Search results are always paginated, see `paginator`.
+            page: list[Snippet] = self.paginate_queryset(  # type: ignore
+                queryset=queryset
+            )
+
+        return self.get_paginated_response(
+            data=self.get_serializer(page, many=True).data
+        )
+
     @action(
         methods=["GET"],
         detail=True,
         renderer_classes=[renderers.StaticHTMLRenderer],
     )
+    @conditional_response
     def highlight(
         self,
         request: Request,  # pylint: disable=unused-argument
         *args,  # pylint: disable=unused-argument
         **kwargs,  # pylint: disable=unused-argument
-    ) -> Response:
+    ) -> HttpResponse | StreamingHttpResponse:
         """
         Highlight Action
 
         Description:
             - This action is used to highlight a snippet.
+            - The stored fragment is wrapped in a page linking to the shared
+            stylesheet of the snippet's style.
+            - The page is stored compressed, clients accepting `br` or
+            `gzip` get the stored page as it is. Missing pages, as after a
+            restyle, are compressed and stored by the first request.
+            - Other clients, and ranges of lines requested with
+            `?lines=<first>-<last>`, get a page streamed from the token
+            stream a few hundred lines at a time.
+            - While the render pool is still working on the snippet a small
+            placeholder is returned with a `202 Accepted` status.
 
         Args:
             - `request (Request)`: The request object. **(Required)**
@@ -111,12 +601,120 @@ class SnippetViewSet(viewsets.ModelViewSet):
             - `kwargs`: Additional keyword arguments. **(Optional)**
 
         Returns:
-            - `Response`: The response object.
+            - `HttpResponse | StreamingHttpResponse`: The response object.
 
         """
+        start, stop = self.highlight_lines()
         snippet: Snippet = self.get_object()
 
-        return Response(snippet.highlighted)
+        if snippet.render_status == RenderStatus.PENDING:
+            return Response(
+                data=(
+                    f"<!DOCTYPE html><title>{escape(snippet.title)}</title>"
+                    "<p>This snippet is still being highlighted.</p>"
+                ),
+                status=HTTP_202_ACCEPTED,
+                headers={"Retry-After": "1"},
+            )
+
+        if snippet.render_status == RenderStatus.FAILED:
+            return Response(data=f"<pre>{escape(snippet.code)}</pre>")
+
+        if start > snippet.line_count:
+            raise ValidationError(
+                detail={
+                    "lines": [
+                        f"The snippet has {snippet.line_count} lines only."
+                    ]
+                }
+            )
+
+        encoding: str | None = self.page_encoding()
+        response: HttpResponse | StreamingHttpResponse
+
+        if encoding is None:
+            response = StreamingHttpResponse(
+                streaming_content=snippet.stream_page(start=start, stop=stop),
+                content_type="text/html; charset=utf-8",
+            )
+        else:
+            name: str = PAGE_ENCODING_FIELDS[encoding]
+
+            if not getattr(snippet, name):
+                snippet.store_pages()
+
+            response = HttpResponse(
+                content=bytes(getattr(snippet, name)),
+                content_type="text/html; charset=utf-8",
+                headers={"Content-Encoding": encoding},
+            )
+
+        patch_vary_headers(response=response, newheaders=("Accept-Encoding",))
+
+        return response
+
+    @action(methods=["POST"], detail=False, url_path="bulk")
+    def bulk_create(
+        self,
+        request: Request,
+        *args,  # pylint: disable=unused-argument
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> Response:
+        """
+        Bulk Create Action
+
+        Description:
+            - This action is used to create a list of snippets at once, at
+            most `SNIPPETS_BULK_CREATE_MAX_ITEMS`.
+            - The items are validated one by one and the valid ones are
+            created, highlighted in parallel by the render pool and
+            inserted with a single query.
+            - `results` and `errors` follow the order of the items, with
+            the created snippet or `null` and the errors of the item or an
+            empty object. The status is `201 Created` when every item was
+            created, `400 Bad Request` when none was and `207 Multi-Status`
+            otherwise.
+
+        Args:
+            - `request (Request)`: The request object. **(Required)**
+            - `args`: Additional arguments. **(Optional)**
+            - `kwargs`: Additional keyword arguments. **(Optional)**
+
+        Returns:
+            - `Response`: The response object.
+
+        """
+        serializer: SnippetListSerializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.SNIPPETS_BULK_CREATE_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        created: list[dict[str, Any]] = []
+
+        if serializer.validated_data:
+            serializer.save(owner=self.request.user)
+            created = serializer.data
+
+        snippets = iter(created)
+        results: list[dict[str, Any] | None] = [
+            None if errors else next(snippets)
+            for errors in serializer.item_errors
+        ]
+
+        return Response(
+            data={"results": results, "errors": serializer.item_errors},
+            status=(
+                HTTP_400_BAD_REQUEST
+                if not created
+                else (
+                    HTTP_201_CREATED
+                    if len(created) == len(results)
+                    else HTTP_207_MULTI_STATUS
+                )
+            ),
+        )
 
     def perform_create(self, serializer) -> None:
         """
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+"""
+JSON Renderers Benchmark Script
+
+Description:
+    - This script compares `JSONRenderer` with `ORJSONRenderer` on pages of
+    serialized snippets of increasing size.
+    - The pages are serialized once by `SnippetSerializer`, only encoding is
+    timed, and the script fails when both renderers disagree on a page.
+
+Usage:
+    - `./scripts/bench_json_renderers.py --sizes 10 100 1000 --runs 50`
+
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+PROJECT_DIR: Path = Path(__file__).resolve().parent.parent / (
+    "django_rest_tutorial"
+)
+
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_rest_tutorial.settings"
+)
+os.environ.setdefault("DEBUG", "False")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.renderers import BaseRenderer, JSONRenderer  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from snippets.models import Snippet  # noqa: E402
+from snippets.renderers import ORJSONRenderer, orjson  # noqa: E402
+from snippets.serializers import SnippetSerializer  # noqa: E402
+
+LANGUAGES: tuple[str, ...] = ("python", "rust", "go", "c", "sql")
+STYLES: tuple[str, ...] = ("friendly", "monokai", "default")
+
+
+def seed(rows: int) -> None:
+    """
+    Seed Function
+
+    Description:
+        - This function is used to fill the test database with snippets of
+        a single owner.
+
+    Args:
+        - `rows (int)`: Number of snippets. **(Required)**
+
+    Returns:
+        - `None`
+
+    """
+    owner: User = User.objects.create(  # pylint: disable=no-member
+        username="alice"
+    )
+    Snippet.objects.bulk_create(  # pylint: disable=no-member
+        objs=[
+            Snippet(
+                title=f"snippet {index} — café",
+                code=f"def f{index}():\n    return {index}\n",
+                language=LANGUAGES[index % len(LANGUAGES)],
+                style=STYLES[index % len(STYLES)],
+                owner=owner,
+            )
+            for index in range(rows)
+        ],
+        batch_size=1000,
+    )
+
+
+def page(size: int) -> list[dict[str, Any]]:
+    """
+    Page Function
+
+    Description:
+        - This function is used to serialize a page of snippets the way the
+        list of `SnippetViewSet` does.
+
+    Args:
+        - `size (int)`: Number of snippets. **(Required)**
+
+    Returns:
+        - `list[dict[str, Any]]`: The serialized snippets.
+
+    """
+    request: Request = Request(
+        request=APIRequestFactory().get(path="/snippets/")
+    )
+    snippets = Snippet.objects.select_related(  # pylint: disable=no-member
+        "owner"
+    ).order_by("id")[:size]
+
+    return SnippetSerializer(
+        instance=snippets, many=True, context={"request": request}
+    ).data
+
+
+def median_ms(renderer: BaseRenderer, data: Any, runs: int) -> float:
+    """
+    Median Ms Function
+
+    Description:
+        - This function is used to time the rendering of data.
+
+    Args:
+        - `renderer (BaseRenderer)`: The renderer. **(Required)**
+        - `data (Any)`: The data. **(Required)**
+        - `runs (int)`: Number of samples. **(Required)**
+
+    Returns:
+        - `float`: The median in milliseconds.
+
+    """
+    timings: list[float] = []
+
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        renderer.render(data=data, accepted_media_type="application/json")
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def main() -> int:
+    """
+    Main Function
+
+    Description:
+        - This function is used to seed the test database and print the
+        median rendering time of every page size.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `int`: The exit status.
+
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Compare the JSON renderers on snippet pages."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000]
+    )
+    parser.add_argument("--runs", type=int, default=50)
+    args: argparse.Namespace = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed, both renderers are the same.")
+
+    setup_test_environment()
+    old_name: str = connection.creation.create_test_db(verbosity=0)
+    status: int = 0
+
+    try:
+        seed(rows=max(args.sizes))
+
+        for size in args.sizes:
+            data: list[dict[str, Any]] = page(size=size)
+            expected: bytes = JSONRenderer().render(
+                data=data, accepted_media_type="application/json"
+            )
+            rendered: bytes = ORJSONRenderer().render(
+                data=data, accepted_media_type="application/json"
+            )
+
+            if rendered != expected:
+                print(f"== {size} snippets: outputs differ")
+                status = 1
+                continue
+
+            baseline: float = median_ms(
+                renderer=JSONRenderer(), data=data, runs=args.runs
+            )
+            candidate: float = median_ms(
+                renderer=ORJSONRenderer(), data=data, runs=args.runs
+            )
+            print(
+                f"== {size} snippets, {len(expected)} bytes: json "
+                f"{baseline:.3f} ms, orjson {candidate:.3f} ms "
+                f"({baseline / candidate:.1f}x)"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Query Plans Benchmark Script
+
+Description:
+    - This script prints the query plan and the latency of the hot snippet
+    listings, so index changes can be checked on SQLite and PostgreSQL.
+    - The snippets are seeded into a throwaway test database of the
+    configured backend, set `DATABASE` and the `DB_*` variables to run it
+    against PostgreSQL.
+
+Usage:
+    - `./scripts/bench_query_plans.py --rows 50000 --runs 20`
+
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+PROJECT_DIR: Path = Path(__file__).resolve().parent.parent / (
+    "django_rest_tutorial"
+)
+
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_rest_tutorial.settings"
+)
+os.environ.setdefault("DEBUG", "False")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import QuerySet  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils.timezone import now  # noqa: E402
+from snippets.models import Snippet  # noqa: E402
+
+LANGUAGES: tuple[str, ...] = ("python", "rust", "go", "c", "sql")
+STYLES: tuple[str, ...] = ("friendly", "monokai", "default")
+PAGE_SIZE: int = 10
+
+
+def seed(rows: int, users: int) -> None:
+    """
+    Seed Function
+
+    Description:
+        - This function is used to fill the test database with snippets
+        spread over users and languages.
+        - Rows are inserted with `bulk_create`, so nothing is highlighted.
+
+    Args:
+        - `rows (int)`: Number of snippets. **(Required)**
+        - `users (int)`: Number of owners. **(Required)**
+
+    Returns:
+        - `None`
+
+    """
+    owners: list[User] = User.objects.bulk_create(  # pylint: disable=no-member
+        objs=[User(username=f"user{index}") for index in range(users)]
+    )
+    Snippet.objects.bulk_create(  # pylint: disable=no-member
+        objs=[
+            Snippet(
+                title=f"snippet {index}",
+                code="print('hello')",
+                language=LANGUAGES[index % len(LANGUAGES)],
+                style=STYLES[index % len(STYLES)],
+                owner=owners[index % users],
+            )
+            for index in range(rows)
+        ],
+        batch_size=1000,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def queries() -> dict[str, QuerySet]:
+    """
+    Queries Function
+
+    Description:
+        - This function is used to build the first page of every hot
+        listing, as issued by `SnippetViewSet`.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `dict[str, QuerySet]`: The queries by name.
+
+    """
+    listing: QuerySet = (
+        Snippet.objects.select_related("owner")  # pylint: disable=no-member
+        .defer("highlighted", "tokens")
+        .order_by("created", "id")
+    )
+
+    return {
+        "recent": listing[:PAGE_SIZE],
+        "by owner": listing.filter(owner__username="user1")[:PAGE_SIZE],
+        "by language": listing.filter(language="rust")[:PAGE_SIZE],
+        "by style": listing.filter(style="monokai")[:PAGE_SIZE],
+        "by created range": listing.filter(
+            created__gte=now() - timedelta(days=1), created__lt=now()
+        )[:PAGE_SIZE],
+    }
+
+
+def main() -> int:
+    """
+    Main Function
+
+    Description:
+        - This function is used to seed the test database and print the
+        plan and latency of every query.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `int`: The exit status.
+
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Show the query plans of the snippet listings."
+    )
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=20)
+    args: argparse.Namespace = parser.parse_args()
+
+    setup_test_environment()
+    old_name: str = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        seed(rows=args.rows, users=args.users)
+        print(f"{connection.vendor}, {args.rows} snippets\n")
+
+        for name, queryset in queries().items():
+            timings: list[float] = []
+
+            for _ in range(args.runs):
+                start: float = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            print(f"== {name}: median {statistics.median(timings):.2f} ms")
+            print(queryset.explain(), end="\n\n")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Startup Benchmark Script
+
+Description:
+    - This script measures how long `django.setup()` takes for the project.
+    - Every sample runs in a fresh interpreter so module caches never hide
+    import time regressions.
+    - With `--max-ms` the script exits with a non-zero status when the median
+    exceeds the budget, so it can guard CI.
+
+Usage:
+    - `./scripts/bench_startup.py --runs 10 --max-ms 800`
+
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR: Path = Path(__file__).resolve().parent.parent / (
+    "django_rest_tutorial"
+)
+
+# Executed in the child interpreter, prints the timings as JSON.
+CHILD: str = """
+import json, time
+start = time.perf_counter()
+import django
+imported = time.perf_counter()
+django.setup()
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "setup": done - imported}))
+"""
+
+
+def sample() -> dict[str, float]:
+    """
+    Sample Function
+
+    Description:
+        - This function is used to time `django.setup()` in a new
+        interpreter.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `dict[str, float]`: Seconds spent importing and setting up Django.
+
+    """
+    env: dict[str, str] = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "django_rest_tutorial.settings",
+        "DEBUG": os.environ.get("DEBUG", "False"),
+    }
+    result: subprocess.CompletedProcess[str] = subprocess.run(
+        args=[sys.executable, "-c", CHILD],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """
+    Main Function
+
+    Description:
+        - This function is used to run the benchmark and print a summary.
+
+    Args:
+        - `None`
+
+    Returns:
+        - `int`: The exit status.
+
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Measure django.setup() latency."
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail when the median setup time exceeds this budget.",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    samples: list[dict[str, float]] = [sample() for _ in range(args.runs)]
+    setup_ms: list[float] = [
+        (item["import"] + item["setup"]) * 1000 for item in samples
+    ]
+    median: float = statistics.median(setup_ms)
+
+    print(
+        f"django.setup() over {args.runs} runs: "
+        f"min {min(setup_ms):.1f} ms, median {median:.1f} ms, "
+        f"max {max(setup_ms):.1f} ms"
+    )
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"Median exceeds the budget of {args.max_ms:.1f} ms")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())